@@ -0,0 +1,38 @@
+"""
+Compares battle policies in the offline combat simulator, using a model fitted from recorded battle states.
+
+Record battle states by setting BattlePage.battle_log_path (--record-battle-log on the launcher), then run from the
+project root with:
+    python -m benchmarks.battle_policy_simulation path/to/battle_log.jsonl
+"""
+
+import time
+
+import click
+
+from src.battle_policy import BATTLE_POLICIES
+from src.combat_simulator import CombatModel, run_simulation
+
+
+@click.command()
+@click.argument("battle_log_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--battles", default=20000, help="Number of battles to simulate per policy")
+@click.option("--workers", default=None, type=int, help="Number of worker processes, defaults to one per core")
+@click.option("--seed", default=0, help="Base seed so runs can be repeated")
+def main(battle_log_path: str, battles: int, workers: int | None, seed: int) -> None:
+    model = CombatModel.from_battle_log(battle_log_path)
+    print(
+        f"{'policy':<16}{'turns/battle':>14}{'potions/battle':>16}{'death rate':>12}{'stalemates':>12}{'battles/s':>12}"
+    )
+    for policy_name in BATTLE_POLICIES:
+        start = time.perf_counter()
+        report = run_simulation(model, policy_name, battles, workers, seed)
+        battles_per_second = report.num_battles / (time.perf_counter() - start)
+        print(
+            f"{policy_name:<16}{report.turns_per_battle:>14.2f}{report.potions_per_battle:>16.3f}"
+            f"{report.death_rate:>12.4f}{report.num_stalemates:>12}{battles_per_second:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
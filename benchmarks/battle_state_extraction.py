@@ -0,0 +1,68 @@
+"""
+Compares the two ways of reading a battle page on the same fixture pages:
+- page.content() followed by BeautifulSoup parsing in Python
+- a single page.evaluate() call running the battle state extractor in the live DOM
+
+Run from the project root with:
+    python -m benchmarks.battle_state_extraction
+"""
+
+import glob
+import os
+import time
+
+import click
+from playwright.sync_api import sync_playwright
+
+from src.Pages.battle_page import BattlePage
+from src.battle_state import BattleState
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), os.path.pardir, "tests", "fixtures")
+
+
+def time_per_call_ms(extract, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        extract()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+@click.command()
+@click.option("--iterations", default=200, help="Number of extractions to time per fixture and path")
+def main(iterations: int) -> None:
+    fixture_paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "battle_page_*.html")))
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        print(f"{'fixture':<40}{'html parse (ms)':>18}{'evaluate (ms)':>16}{'same state':>12}")
+        for fixture_path in fixture_paths:
+            with open(fixture_path, "r") as f:
+                page.set_content(f.read())
+
+            html_state = BattleState.from_html(page.content(), BattlePage.POTION_NAMES)
+            dom_state = BattleState.from_page(page, BattlePage.POTION_NAMES)
+            same_state = (
+                    html_state.nxactor == dom_state.nxactor
+                    and html_state.turn_type == dom_state.turn_type
+                    and html_state.allies == dom_state.allies
+                    and html_state.enemies == dom_state.enemies
+                    and html_state.potions == dom_state.potions
+                    and html_state.skills == dom_state.skills
+                    and html_state.buffs == dom_state.buffs
+            )
+
+            html_ms = time_per_call_ms(
+                lambda: BattleState.from_html(page.content(), BattlePage.POTION_NAMES),
+                iterations,
+            )
+            dom_ms = time_per_call_ms(
+                lambda: BattleState.from_page(page, BattlePage.POTION_NAMES), iterations
+            )
+            print(
+                f"{os.path.basename(fixture_path):<40}{html_ms:>18.3f}{dom_ms:>16.3f}{str(same_state):>12}"
+            )
+        browser.close()
+
+
+if __name__ == "__main__":
+    main()
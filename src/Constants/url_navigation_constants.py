@@ -34,3 +34,8 @@ NEOQUEST_MOVEMENT_HUNTING_URL: str = (
     "https://www.neopets.com/games/nq2/nq2.phtml?act=travel&mode=2"
 )
 NEOQUEST_BATTLE_START_URL: str = "https://www.neopets.com/games/nq2/nq2.phtml?start=1"
+NEOQUEST_BATTLE_END_URL_TEMPLATE: str = (
+    "https://www.neopets.com/games/nq2/nq2.phtml?target=-1&fact=2&parm=&use_id=-1&nxactor={0}"
+)
+# Leaves a battle result page for the map, and a special boss end page for the real result page
+NEOQUEST_BATTLE_FINISH_URL: str = "https://www.neopets.com/games/nq2/nq2.phtml?finish=1"
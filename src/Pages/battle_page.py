@@ -1,11 +1,11 @@
-import re
+import json
 from enum import Enum, auto
 from typing import Dict, List
 
-from bs4 import BeautifulSoup, NavigableString
 from playwright.sync_api import Page
 
 from src.Pages.neopets_page import NeopetsPage
+from src.battle_state import BattleState
 from src.potion_handler import PotionHandler
 
 
@@ -41,6 +41,16 @@ class BattlePage(NeopetsPage):
     FAERIE_THIEF_FLEE1_TEXT = "The Faerie Thief leaps away"
     FAERIE_THIEF_FLEE2_TEXT = "The Faerie Thief stumbles back"
 
+    POTION_NAMES = {
+        potion_id: potion_name
+        for potion_id, (potion_name, heal_val) in PotionHandler.POTIONS.items()
+    }
+
+    # Read the battle state with one in-page JavaScript call instead of serializing and parsing the page HTML
+    use_dom_extractor = False
+    # When set, every battle state we read is appended to this file as a JSON line, e.g. to fit the combat simulator
+    battle_log_path: str | None = None
+
     class TurnType(Enum):
         ENEMY = auto()
         PLAYER = auto()
@@ -66,146 +76,67 @@ class BattlePage(NeopetsPage):
             BattlePage.END_FIGHT_LOCATOR
         )
 
+    def get_battle_state(self) -> BattleState:
+        """
+        Get the state of the battle on the current page, working it out only once per navigation.
+        Uses the in-page JavaScript extractor when use_dom_extractor is set, otherwise parses the page HTML.
+        :return: BattleState for the current page
+        """
+        navigation_state = self.navigation_state
+        if navigation_state.battle_state is None:
+            if BattlePage.use_dom_extractor:
+                navigation_state.battle_state = BattleState.from_page(
+                    self.page_instance, BattlePage.POTION_NAMES
+                )
+            else:
+                navigation_state.battle_state = BattleState.from_html(
+                    self.get_page_content(), BattlePage.POTION_NAMES
+                )
+            if BattlePage.battle_log_path:
+                with open(BattlePage.battle_log_path, "a") as f:
+                    f.write(json.dumps(navigation_state.battle_state.to_json()) + "\n")
+        return navigation_state.battle_state
+
     def get_turn_type(self) -> TurnType:
         """
         Determines if it is the enemy's turn or an ally's turn.
         Mainly used as a helper method to determine which method to call to advance the battle.
         :return: a TurnType enum value of either ENEMY or PLAYER
         """
-        if self.ENEMY_TURN_IDENTIFIER.count() > 0:
-            return BattlePage.TurnType.ENEMY
-        elif self.PLAYER_TURN_IDENTIFIER.count() > 0:
-            return BattlePage.TurnType.PLAYER
-        elif self.END_FIGHT_IDENTIFIER.count() > 0:
-            return BattlePage.TurnType.BATTLE_OVER
-        else:
-
+        turn_type = self.get_battle_state().turn_type
+        if turn_type is None:
             # TODO: return a more specific exception
             raise Exception(
                 "It is neither the player or enemy's turn. You are likely not on a battle page!"
             )
+        return BattlePage.TurnType[turn_type]
 
     def get_next_actor_id(self) -> int:
         """
-        Parses the page HTML to extract the hidden nxactor input element value required to perform an action
+        Reads the hidden nxactor input element value required to perform an action
         :return: actor id of the next (current turn) actor
         """
-        battle_html = self.page_instance.content()  # Playwright: gets current page HTML
-        soup = BeautifulSoup(battle_html, "html.parser")
-        hidden_input_tag = soup.find(
-            "input", attrs={"type": "hidden", "name": "nxactor"}
-        )
-        if hidden_input_tag:
-            return int(hidden_input_tag["value"])
-        else:
+        actor_id = self.get_battle_state().nxactor
+        if actor_id is None:
             # TODO: create and throw custom exception when nxactor info is not available on expected battle page
             raise Exception("Could not find nxactor hidden input on the battle page.")
+        return actor_id
 
     def get_character_hp_vals(self) -> Dict[str, Dict[str, int]]:
-        battle_html = self.page_instance.content()
-        soup = BeautifulSoup(battle_html, "html.parser")
-        game_container = soup.find("div", class_="contentModule phpGamesNonPortalView")
-
-        # Ensure that we do not assign the same character name to multiple HP values
-        added_chars = {}
-        ally_hp_info = {}
-
-        # Basically two numerical values separate by a slash
-        hp_pattern = re.compile(r"^\d+/\d+$")
-
-        # Find all font tags that have HP text
-        hp_font_tags = game_container.find_all("font")
-        for hp_tag in hp_font_tags:
-            raw_hp_text = hp_tag.get_text(strip=True)
-
-            # Check if this font tag contains HP text based on pattern
-            if hp_pattern.match(raw_hp_text):
-                # Walk up the tree to parent td of this HP
-                td_hp = hp_tag.find_parent("td")
-                if not td_hp:
-                    continue
-
-                # Then find the parent table
-                table = td_hp.find_parent("table")
-                if not table:
-                    continue
-
-                # Then find parent td of this table (HP table container)
-                parent_td = table.find_parent("td")
-                if not parent_td:
-                    continue
-
-                # THIS IS TRICKY BECAUSE SOMETIMES WE HAVE A CONTAINING FONT TAG IF OUR TURN, ELSE NOT
-                turn_type = self.get_turn_type()
-                if turn_type == BattlePage.TurnType.PLAYER:
-                    # Text will be further inside a bold tag, but the container doesn't contain any other text
-                    # BUT THIS IS ONLY TRUE FOR WHEN IT IS THAT CHARACTER'S TURN!!!
-                    # Otherwise, it will simply be in the td tag
-                    character_name_tag = parent_td.find(
-                        "b", string=BattlePage.ALLY_NAMES, recursive=True
-                    )
-                    # Character names are in the same td element as the HP text
-                    # Monster names are not
-                    character_name = ""
-                    if character_name_tag:
-                        character_name = character_name_tag.get_text().strip()
-                    else:
-                        text_elements = [
-                            str(cont).strip()
-                            for cont in parent_td.contents
-                            if isinstance(cont, NavigableString)
-                        ]
-                        for text in text_elements:
-                            if text in BattlePage.ALLY_NAMES:
-                                character_name = text
-                                break
-                        if character_name not in BattlePage.ALLY_NAMES:
-                            character_name = "NOT_A_NAME"
-                else:
-                    # If not our turn, then text will simply be inside the td tag
-                    character_name_tag = parent_td
-                    character_name = character_name_tag.find(
-                        string=BattlePage.ALLY_NAMES, recursive=False
-                    )
-
-                if (
-                        character_name in BattlePage.ALLY_NAMES
-                        and character_name not in added_chars.keys()
-                ):
-                    # logger.info(
-                    #     f"Adding entry to character list: {character_name} - {raw_hp_text}"
-                    # )
-                    hp_vals = raw_hp_text.split("/")
-                    current_hp = int(hp_vals[0])
-                    max_hp = int(hp_vals[1])
-                    added_chars[character_name] = {
-                        "current_hp": current_hp,
-                        "max_hp": max_hp,
-                    }
-                    # break
-        # logger.info("These are the allies we see on the page:")
-        # logger.info(added_chars)
-
-        return added_chars
+        return self.get_battle_state().get_character_hp_vals()
 
     def get_available_healing_potions(self) -> List[str]:
         """
-        Read through the page HTML and check if each potion name is in the page.
+        Check which potions show up on the battle page.
         :return: list of potion names available to use
         """
-
-        page_html = self.get_page_content()
-        # NOW CHECK IF EACH POTION IS IN THE STRING!!!
-        available_potions = []
-        for potion_id, (potion_name, heal_val) in PotionHandler.POTIONS.items():
-            # TODO: figure out a better way to handle scenario where last potion was just used
-            # It causes potion text to show up in page but there is no more of that potion
-            # TODO: figure out way to allow consecutive potion usage
-            # As result of above, potion will never be used twice in a row because potion use text makes it appear in page HTML
-            # Not really a huge issue, but not the intended way of using potions
-            if potion_name in page_html and f"used a {potion_name}" not in page_html:
-                available_potions.append(potion_name)
-        return available_potions
+        # TODO: figure out way to allow consecutive potion usage
+        # Potion use text makes a potion show up in the page even when it was the last one, so the battle state
+        # leaves out any potion that was just used. Not really a huge issue, but not the intended way of using potions
+        return [
+            BattlePage.POTION_NAMES[potion_id]
+            for potion_id in self.get_battle_state().potions
+        ]
 
     def has_attacked_invalid_target(self) -> bool:
         """
@@ -214,25 +145,19 @@ class BattlePage(NeopetsPage):
         This method is usually called after using an attack or targeted spell.
         :return:
         """
-        page_html = self.get_page_content()
-        if (
-                BattlePage.ALREADY_DEFEATED_TARGET_TEXT in page_html
-                or BattlePage.INVALID_CASTING_TARGET_TEXT in page_html
-        ):
-            return True
-        else:
-            return False
+        battle_state = self.get_battle_state()
+        return battle_state.has_text(
+            BattlePage.ALREADY_DEFEATED_TARGET_TEXT
+        ) or battle_state.has_text(BattlePage.INVALID_CASTING_TARGET_TEXT)
 
     def is_special_boss_early_exit(self) -> bool:
         """
         Check if the monster being battled is a special boss monster that flees early.
         Return a BattleResultPage object.
         """
-        page_html = self.get_page_content()
-        if (
-                BattlePage.RAMTOR_FLEE_TEXT in page_html
-                or BattlePage.FAERIE_THIEF_FLEE1_TEXT in page_html
-                or BattlePage.FAERIE_THIEF_FLEE2_TEXT in page_html
-        ):
-            return True
-        return False
+        battle_state = self.get_battle_state()
+        return (
+                battle_state.has_text(BattlePage.RAMTOR_FLEE_TEXT)
+                or battle_state.has_text(BattlePage.FAERIE_THIEF_FLEE1_TEXT)
+                or battle_state.has_text(BattlePage.FAERIE_THIEF_FLEE2_TEXT)
+        )
@@ -1,10 +1,10 @@
 from __future__ import annotations
-from enum import Enum
-from typing import List
+import re
 
-from playwright.sync_api import Page, Locator
+from playwright.sync_api import Page
 
 from src.Pages.neopets_page import NeopetsPage
+from src.game_actions import LeaveSpecialBattleEnd, ReturnToMap, perform
 
 import logging
 
@@ -12,28 +12,34 @@ logger = logging.getLogger(__name__)
 
 
 class BattleResultPage(NeopetsPage):
-    BATTLE_END_LOCATOR = r"a[href='nq2.phtml?finish=1']"
     # This is NOT the button itself and cannot be clicked
     SPECIAL_CONTINUE_ELEMENT_LOCATOR = r"img[src='//images.neopets.com/nq2/x/cont.gif']"
 
     # SPECIAL_CONTINUE_LINK_URL = "https://www.neopets.com/games/nq2/nq2.phtml?finish=1"
 
+    # e.g. "You gain <b>25</b> experience points" - the number may be wrapped in formatting tags
+    EXPERIENCE_GAINED_PATTERN = re.compile(
+        r"(\d+)\s*(?:</?[a-z][^>]*>\s*)*experience", re.IGNORECASE
+    )
+
     def __init__(self, neopets_page_instance: Page):
         super().__init__(neopets_page_instance)
 
-        self.return_to_map_button = self.page_instance.locator(
-            BattleResultPage.BATTLE_END_LOCATOR
-        )
-
-    def click_return_to_map_link(self) -> None:
-        self.click_clickable_element(
-            self.return_to_map_button,
-            "We were unable to click the return to map button."
-            "Ensure that you are on a post battle page!",
-        )
-
-    def click_special_continue_button(self) -> None:
-        self.click_clickable_element(
-            self.return_to_map_button,
-            "We tried to click a special battle end page continue button, but it did not work!",
+    def return_to_map(self) -> None:
+        perform(self, ReturnToMap())
+
+    def leave_special_battle_end(self) -> None:
+        """
+        Go from a special boss end page to the real battle result page.
+        """
+        perform(self, LeaveSpecialBattleEnd())
+
+    def get_experience_gained(self) -> int:
+        """
+        Read how much experience the party got from the battle that just ended.
+        :return: experience gained, or 0 if the page does not mention any
+        """
+        experience_match = BattleResultPage.EXPERIENCE_GAINED_PATTERN.search(
+            self.get_page_content()
         )
+        return int(experience_match.group(1)) if experience_match else 0
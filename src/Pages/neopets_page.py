@@ -1,44 +1,311 @@
 from __future__ import annotations
 
 import logging
+import time
+from typing import Callable
+from weakref import WeakKeyDictionary
 
-from playwright.sync_api import Page, Locator
+from playwright.sync_api import Page, Locator, Frame, Response, Error
+
+from src.battle_state import BattleState
+from src.circuit_breaker import CIRCUIT_BREAKER
+from src.page_history import PAGE_HISTORY
+from src.page_parser import PageParser
+from src.page_types import PageType
+from src.request_pacer import DEFAULT_ACCOUNT, REQUEST_PACER
+from src.retry_policy import CLICK_RETRY_POLICY, NAVIGATION_RETRY_POLICY, RetryPolicy
 
 logger = logging.getLogger(__name__)
 
 
+class NavigationState:
+    """
+    Holds everything we have already worked out about the document currently loaded in a tab.
+    It is wiped every time the main frame navigates, so nothing in here can outlive the page it describes.
+    """
+
+    # Only game documents are captured, everything else still goes through page.content()
+    CAPTURED_DOCUMENT_URL_PART = "nq2.phtml"
+
+    def __init__(self) -> None:
+        self.navigation_count = 0
+        self.page_type: PageType | None = None
+        # PageParser.get_fast_path_matches of the current document, shared by the page type and site trouble checks
+        self.fast_path_matches: list[PageType] | None = None
+        # Only ever filled in by BattlePage
+        self.battle_state: BattleState | None = None
+
+        # The response event fires before the frame commits the navigation, so the response waits here until
+        # reset() can tell whether it is actually the document that ended up in the tab
+        self.pending_document_response: Response | None = None
+        self.document_response: Response | None = None
+        # Byte-exact copy of what the server sent for the current document, fetched on first use
+        self.document_body: bytes | None = None
+        # Whether the current document already went into the page history
+        self.is_recorded = False
+        # Account logged in on this tab, picks the request pacer's account bucket. Kept across navigations
+        self.account = DEFAULT_ACCOUNT
+        # Timeout last handed to Playwright for everything we do not pass a timeout to ourselves. Kept across navigations
+        self.default_timeout_ms: float | None = None
+
+    def record_response(self, response: Response) -> None:
+        request = response.request
+        if (
+                request.resource_type == "document"
+                and request.is_navigation_request()
+                and request.frame.parent_frame is None
+                and NavigationState.CAPTURED_DOCUMENT_URL_PART in response.url
+        ):
+            self.pending_document_response = response
+
+    def reset(self, frame_url: str) -> None:
+        self.navigation_count += 1
+        self.page_type = None
+        self.fast_path_matches = None
+        self.battle_state = None
+
+        pending_response = self.pending_document_response
+        if pending_response is not None and pending_response.url == frame_url:
+            self.document_response = pending_response
+        else:
+            self.document_response = None
+        self.pending_document_response = None
+        self.document_body = None
+        self.is_recorded = False
+
+
+class SessionLostError(Exception):
+    """
+    An action landed on a login page. We are logged back in by the time this is raised, so the action can be retried.
+    """
+
+
+class SiteTroubleError(Exception):
+    """
+    The site served an error, maintenance, rate limit or blank page instead of the game.
+    """
+
+    def __init__(self, page_type: PageType, url: str) -> None:
+        """
+        :param page_type: one of PageParser.SITE_TROUBLE_PAGE_TYPES
+        :param url: URL of the page
+        """
+        super().__init__(f"Got a {page_type.name} page at {url} instead of the game")
+        self.page_type = page_type
+        self.url = url
+
+
 class NeopetsPage:
     MAIN_GAME_URL = r"https://www.neopets.com/games/nq2/nq2.phtml"
 
+    # Every page object wrapping the same tab shares one state, so a handler asking what page we are on pays nothing
+    # if another handler already asked since the last navigation
+    _navigation_states: WeakKeyDictionary[Page, NavigationState] = WeakKeyDictionary()
+
+    # Set by the autoplayer once the first login is done. Called with the page that found itself logged out, logs
+    # back in and leaves that same tab on the game, so the interrupted action can simply be tried again
+    reauthenticate: Callable[[NeopetsPage], None] | None = None
+
     def __init__(self, neopets_page_instance: Page) -> None:
         # The playwright Page object tracks a tab and the pages that it visits
         # This means we don't have to worry about stale references like in Selenium
         self.page_instance = neopets_page_instance
+        if neopets_page_instance not in NeopetsPage._navigation_states:
+            navigation_state = NavigationState()
+            NeopetsPage._navigation_states[neopets_page_instance] = navigation_state
+
+            def on_frame_navigated(frame: Frame) -> None:
+                # Subframes (ads, trackers) navigate all the time and do not change what page we are on
+                if frame.parent_frame is None:
+                    navigation_state.reset(frame.url)
+
+            neopets_page_instance.on("response", navigation_state.record_response)
+            neopets_page_instance.on("framenavigated", on_frame_navigated)
+
+    @property
+    def navigation_state(self) -> NavigationState:
+        return NeopetsPage._navigation_states[self.page_instance]
+
+    def get_page_type(self) -> PageType:
+        """
+        Classify the current page, only reading the page content the first time it is asked after a navigation.
+        :return: enum value containing the specific page type
+        """
+        navigation_state = self.navigation_state
+        if navigation_state.page_type is None:
+            page_content = self.get_page_content()
+            navigation_state.page_type = PageParser.get_page_type(
+                page_content, self.page_instance.url, self.get_fast_path_matches(page_content)
+            )
+        return navigation_state.page_type
+
+    def get_fast_path_matches(self, page_content: str) -> list[PageType]:
+        """
+        Check the fast path markers only once per navigation.
+        :param page_content: HTML of the current page
+        """
+        navigation_state = self.navigation_state
+        if navigation_state.fast_path_matches is None:
+            navigation_state.fast_path_matches = PageParser.get_fast_path_matches(page_content)
+        return navigation_state.fast_path_matches
+
+    def go_to_game_page(self, timeout_ms: float | None = None) -> None:
+        """
+        Load the main game URL, which always shows wherever the game currently is without submitting anything.
+        Used after a failed action to see whether it went through.
+        :param timeout_ms: navigation timeout in milliseconds, defaults to the navigation retry policy's
+        """
+        if timeout_ms is None:
+            timeout_ms = NAVIGATION_RETRY_POLICY.get_timeout_ms()
+        self.pace_request(NeopetsPage.MAIN_GAME_URL)
+        response = self.page_instance.goto(NeopetsPage.MAIN_GAME_URL, timeout=timeout_ms)
+        self.page_instance.wait_for_load_state("load", timeout=timeout_ms)
+        self.raise_if_site_trouble(response)
+        self.reauthenticate_if_logged_out()
+
+    def probe_latency(self, timeout_ms: float = 30000) -> float | None:
+        """
+        Reload the game page to see how the site is doing. Safe anywhere on the overworld, since it submits nothing.
+        :return: load time in milliseconds, or None if it failed
+        """
+        start_time = time.monotonic()
+        try:
+            self.go_to_game_page(timeout_ms)
+        except Exception as e:
+            logger.info("Probe failed: %s", e)
+            return None
+        return (time.monotonic() - start_time) * 1000
+
+    def pace_request(self, url: str) -> None:
+        """
+        Wait for the request pacer before anything that makes the site load a page. Also keeps Playwright's own
+        default timeout, used by locator reads and waits, in line with the site's recent latency.
+        :param url: URL about to be requested, or the current one for clicks
+        """
+        navigation_state = self.navigation_state
+        REQUEST_PACER.acquire(url, navigation_state.account)
+        default_timeout_ms = round(NAVIGATION_RETRY_POLICY.get_timeout_ms())
+        if default_timeout_ms != navigation_state.default_timeout_ms:
+            self.page_instance.set_default_timeout(default_timeout_ms)
+            navigation_state.default_timeout_ms = default_timeout_ms
+
+    def _run_request(
+            self,
+            action: Callable[[], Response | None],
+            session_lost_message: str,
+            url: str | None = None,
+    ) -> None:
+        """
+        Make one request to the site with everything that goes around it: pacing, timing it for the circuit breaker,
+        checking for site trouble and logging back in if the session was lost.
+        :param action: loads the page, returning the navigation's response if it has one
+        :param session_lost_message: error message if we got logged out, so the retry policy tries again
+        :param url: URL about to be requested, defaults to the current one for clicks
+        """
+        if url is None:
+            url = self.page_instance.url
+        self.pace_request(url)
+        start_time = time.monotonic()
+        try:
+            response = action()
+        except Error:
+            CIRCUIT_BREAKER.record_failure()
+            raise
+        latency_ms = (time.monotonic() - start_time) * 1000
+        self.raise_if_site_trouble(response)
+        CIRCUIT_BREAKER.record_success(latency_ms)
+        # Request timings end up in the JSON log, where dry runs read them back to estimate section times
+        logger.debug("Loaded %s in %.0f ms", url, latency_ms, extra={"latency_ms": latency_ms})
+        if self.reauthenticate_if_logged_out():
+            raise SessionLostError(session_lost_message)
+
+    def raise_if_site_trouble(self, response: Response | None = None) -> None:
+        """
+        Fail the current attempt straight away if the site served an error, maintenance, rate limit or blank page
+        instead of the game. Maintenance trips the circuit breaker and waits for the site to come back, everything else
+        is left to the retry policy's backoff.
+        :param response: response to the navigation that was just made, defaults to the captured document's
+        """
+        if response is None:
+            response = self.navigation_state.document_response
+        status = response.status if response is not None else None
+        page_content = self.get_page_content()
+        page_type = PageParser.get_site_trouble(page_content, status, self.get_fast_path_matches(page_content))
+        if page_type is None:
+            return
+
+        url = self.page_instance.url
+        self.navigation_state.page_type = page_type
+        logger.warning("The site served a %s page at %s (HTTP status %s)", page_type.name, url, status)
+        match page_type:
+            case PageType.SITE_MAINTENANCE:
+                CIRCUIT_BREAKER.trip(f"maintenance page at {url}")
+                # Nothing reaches the game during maintenance, so waiting here is as safe as waiting between steps
+                CIRCUIT_BREAKER.wait_if_open(self.probe_latency)
+            case _:
+                CIRCUIT_BREAKER.record_failure()
+        raise SiteTroubleError(page_type, url)
+
+    def is_logged_out(self) -> bool:
+        """
+        Check whether the last navigation ended up on a login page instead of the game.
+        Uses the page type if it is already known, otherwise only the URL and the login markers.
+        """
+        navigation_state = self.navigation_state
+        if navigation_state.page_type is not None:
+            return navigation_state.page_type in PageParser.LOGGED_OUT_PAGE_TYPES
+        return PageParser.is_logged_out(self.get_page_content(), self.page_instance.url)
+
+    def reauthenticate_if_logged_out(self) -> bool:
+        """
+        Log back in if the session was lost, ending on the game page in this same tab.
+        :return: True if we had to log back in, meaning whatever was just sent did not reach the game
+        """
+        if NeopetsPage.reauthenticate is None or not self.is_logged_out():
+            return False
+        logger.warning("We got logged out and landed on %s. Logging back in...", self.page_instance.url)
+        PAGE_HISTORY.record_action("log back in")
+        NeopetsPage.reauthenticate(self)
+        return True
 
     # Was designed to be a wrapper for built-in goto method, but we also built in automatic retries
-    def go_to_url_and_wait_navigation(self, url: str, max_retries: int = 5) -> None:
+    def go_to_url_and_wait_navigation(
+            self,
+            url: str,
+            max_retries: int | None = None,
+            is_already_done: Callable[[], bool] | None = None,
+            retry_policy: RetryPolicy = NAVIGATION_RETRY_POLICY,
+    ) -> None:
         """
         Navigates to a URL, retries on failure, and explicitly waits for navigation to complete.
         :param url: The destination URL.
-        :param max_retries: Number of times to retry navigation.
+        :param max_retries: Number of times to try the navigation, defaults to the retry policy's.
+        :param is_already_done: For URLs that submit a game action: checked on the reloaded game page after a
+         failure, and the URL is not visited again if it returns True
+        :param retry_policy: backoff and timeout to use
         """
-        for attempt in range(0, max_retries):
-            try:
-                self.page_instance.goto(url)
-                self.page_instance.wait_for_load_state("load")
-                return  # Success, so exit
-            except Exception as e:
-                logger.warning(f"Navigation attempt {attempt} failed: {e}")
-                try:
-                    self.page_instance.goto("about:blank")
-                    self.page_instance.wait_for_load_state("load")
-                except Exception as reload_error:
-                    logger.warning(
-                        f"Also failed to navigate to blank page before trying navigation again: {reload_error}"
-                    )
-        logger.error(f"Failed to navigate to {url} after {max_retries} attempts.")
-        raise Exception(
-            f"Max retries exceeded for go_to_url_and_wait_navigation at {url}"
+        if max_retries is not None:
+            retry_policy = retry_policy.with_max_attempts(max_retries)
+
+        PAGE_HISTORY.record_action(url)
+
+        def navigate(timeout_ms: float) -> None:
+            def load() -> Response | None:
+                response = self.page_instance.goto(url, timeout=timeout_ms)
+                self.page_instance.wait_for_load_state("load", timeout=timeout_ms)
+                return response
+
+            self._run_request(
+                load,
+                f"Got logged out visiting {url}, trying again now that we are logged back in",
+                url,
+            )
+
+        retry_policy.run(
+            navigate,
+            f"navigate to {url}",
+            is_already_done=is_already_done,
+            recover=self.go_to_game_page if is_already_done else None,
         )
 
     def click_link_matching_text(self, link_text: str) -> None:
@@ -52,42 +319,94 @@ class NeopetsPage:
         matching_element = self.page_instance.locator(
             matching_text_xpath_format.format(link_text)
         )
+        self.pace_request(self.page_instance.url)
         matching_element.click()
 
     def click_clickable_element(
             self,
             button: Locator,
             error_message: str,
-            max_retries: int = 5,
+            max_retries: int | None = None,
+            retry_policy: RetryPolicy = CLICK_RETRY_POLICY,
+            is_already_done: Callable[[], bool] | None = None,
     ) -> None:
         """
-        Click an element on the current page, retry clicking if it fails by reloading the page.
+        Click an element on the current page. If it fails, reload the game and click again.
         :param button: Locator object of the button to click
         :param error_message: message to log if clicking fails
-        :param max_retries: number of retry attempts before final failure
-        :param delay: delay in seconds between retries
+        :param max_retries: number of attempts before final failure, defaults to the retry policy's
+        :param retry_policy: backoff and timeout to use
+        :param is_already_done: checked on the reloaded game page after a failure, and the click is not repeated if
+         it returns True. Leave out for buttons that are safe to click twice
         """
-        for attempt in range(1, max_retries + 1):
-            try:
-                button.click()
-                return  # Successfully clicked, exit the function
-            except Exception as e:
-                logger.warning(f"{error_message} Attempt {attempt} failed: {e}")
-                try:
-                    self.page_instance.reload()
-                    self.page_instance.wait_for_load_state("load")
-                except Exception as reload_exc:
-                    logger.warning(
-                        f"Reload attempt failed during click retry: {reload_exc}"
-                    )
-        logger.error(f"Failed to click element after {max_retries} attempts.")
-        raise Exception(
-            f"Max retries exceeded for click_clickable_element on locator {button}"
+        if max_retries is not None:
+            retry_policy = retry_policy.with_max_attempts(max_retries)
+        PAGE_HISTORY.record_action(f"click {button}")
+
+        def click(timeout_ms: float) -> None:
+            self._run_request(
+                lambda: button.click(timeout=timeout_ms),
+                "Got logged out by the click, trying again now that we are logged back in",
+            )
+
+        retry_policy.run(
+            click,
+            f"click {button} ({error_message})",
+            is_already_done=is_already_done,
+            recover=self.go_to_game_page,
         )
 
     def get_page_content(self) -> str:
         """
-        Get the HTML content of the page instance
+        Get the HTML content of the page instance.
+        For game pages this is the response body captured off the network, so the renderer never has to serialize
+        the DOM. Anything we did not capture falls back to page.content().
         :return: HTML content of the page
         """
-        return self.page_instance.content()
+        document_body = self.get_document_body()
+        if document_body is None:
+            page_content = self.page_instance.content()
+            self.record_in_page_history(page_content.encode("utf-8"))
+            return page_content
+        self.record_in_page_history(document_body)
+        return document_body.decode("utf-8", errors="replace")
+
+    def dump_page_history(self, reason: str) -> str | None:
+        """
+        Write the recent pages and actions to a post-mortem bundle, making sure the page we are stuck on is in it.
+        :param reason: what went wrong
+        :return: path of the bundle, or None if it could not be written
+        """
+        try:
+            self.get_page_content()
+        except Error as e:
+            logger.warning("Could not read the current page for the page history: %s", e)
+        return PAGE_HISTORY.dump(reason)
+
+    def record_in_page_history(self, body: bytes) -> None:
+        """
+        Keep the current document in the page history, once per navigation.
+        :param body: page HTML as bytes
+        """
+        navigation_state = self.navigation_state
+        if not navigation_state.is_recorded:
+            PAGE_HISTORY.record_page(self.page_instance.url, body)
+            navigation_state.is_recorded = True
+
+    def get_document_body(self) -> bytes | None:
+        """
+        Get the raw response body of the current document, exactly as the server sent it.
+        :return: body bytes, or None if the current document was not captured
+        """
+        navigation_state = self.navigation_state
+        if navigation_state.document_response is None:
+            return None
+        if navigation_state.document_body is None:
+            try:
+                navigation_state.document_body = navigation_state.document_response.body()
+            except Error as e:
+                # The browser can drop bodies it no longer needs, so just stop trying for this document
+                logger.debug("Captured response body is not available anymore: %s", e)
+                navigation_state.document_response = None
+                return None
+        return navigation_state.document_body
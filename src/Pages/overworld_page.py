@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import logging
 import re
-import time
 from typing import List
 
-from playwright.sync_api import Page, Locator, TimeoutError
+from playwright.sync_api import Page, Locator
 
 from src.Pages.neopets_page import NeopetsPage
+from src.page_history import PAGE_HISTORY
+from src.retry_policy import MOVEMENT_RETRY_POLICY
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +50,11 @@ class OverworldPage(NeopetsPage):
 
     OPTIONS_LOCATOR = r"a[href='nq2.phtml?act=opt']"
 
+    # The party shares one level, shown next to the character portraits, e.g. "Level: <b>12</b>"
+    PARTY_LEVEL_PATTERN = re.compile(
+        r"Level\s*(?:</?[a-z][^>]*>\s*)*:?\s*(?:</?[a-z][^>]*>\s*)*(\d+)", re.IGNORECASE
+    )
+
     def __init__(self, neopets_page_instance: Page):
         super().__init__(neopets_page_instance)
 
@@ -111,51 +117,34 @@ class OverworldPage(NeopetsPage):
         else:
             raise ValueError(f"Invalid direction for path direction: {direction}")
 
+    def has_moved_from(self, prev_map_coords: List[str] | None) -> bool:
+        """
+        Idempotency check for movement: the map is different from before the move, or we are not on the map at all
+        because the step started a battle.
+        :param prev_map_coords: map coordinates from before the move, None if we did not record them
+        """
+        if prev_map_coords is None:
+            return False
+        return set(prev_map_coords) != set(self.get_map_coords())
+
     def go_to_movement_url_with_wait(
-            self, movement_url: str, num_retries=6, prev_map_coords: List[str] = None
+            self, movement_url: str, num_retries: int | None = None, prev_map_coords: List[str] = None
     ) -> None:
         """
         This method visits a URL and waits for a page reload to ensure that the action is complete,
         including fallback handling if the navigation fails. Mainly used for overworld movement.
-        :param url: URL to visit
+        If a visit fails, the move is only sent again if the map shows we did not actually move.
+        :param movement_url: URL to visit
+        :param num_retries: number of attempts, defaults to the movement retry policy's
+        :param prev_map_coords: map coordinates before the move, used to check if a failed visit went through
         """
-        for attempt in range(num_retries):
-            try:
-                with self.page_instance.expect_navigation():
-                    logger.info(f"Attempting to visit {movement_url} ...")
-                    self.page_instance.goto(movement_url, timeout=60000)
-                    self.page_instance.wait_for_load_state("load")
-                return
-            except TimeoutError as te:
-                logger.warning(f"Attempt {attempt} to navigate failed: {te}")
-                try:
-                    logger.info(
-                        "Attempting to reload the page and determine the result"
-                    )
-                    self.page_instance.goto("about:blank")
-                    # This is really bad practice but it works, so eh...
-                    time.sleep(3)
-                    self.page_instance.goto(OverworldPage.MAIN_GAME_URL, timeout=60000)
-                    # Refresh once more and wait to ensure it loaded
-                    with self.page_instance.expect_navigation():
-                        self.page_instance.goto(OverworldPage.MAIN_GAME_URL, timeout=60000)
-                        self.page_instance.wait_for_load_state("load")
-                    new_map_coords = self.get_map_coords()
-                    if set(prev_map_coords) == set(new_map_coords):
-                        logger.info(
-                            "The previous move action did not go through. Retrying URL visit..."
-                        )
-                        continue
-                    else:
-                        logger.info(
-                            "The page failed to load but the action was performed."
-                        )
-                        return
-                except TimeoutError as reload_error:
-                    logger.warning(f"Also failed to reload the page: {reload_error}")
-        logger.error(f"Failed to visit URL after {num_retries} attempts.")
-        # TODO: create and throw a custom exception instead of generic one here
-        raise Exception("Max retries exceeded for visit_url_with_wait")
+        logger.info("Attempting to visit %s ...", movement_url)
+        self.go_to_url_and_wait_navigation(
+            movement_url,
+            max_retries=num_retries,
+            is_already_done=lambda: self.has_moved_from(prev_map_coords),
+            retry_policy=MOVEMENT_RETRY_POLICY,
+        )
 
     def click_normal_movement_button(self) -> None:
         self.click_clickable_element(
@@ -189,58 +178,43 @@ class OverworldPage(NeopetsPage):
     def simulate_click_with_wait(
             self,
             unclickable_element: Locator,
-            num_retries=6,
+            num_retries: int | None = None,
             prev_map_coords: List[str] = None,
     ) -> None:
         """
         This method handles elements that perform Javascript calls when clicked physically, but NOT VIA PLAYWRIGHT.
         It sends a click event and then waits for a page reload to occur to ensure that the action has finished.
+        If it fails, the click is only sent again if the map shows that we did not actually move.
         :param unclickable_element: some element that is interactable only because of an overlaying element,
          and isn't clickable via Playwright
+        :param num_retries: number of attempts, defaults to the movement retry policy's
+        :param prev_map_coords: map coordinates before the click, used to check if a failed click went through
         """
-        for attempt in range(0, num_retries):
-            try:
-                with self.page_instance.expect_navigation():
-                    unclickable_element.dispatch_event("click")
+        retry_policy = MOVEMENT_RETRY_POLICY
+        if num_retries is not None:
+            retry_policy = retry_policy.with_max_attempts(num_retries)
+        PAGE_HISTORY.record_action(f"dispatch click on {unclickable_element}")
+
+        def dispatch_click(timeout_ms: float) -> None:
+            def load() -> None:
+                with self.page_instance.expect_navigation(timeout=timeout_ms):
                     logger.info(
                         "Attempting to interact with an element that Playwright cannot click normally..."
                     )
-                    self.page_instance.wait_for_load_state("load")
-                return
-            except TimeoutError as te:
-                logger.warning(f"Attempt {attempt} failed: {te}")
-                try:
-                    logger.info(
-                        "Attempting to reload the page and determine the result"
-                    )
-                    self.page_instance.goto("about:blank")
-                    # Wait a couple of seconds before page reload
-                    time.sleep(2)
-                    self.page_instance.goto(OverworldPage.MAIN_GAME_URL)
-                    self.page_instance.wait_for_load_state("load")
-                    # Wait a couple of seconds after page load to ensure elements loaded
-                    time.sleep(2)
-                    new_map_coords = self.get_map_coords()
-                    # Not sure if this check fails when the page actually loaded but took us to a battle page - might be ok
-                    if set(prev_map_coords) == set(new_map_coords):
-                        logger.info(
-                            "The previous movement action did not go through. Resubmitting action..."
-                        )
-                        # Then redo the action since it didn't go through
-                        continue
-                    else:
-                        logger.info(
-                            "The page failed to load but the action was performed."
-                        )
-                        return
-                except TimeoutError as reload_err:
-                    logger.warning(
-                        f"Also failed to reload the page after failed simulated click: {reload_err}"
-                    )
-        logger.error(
-            f"Failed to interact with the element after {num_retries} attempts."
+                    unclickable_element.dispatch_event("click", timeout=timeout_ms)
+                self.page_instance.wait_for_load_state("load", timeout=timeout_ms)
+
+            self._run_request(
+                load,
+                "Got logged out by the click, trying again now that we are logged back in",
+            )
+
+        retry_policy.run(
+            dispatch_click,
+            "interact with an element that Playwright cannot click normally",
+            is_already_done=lambda: self.has_moved_from(prev_map_coords),
+            recover=self.go_to_game_page,
         )
-        raise RuntimeError("Max retries exceeded for simulate_click_with_wait")
 
     # Utility method to compare if page is the same
     def get_map_coords(self) -> List[str]:
@@ -259,3 +233,11 @@ class OverworldPage(NeopetsPage):
         map_html = container.inner_html()
         coords_matches = re.findall(r"coords\((.*?)\)", map_html)
         return coords_matches
+
+    def get_party_level(self) -> int | None:
+        """
+        Read the party level from the overworld page.
+        :return: the party level, or None if it is not on the page
+        """
+        level_match = OverworldPage.PARTY_LEVEL_PATTERN.search(self.get_page_content())
+        return int(level_match.group(1)) if level_match else None
@@ -2,15 +2,33 @@ import logging
 import os
 import sys
 
+from typing import Dict, Tuple
+
 import click
 from playwright.sync_api import sync_playwright, BrowserContext
 
-import src.logging_config
+from src.Pages.battle_page import BattlePage
 from src.Pages.neopets_page import NeopetsPage
 from src.autoplayer import Autoplayer
+from src.battle_policy import BATTLE_POLICIES
+from src.circuit_breaker import CIRCUIT_BREAKER
+from src.logging_config import configure_logging, load_logging_config
+from src.overworld_handler import OverworldHandler
+from src.request_pacer import REQUEST_PACER
+from src.retry_policy import RetryPolicy
+from src.run_plan import (
+    EXIT_SETUP_FAILED,
+    ON_FAILURE_POLICIES,
+    BatchRunner,
+    RunPlan,
+    parse_command_line_entry,
+)
+from src.section_script import SectionCostModel, format_estimates
+from src.sections import SECTIONS
+from src.world_atlas import DEFAULT_ATLAS_PATH, WorldAtlas
 
-# Hack to keep Pycharm from deleting my import...
-_ = src.logging_config
+# Default logging until main() has read the command line, so the setup messages below are not lost
+configure_logging()
 logger = logging.getLogger(__name__)
 
 REQUIRED_DATA_DIR = "RequiredData"
@@ -31,7 +49,7 @@ subdirs = [
 if len(subdirs) == 1:
     actual_adblock_folder_name = subdirs[0]
     full_adblock_path = os.path.join(adblock_container_path, actual_adblock_folder_name)
-    logger.info(f"Full Adblock directory path: {full_adblock_path}")
+    logger.info("Full Adblock directory path: %s", full_adblock_path)
 else:
     raise ValueError(
         "AdblockDir contains multiple or no directories. It should only contain the Adblock extension folder!"
@@ -40,7 +58,7 @@ else:
 full_user_data_path = os.path.abspath(
     os.path.join(os.path.dirname(__file__), "..", REQUIRED_DATA_DIR, USER_DATA_DIR)
 )
-logger.info(f"Full user data directory for storage is: {full_user_data_path}")
+logger.info("Full user data directory for storage is: %s", full_user_data_path)
 
 
 class AutoplayerLauncher:
@@ -51,8 +69,37 @@ class AutoplayerLauncher:
 
     autoplayer: Autoplayer
 
-    def __init__(self, page: NeopetsPage, use_neopass: bool = False):
-        self.autoplayer = Autoplayer(page, use_neopass)
+    def __init__(
+            self,
+            page: NeopetsPage,
+            use_neopass: bool = False,
+            default_battle_policy_name: str = "default",
+            section_battle_policies: Dict[str, str] | None = None,
+    ):
+        self.autoplayer = Autoplayer(
+            page, use_neopass, default_battle_policy_name, section_battle_policies
+        )
+
+    def offer_section_start(self) -> None:
+        """
+        Say where the party is in terms of sections, and offer to walk to the nearest section start if it is not at one.
+        Needs a world atlas with recorded sections, see --record-atlas.
+        """
+        if OverworldHandler.atlas is None and not os.path.exists(DEFAULT_ATLAS_PATH):
+            return
+        print(self.autoplayer.describe_location())
+        starting_here, _ = self.autoplayer.get_route_planner().atlas.get_sections_at(
+            self.autoplayer.get_current_position()
+        )
+        if starting_here:
+            return
+        nearest = self.autoplayer.find_nearest_section_start()
+        if nearest is None:
+            return
+        section_name, path = nearest
+        choice = input(f"The nearest section start is {section_name}, {len(path)} steps away. Walk there? (y/n): ")
+        if choice.lower() == "y":
+            self.autoplayer.walk_to(f"section:{section_name}")
 
     def show_menu(self, context: BrowserContext, autoplayer: Autoplayer) -> None:
         while True:
@@ -64,12 +111,14 @@ class AutoplayerLauncher:
             print("5. Act 5 sections")
             print("6. Follow a custom path:")
             print("7. Grind battles")
+            print("8. Walk to a waypoint from the world atlas")
 
             choice = input("Enter your choice: ").lower()
 
             match choice:
                 case "q":
                     logger.info("Closing the autoplayer...")
+                    OverworldHandler.save_atlas()
                     context.close()
                     sys.exit(0)
                 case "1":
@@ -229,6 +278,10 @@ class AutoplayerLauncher:
                     else:
                         print("You did not enter a numeric value. Returning to main menu...")
 
+                case "8":
+                    waypoint_name = input("Enter the waypoint that you would like to walk to: ")
+                    self.autoplayer.walk_to(waypoint_name)
+
 
 @click.command()
 @click.option(
@@ -237,7 +290,170 @@ class AutoplayerLauncher:
     default=False,
     help="Use Neopass login method instead of traditional",
 )
-def main(use_neopass: bool) -> None:
+@click.option(
+    "--use-dom-extractor",
+    is_flag=True,
+    default=False,
+    help="Read battle pages with one in-page JavaScript call instead of parsing the page HTML",
+)
+@click.option(
+    "--record-battle-log",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Append every battle state to this file as JSON lines, e.g. to fit the combat simulator",
+)
+@click.option(
+    "--record-atlas",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help="Add every overworld move to this world atlas file, created if it does not exist",
+)
+@click.option(
+    "--battle-policy",
+    type=click.Choice(list(BATTLE_POLICIES)),
+    default="default",
+    help="Battle policy used by every section that does not set its own",
+)
+@click.option(
+    "--section-battle-policy",
+    multiple=True,
+    metavar="SECTION=POLICY",
+    help="Use a different battle policy for one section, e.g. complete_act1_zombom=kill_speed. Can be repeated.",
+)
+@click.option(
+    "--log-config",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="JSON file overriding the logging defaults, e.g. {\"levels\": {\"src.battle_handler\": \"DEBUG\"}}",
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    default=False,
+    help="Print the estimated requests, encounters and time for every section, then exit without playing",
+)
+@click.option(
+    "--requests-per-second",
+    type=click.FloatRange(min=0, min_open=True),
+    default=REQUEST_PACER.account_rate_per_second,
+    show_default=True,
+    help="Sustained request rate for the account",
+)
+@click.option(
+    "--request-burst",
+    type=click.IntRange(min=1),
+    default=REQUEST_PACER.account_burst,
+    show_default=True,
+    help="Requests the account can send back to back before the rate applies",
+)
+@click.option(
+    "--host-requests-per-second",
+    type=click.FloatRange(min=0, min_open=True),
+    default=REQUEST_PACER.host_rate_per_second,
+    show_default=True,
+    help="Sustained request rate to each host, shared by every account in this process",
+)
+@click.option(
+    "--host-request-burst",
+    type=click.IntRange(min=1),
+    default=REQUEST_PACER.host_burst,
+    show_default=True,
+    help="Requests all accounts together can send to a host back to back",
+)
+@click.option(
+    "--slow-site-p95-ms",
+    type=click.FloatRange(min=0, min_open=True),
+    default=CIRCUIT_BREAKER.p95_threshold_ms,
+    show_default=True,
+    help="Pause on the overworld when the p95 page load time of recent requests goes above this",
+)
+@click.option(
+    "--pause-when-site-is-slow/--never-pause",
+    default=True,
+    help="Whether to pause and probe the site when it gets slow or keeps failing",
+)
+@click.option(
+    "--timeout-multiplier",
+    type=click.FloatRange(min=1),
+    default=RetryPolicy.LATENCY_MULTIPLIER,
+    show_default=True,
+    help="Timeouts are this many times the p99 load time of recent requests",
+)
+@click.option(
+    "--plan",
+    "plan_path",
+    type=click.Path(exists=True, dir_okay=False),
+    default=None,
+    help="Play this JSON run plan without any prompts, then exit. See src/run_plan.py for the format",
+)
+@click.option(
+    "--run",
+    "run_entries",
+    multiple=True,
+    metavar="ENTRY",
+    help="Play without any prompts, then exit: complete_<section>, path:<digits>, grind:<steps> or walk:<waypoint>. "
+         "Can be repeated, runs after the --plan entries",
+)
+@click.option(
+    "--on-failure",
+    type=click.Choice(ON_FAILURE_POLICIES),
+    default=None,
+    help="What an unattended run does when an entry fails, defaults to the plan's setting or stop",
+)
+def main(
+        use_neopass: bool,
+        use_dom_extractor: bool,
+        record_battle_log: str | None,
+        record_atlas: str | None,
+        battle_policy: str,
+        section_battle_policy: Tuple[str, ...],
+        log_config: str | None,
+        dry_run: bool,
+        requests_per_second: float,
+        request_burst: int,
+        host_requests_per_second: float,
+        host_request_burst: int,
+        slow_site_p95_ms: float,
+        pause_when_site_is_slow: bool,
+        timeout_multiplier: float,
+        plan_path: str | None,
+        run_entries: Tuple[str, ...],
+        on_failure: str | None,
+) -> None:
+    logging_config = load_logging_config(log_config)
+    if log_config:
+        configure_logging(logging_config)
+    if dry_run:
+        # Request latency from earlier runs, if the log has any
+        cost_model = SectionCostModel.from_log(logging_config["file"]["path"])
+        print(format_estimates(SECTIONS, cost_model))
+        return
+    BattlePage.use_dom_extractor = use_dom_extractor
+    REQUEST_PACER.configure(requests_per_second, request_burst, host_requests_per_second, host_request_burst)
+    CIRCUIT_BREAKER.p95_threshold_ms = slow_site_p95_ms
+    CIRCUIT_BREAKER.enabled = pause_when_site_is_slow
+    RetryPolicy.LATENCY_MULTIPLIER = timeout_multiplier
+    BattlePage.battle_log_path = record_battle_log
+    if record_atlas:
+        OverworldHandler.atlas = WorldAtlas.load_or_create(record_atlas)
+        OverworldHandler.atlas_path = record_atlas
+    section_battle_policies = {}
+    for section_policy in section_battle_policy:
+        section_name, _, policy_name = section_policy.partition("=")
+        is_known_section = section_name.startswith("complete_") and hasattr(Autoplayer, section_name)
+        if not is_known_section or policy_name not in BATTLE_POLICIES:
+            raise click.BadParameter(
+                f"Expected SECTION=POLICY with a known section and one of {list(BATTLE_POLICIES)}, got {section_policy}",
+                param_hint="--section-battle-policy",
+            )
+        section_battle_policies[section_name] = policy_name
+    run_plan = None
+    if plan_path or run_entries:
+        try:
+            run_plan = RunPlan.from_file(plan_path, on_failure) if plan_path else RunPlan([], on_failure or "stop")
+            run_plan.entries += [parse_command_line_entry(entry) for entry in run_entries]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise click.BadParameter(str(e), param_hint="--plan/--run")
     with sync_playwright() as p:
         # browser = p.chromium.launch(headless=False)
         context = p.chromium.launch_persistent_context(
@@ -255,13 +471,42 @@ def main(use_neopass: bool) -> None:
         page.goto("https://www.neopets.com/games/nq2/nq2.phtml")
         neopets_page = NeopetsPage(page)
 
+        if run_plan is not None:
+            # Nobody is watching, so every way this can end becomes an exit code
+            try:
+                launcher = AutoplayerLauncher(
+                    use_neopass=use_neopass,
+                    page=neopets_page,
+                    default_battle_policy_name=battle_policy,
+                    section_battle_policies=section_battle_policies,
+                )
+            except Exception:
+                logger.exception("Could not log in and get to the overworld, nothing was played")
+                context.close()
+                sys.exit(EXIT_SETUP_FAILED)
+            exit_code = BatchRunner(launcher.autoplayer).run(run_plan)
+            OverworldHandler.save_atlas()
+            context.close()
+            sys.exit(exit_code)
+
         if use_neopass:
             logger.info("Launching autoplayer with Neopass authentication...")
-            launcher = AutoplayerLauncher(use_neopass=True, page=neopets_page)
+            launcher = AutoplayerLauncher(
+                use_neopass=True,
+                page=neopets_page,
+                default_battle_policy_name=battle_policy,
+                section_battle_policies=section_battle_policies,
+            )
         else:
             logger.info("Launching autoplayer with traditional authentication...")
-            launcher = AutoplayerLauncher(use_neopass=False, page=neopets_page)
-
+            launcher = AutoplayerLauncher(
+                use_neopass=False,
+                page=neopets_page,
+                default_battle_policy_name=battle_policy,
+                section_battle_policies=section_battle_policies,
+            )
+
+        launcher.offer_section_start()
         launcher.show_menu(context, launcher.autoplayer)
 
         # prev_coordinates = (
@@ -1,5 +1,6 @@
 import logging
 from enum import Enum
+from typing import Set
 
 from src.AutoplayerBaseHandler import AutoplayerBaseHandler
 from src.Pages.battle_page import BattlePage
@@ -7,8 +8,13 @@ from src.Pages.battle_result_page import BattleResultPage
 from src.Pages.battle_start_page import BattleStartPage
 from src.Pages.neopets_page import NeopetsPage
 from src.Pages.overworld_page import OverworldPage
-from src.potion_handler import PotionHandler
-from src.skillpoint_handler import SkillpointHandler
+from src.battle_policy import ALLY_SKILLS, BattleAction, BattlePolicy, DefaultBattlePolicy
+from src.battle_state import ALLY_NAMES, BattleTurn
+from src.game_actions import EndBattle, LeaveSpecialBattleEnd, perform
+from src.logging_config import LogContext
+from src.page_types import PageType
+from src.retry_policy import BATTLE_ACTION_RETRY_POLICY, PAGE_READ_RETRY_POLICY
+from src.run_ledger import RunLedger
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +23,6 @@ logger = logging.getLogger(__name__)
 # The current way requires a battle start page to be fed to the program first!!
 
 
-def does_need_healing(current_hp: int, max_hp: int) -> bool:
-    """
-    Evaluates a character's HP status and determines if they require potion healing
-    :param current_hp: character current HP
-    :param max_hp: character max HP
-    :return: True if HP ratio is below threshold, else False
-    """
-    return current_hp / max_hp < 0.55
-
-
 class BattleHandler(AutoplayerBaseHandler):
     ROHANE_TURN_IDENTIFIER = r"<b>Rohane</b>"
     MIPSY_TURN_IDENTIFIER = r"<b>Mipsy</b>"
@@ -47,14 +43,13 @@ class BattleHandler(AutoplayerBaseHandler):
     PLAYER_HEAL_URL_TEMPLATE = r"https://www.neopets.com/games/nq2/nq2.phtml?target=-1&fact=5&parm=&use_id={0}&nxactor={1}"
     # Only need to specify use_id and nxactor for convenience
     PLAYER_USE_POTION_URL_TEMPLATE = r"https://www.neopets.com/games/nq2/nq2.phtml?target=-1&fact=5&parm=&use_id={0}&nxactor={1}"
-    END_BATTLE_URL_TEMPLATE = r"https://www.neopets.com/games/nq2/nq2.phtml?target=-1&fact=2&parm=&use_id=-1&nxactor={0}"
-
-    SPECIAL_BATTLE_END_URL = r"https://www.neopets.com/games/nq2/nq2.phtml?finish=1"
-
-    # Enemies always have ID ranging from 5 to 8
-    INITIAL_ENEMY_ID = 5
 
-    def __init__(self, neopets_page: NeopetsPage, in_battle: bool = True) -> None:
+    def __init__(
+            self,
+            neopets_page: NeopetsPage,
+            in_battle: bool = True,
+            battle_policy: BattlePolicy | None = None,
+    ) -> None:
         # We expect a BattlePage object to be passed
         # NOTE: may not be a BattleStartPage when we receive it if we are in middle of battle
         if in_battle:
@@ -63,7 +58,7 @@ class BattleHandler(AutoplayerBaseHandler):
                 logger.info(
                     "Found battle start. Starting battle and initializing battle page..."
                 )
-                self.battle_start_page.click_start_battle_button()
+                self.battle_start_page.start_battle()
                 self.battle_page = BattlePage(self.battle_start_page.page_instance)
             else:
                 logger.info("Detected existing battle. Initializing battle page...")
@@ -79,29 +74,38 @@ class BattleHandler(AutoplayerBaseHandler):
             self.battle_start_page = None
             self.battle_page = None
             self.battle_result_page = None
-        # WE NEED TO KEEP TRACK OF THIS SO WE DON'T HAVE TO LOOP THROUGH NUMS 5-8 EVERY TIME WE ATTACK LOL
-        # BUT!!! THIS NEEDS TO BE RESET!!! SO MAYBE WE... I DON'T KNOW
-        self.current_target = BattleHandler.INITIAL_ENEMY_ID
-        self.mipsy_turns_elapsed_counter = -1
-        self.velm_turns_elapsed_counter = -1
+        # The policy decides what allies do and remembers the current target and buff timings for the battle
+        self.battle_policy = battle_policy or DefaultBattlePolicy()
+        # These survive across battles so grinding can decide when to stop
+        self.total_experience_gained = 0
+        self.last_known_potion_count: int | None = None
+        self.run_ledger = RunLedger()
+        # Turns of the current battle we already sent an action for
+        self.submitted_turns: Set[BattleTurn] = set()
 
     def reset_battle_specific_counters(self) -> None:
         """
         Run this method at the end of each battle to clean the game state from the battle handler.
         """
         logger.info("Cleaning up battle-specific counters...")
-        self.current_target = BattleHandler.INITIAL_ENEMY_ID
-        # We basically just use this to cast group haste every 4 turns
-        self.mipsy_turns_elapsed_counter = -1
-        # Same for Velm and group shielding
-        self.velm_turns_elapsed_counter = -1
+        self.battle_policy.reset()
+        self.submitted_turns = set()
+        LogContext.end_battle()
+
+    def set_battle_policy(self, battle_policy: BattlePolicy) -> None:
+        """
+        Swap the policy used for ally turns, e.g. when a section wants to fight differently.
+        :param battle_policy: policy to use from the next ally turn onward
+        """
+        logger.info("Switching battle policy to %s", type(battle_policy).__name__)
+        self.battle_policy = battle_policy
 
     def is_battle_start(self) -> bool:
         """
         Method to determine how to initialize the battle handler depending on if battle is in progress or starting.
         :return: True if we are actually on a battle start page, else False
         """
-        if self.battle_start_page.start_battle_button.count() > 0:
+        if self.battle_start_page.get_page_type() == PageType.GAME_BATTLE_START:
             logger.info("We are starting a battle!")
             return True
         else:
@@ -119,8 +123,8 @@ class BattleHandler(AutoplayerBaseHandler):
             )
             return True
         elif (
-                self.battle_page.page_instance.locator(BattlePage.END_FIGHT_LOCATOR).count()
-                > 0
+                self.battle_page.get_battle_state().turn_type
+                == BattlePage.TurnType.BATTLE_OVER.name
         ):
             logger.info("The battle is over! Passing off control to the next method...")
             return True
@@ -129,30 +133,22 @@ class BattleHandler(AutoplayerBaseHandler):
             return False
 
     def start_battle(self, neopets_page: NeopetsPage) -> BattlePage:
+        LogContext.start_battle()
         self.battle_start_page = BattleStartPage(neopets_page.page_instance)
-        # RARE ISSUE: we click the start button but the page fails to load
-        # The button/link to start battle gets clicked BUT never finishes loading
-        # We reload the page and find that the battle has started - but this is just a step in the click element method!!!
-        # BUT the retry handler believes that we didn't click yet!!!
-        try:
-            self.battle_start_page.click_start_battle_button()
-            self.battle_page = BattlePage(self.battle_start_page.page_instance)
-        except Exception as e:
-            logger.warning(
-                "We were unable to start the battle correctly. The begin battle click may have been interrupted by a page reload!"
-            )
-            page_html = self.battle_start_page.get_page_content()
-            # TODO: create a constant for this
-            if "The fight begins" in page_html:
-                logger.info(
-                    "The battle start action went through and we ended up on a battle page. Setting the battle page instance..."
-                )
-                self.battle_page = BattlePage(self.battle_start_page.page_instance)
-            else:
-                # TODO: create and throw a custom exception for failed battle start
-                raise Exception(
-                    "We tried to start the battle but it failed for some unknown reason. See the log files for more info"
-                )
+        # A start that times out but goes through leaves the game on the battle, which the start action checks for
+        # before sending itself again
+        self.battle_start_page.start_battle()
+        self.battle_page = BattlePage(self.battle_start_page.page_instance)
+        return self.battle_page
+
+    def resume_battle(self, neopets_page: NeopetsPage) -> BattlePage:
+        """
+        Pick up a battle that is already in progress, e.g. one left over from a previous run.
+        :param neopets_page: page object for the tab showing the battle
+        """
+        logger.info("Resuming a battle that is already in progress...")
+        LogContext.start_battle()
+        self.battle_page = BattlePage(neopets_page.page_instance)
         return self.battle_page
 
     def win_battle(self) -> None:
@@ -167,35 +163,25 @@ class BattleHandler(AutoplayerBaseHandler):
         self.reset_battle_specific_counters()
 
     def advance_battle(self) -> BattlePage:
-        max_retries = 5
-        actor_id = None
-        for attempt in range(max_retries):
-            try:
-                actor_id = self.battle_page.get_next_actor_id()
-                break
-            except Exception as e:
-                logger.info(
-                    f"Attempt {attempt}: Failed to get actor id for supposed battle page: {e}"
-                )
-                self.battle_page.page_instance.reload()
-        else:
-            logger.warning("All attempts to get actor id failed.")
-            # Optionally raise or handle according to your needs
+        # Never reload here: the current URL is the action that got us to this page, and reloading it resubmits it
+        actor_id = PAGE_READ_RETRY_POLICY.run(
+            lambda timeout_ms: self.battle_page.get_next_actor_id(),
+            "read the next actor id from the battle page",
+            recover=self.battle_page.go_to_game_page,
+        )
 
         if actor_id >= 1 and actor_id <= 8:
-            match actor_id:
-                case BattlePage.AllyTurnType.ROHANE.value:
-                    self.handle_rohane_turn()
-                case BattlePage.AllyTurnType.MIPSY.value:
-                    self.handle_mipsy_turn()
-                case BattlePage.AllyTurnType.TALINIA.value:
-                    self.handle_talinia_turn()
-                case BattlePage.AllyTurnType.VELM.value:
-                    self.handle_velm_turn()
-                case _:
-                    self.handle_enemy_turn(actor_id)
+            if actor_id <= BattleHandler.AllyId.VELM.value:
+                # Ally turn pages list the potions we are carrying, so keep track for potion-aware grinding
+                self.last_known_potion_count = sum(
+                    self.battle_page.get_battle_state().potions.values()
+                )
+                self.handle_ally_turn(actor_id)
+            else:
+                self.handle_enemy_turn(actor_id)
             return self.battle_page
         else:
+            self.battle_page.dump_page_history("unexpected page during battle")
             # TODO: create and throw custom exception for unknown page encounter during battle
             raise Exception("The program ran into an unexpected page during battle")
 
@@ -207,331 +193,155 @@ class BattleHandler(AutoplayerBaseHandler):
         """
 
         # Need to wait for navigation to complete before doing anything
-        self.battle_page.go_to_url_and_wait_navigation(
-            BattleHandler.ENEMY_TURN_URL_TEMPLATE.format(enemy_id)
-        )
+        self.submit_turn(BattleHandler.ENEMY_TURN_URL_TEMPLATE.format(enemy_id), enemy_id)
 
         return self.battle_page
 
-    def get_best_available_potion_id(self, current_hp: int, max_hp: int) -> int:
+    def handle_ally_turn(self, ally_id: int) -> BattlePage:
         """
-        Takes current and max HP values and determines the most efficient potion to use.
-        If the player does not have that potion, then it checks the next viable potion on the list.
-        If the player has no potions, then just return -1 and handle in calling method.
+        Let the battle policy pick an action for the ally whose turn it is, then submit it.
+        :param ally_id: actor id of the ally to take action
         """
-        ranked_potions = PotionHandler.get_best_potions_by_efficiency(
-            current_hp, max_hp
+        ally_name = ALLY_NAMES[ally_id - 1]
+        action = self.battle_policy.choose_action(
+            ally_name, self.battle_page.get_battle_state()
         )
-        available_potions = self.battle_page.get_available_healing_potions()
-        available_potions_lowercase = [
-            potion_name.lower() for potion_name in available_potions
-        ]
-
-        best_potion_id = -1
-        for potion_id, potion_name in ranked_potions:
-            if potion_name.lower() in available_potions_lowercase:
-                best_potion_id = potion_id
-                break
-        # WE SHOULD PROBABLY STOP ATTACKING AND GO HEAL HERE, BUT TELL IT TO CONTINUE FIGHTING
-        if best_potion_id == -1:
-            logger.warning("The player is out of potions! This is extremely dangerous.")
-            # Note: we considered throwing an error here, but it is a common scenario in early levels
-        return best_potion_id
-
-    def handle_rohane_turn(self) -> BattlePage:
-        # Check if we need potion heal
-        # Otherwise, just basic attack
-
-        hp_vals = self.battle_page.get_character_hp_vals()["Rohane"]
-        rohane_current_hp = hp_vals["current_hp"]
-        rohane_max_hp = hp_vals["max_hp"]
-
-        if does_need_healing(rohane_current_hp, rohane_max_hp):
-            best_potion_id = self.get_best_available_potion_id(
-                rohane_current_hp, rohane_max_hp
+        for avoided_ally_name, skill_id in self.battle_policy.pop_avoided_casts():
+            self.run_ledger.record_avoided_cast(
+                avoided_ally_name, ALLY_SKILLS[avoided_ally_name](skill_id).name
             )
-
-            if best_potion_id != -1:
-                healing_url = BattleHandler.PLAYER_HEAL_URL_TEMPLATE.format(
-                    best_potion_id, BattleHandler.AllyId.ROHANE.value
-                )
-                logger.info(f"We would go to healing url: {healing_url}")
-                self.battle_page.go_to_url_and_wait_navigation(healing_url)
-                return self.battle_page
-            else:
-                logger.warning(
-                    "Rohane needs to heal but we do not have any potions! Basic attacking and seeing what happens..."
-                )
-
-        # Try attacking the first monster -> if defeated, increment the id and try again, etc.
-        attack_url = BattleHandler.PLAYER_ATTACK_URL_TEMPLATE.format(
-            self.current_target, BattleHandler.AllyId.ROHANE.value
-        )
-        logger.info(f"We would go to the attack url: {attack_url}")
-        self.battle_page.go_to_url_and_wait_navigation(attack_url)
-        while self.battle_page.has_attacked_invalid_target():
-            if self.is_battle_over():
-                logger.warning(
-                    "The battle ended but we were still trying to attack a target! Returning control from Rohane's turn call."
-                )
-                # self.end_battle()
-                break
-            else:
-                self.current_target += 1
-                attack_url = BattleHandler.PLAYER_ATTACK_URL_TEMPLATE.format(
-                    self.current_target, BattleHandler.AllyId.ROHANE.value
-                )
-                self.battle_page.go_to_url_and_wait_navigation(attack_url)
-            # You must select a valid target to cast on!
+        if self.perform_action(ally_id, action):
+            self.battle_policy.record_action(ally_name, action)
         return self.battle_page
 
-    def handle_mipsy_turn(self):
-        # This will try to cast Group Haste even if Mipsy doesn't have it
-        # It wastes a page load, but that is not a huge issue
-        hp_vals = self.battle_page.get_character_hp_vals()["Mipsy"]
-        mipsy_current_hp = hp_vals["current_hp"]
-        mipsy_max_hp = hp_vals["max_hp"]
-
-        if does_need_healing(mipsy_current_hp, mipsy_max_hp):
-            best_potion_id = self.get_best_available_potion_id(
-                mipsy_current_hp, mipsy_max_hp
-            )
-
-            if best_potion_id != -1:
-                healing_url = BattleHandler.PLAYER_HEAL_URL_TEMPLATE.format(
-                    best_potion_id, BattleHandler.AllyId.MIPSY.value
+    @staticmethod
+    def get_action_url(ally_id: int, action: BattleAction) -> str:
+        """
+        Turn a battle action into the URL that submits it.
+        :param ally_id: actor id of the ally taking the action
+        :param action: action chosen by the battle policy
+        """
+        match action.kind:
+            case BattleAction.Kind.ATTACK:
+                return BattleHandler.PLAYER_ATTACK_URL_TEMPLATE.format(
+                    action.target, ally_id
                 )
-                logger.info(f"Mipsy healing with URL: {healing_url}")
-                self.battle_page.go_to_url_and_wait_navigation(healing_url)
-                logger.info("Incrementing Mipsy turn counter by 1...")
-
-                self.mipsy_turns_elapsed_counter += 1
-                return self.battle_page
-            else:
-                # Fall through to take a battle action instead if we have no potions
-                logger.warning(
-                    "Mipsy needs to heal but no potions are available! Casting skill anyway..."
+            case BattleAction.Kind.POTION:
+                return BattleHandler.PLAYER_HEAL_URL_TEMPLATE.format(
+                    action.potion_id, ally_id
                 )
-
-        # Start of battle OR 3 turns have passed
-        if (
-                self.mipsy_turns_elapsed_counter == -1
-                or self.mipsy_turns_elapsed_counter >= 4
-        ):
-            haste_spellcast_url = self.PLAYER_UNTARGETED_SPELLCAST_URL_TEMPLATE.format(
-                SkillpointHandler.MipsySkill.GROUP_HASTE.value,
-                BattleHandler.AllyId.MIPSY.value,
-            )
-            self.battle_page.go_to_url_and_wait_navigation(haste_spellcast_url)
-            logger.info(
-                "Mipsy has casted group haste! Resetting turn counter to zero..."
-            )
-            self.mipsy_turns_elapsed_counter = 0
-
-        else:
-            # Try attacking the first monster -> if defeated, increment the id and try again, etc.
-            spellcast_url = BattleHandler.PLAYER_TARGETED_SPELLCAST_URL_TEMPLATE.format(
-                self.current_target,
-                SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value,
-                BattleHandler.AllyId.MIPSY.value,
-            )
-            logger.info(f"We would go to the spellcast url: {spellcast_url}")
-            self.battle_page.go_to_url_and_wait_navigation(spellcast_url)
-
-            # After performing spellcast, make sure the turn actually advanced
-            while self.battle_page.has_attacked_invalid_target():
-                if self.is_battle_over():
-                    logger.warning(
-                        "The battle ended but we were still trying to cast on a target! Returning control from Mipsy turn call."
-                    )
-                    break
-                else:
-                    self.current_target += 1
-                    spellcast_url = (
-                        BattleHandler.PLAYER_TARGETED_SPELLCAST_URL_TEMPLATE.format(
-                            self.current_target,
-                            SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value,
-                            BattleHandler.AllyId.MIPSY.value,
-                        )
-                    )
-                    self.battle_page.go_to_url_and_wait_navigation(spellcast_url)
-            # Once we know the turn has successfully completed, increment counter
-            self.mipsy_turns_elapsed_counter += 1
-        return self.battle_page
-
-    def handle_talinia_turn(self) -> BattlePage:
-        hp_vals = self.battle_page.get_character_hp_vals()["Talinia"]
-        talinia_current_hp = hp_vals["current_hp"]
-        talinia_max_hp = hp_vals["max_hp"]
-
-        if does_need_healing(talinia_current_hp, talinia_max_hp):
-            best_potion_id = self.get_best_available_potion_id(
-                talinia_current_hp, talinia_max_hp
-            )
-            if best_potion_id != -1:
-                healing_url = BattleHandler.PLAYER_HEAL_URL_TEMPLATE.format(
-                    best_potion_id,
-                    BattleHandler.AllyId.TALINIA.value,  # Ensure .value is 3
+            case BattleAction.Kind.SKILL if action.target == -1:
+                return BattleHandler.PLAYER_UNTARGETED_SPELLCAST_URL_TEMPLATE.format(
+                    action.skill_id, ally_id
                 )
-                logger.info(f"We would go to healing url: {healing_url}")
-                self.battle_page.go_to_url_and_wait_navigation(healing_url)
-                return self.battle_page
-            else:
-                logger.warning(
-                    "Talinia needs to heal but we do not have any potions! Basic attacking and seeing what happens..."
+            case _:
+                return BattleHandler.PLAYER_TARGETED_SPELLCAST_URL_TEMPLATE.format(
+                    action.target, action.skill_id, ally_id
                 )
 
-        attack_url = BattleHandler.PLAYER_ATTACK_URL_TEMPLATE.format(
-            self.current_target,
-            BattleHandler.AllyId.TALINIA.value,  # Use Talinia's actor id (3)
-        )
-        logger.info(f"We would go to the attack url: {attack_url}")
-        self.battle_page.go_to_url_and_wait_navigation(attack_url)
+    def perform_action(self, ally_id: int, action: BattleAction) -> bool:
+        """
+        Submit an ally action. If it was aimed at an enemy that is already defeated, move on to the next enemy.
+        :param ally_id: actor id of the ally taking the action
+        :param action: action chosen by the battle policy
+        :return: True if the action was sent, False if it was dropped because its turn had already passed
+        """
+        action_url = BattleHandler.get_action_url(ally_id, action)
+        logger.info("Ally %s taking action with URL: %s", ally_id, action_url)
+        if not self.submit_turn(action_url, ally_id):
+            return False
+        if not action.targets_enemy:
+            return True
+
+        # You must select a valid target to cast on!
         while self.battle_page.has_attacked_invalid_target():
             if self.is_battle_over():
                 logger.warning(
-                    "The battle ended but we were still trying to attack a target! Returning control from Talinia's turn call."
+                    "The battle ended but ally %s was still trying to attack a target! Returning control...", ally_id
                 )
                 break
-            else:
-                self.current_target += 1
-                attack_url = BattleHandler.PLAYER_ATTACK_URL_TEMPLATE.format(
-                    self.current_target, BattleHandler.AllyId.TALINIA.value
-                )
-                self.battle_page.go_to_url_and_wait_navigation(attack_url)
-        return self.battle_page
-
-    def handle_velm_turn(self) -> BattlePage:
-        hp_vals = self.battle_page.get_character_hp_vals()["Velm"]
-        velm_current_hp = hp_vals["current_hp"]
-        velm_max_hp = hp_vals["max_hp"]
-
-        if does_need_healing(velm_current_hp, velm_max_hp):
-            best_potion_id = self.get_best_available_potion_id(
-                velm_current_hp, velm_max_hp
-            )
-            if best_potion_id != -1:
-                healing_url = BattleHandler.PLAYER_HEAL_URL_TEMPLATE.format(
-                    best_potion_id,
-                    BattleHandler.AllyId.VELM.value,  # Ensure .value is 3
-                )
-                logger.info(f"We would go to healing url: {healing_url}")
-                self.battle_page.go_to_url_and_wait_navigation(healing_url)
-
-                logger.info(
-                    "Velm has taken a turn to heal. Incrementing Velm turn counter by 1..."
-                )
-                self.velm_turns_elapsed_counter += 1
-                return self.battle_page
-            else:
-                logger.warning(
-                    "Velm needs to heal but we do not have any potions! Continuing with heal/shield and seeing what happens..."
-                )
-
-        if (
-                self.velm_turns_elapsed_counter == -1
-                or self.velm_turns_elapsed_counter >= 4
-        ):
-            shield_spellcast_url = self.PLAYER_UNTARGETED_SPELLCAST_URL_TEMPLATE.format(
-                SkillpointHandler.VelmSkill.GROUP_SHIELD.value,
-                BattleHandler.AllyId.VELM.value,
-            )
-
-            self.battle_page.go_to_url_and_wait_navigation(shield_spellcast_url)
-            logger.info("Velm casted group haste! Resetting Velm turn counter to 0...")
-            self.velm_turns_elapsed_counter = 0
-
-            return self.battle_page
+            action.target = self.battle_policy.on_invalid_target(action)
+            action_url = BattleHandler.get_action_url(ally_id, action)
+            if not self.submit_turn(action_url, ally_id):
+                break
+        return True
 
-        else:
-            # Determine which ally has the lowest HP ratio
-            hp_vals = self.battle_page.get_character_hp_vals()
-            rohane_hp_vals = hp_vals["Rohane"]
-            mipsy_hp_vals = hp_vals["Mipsy"]
-            talinia_hp_vals = hp_vals["Talinia"]
-            velm_hp_vals = hp_vals["Velm"]
-
-            rohane_hp_ratio = rohane_hp_vals["current_hp"] / rohane_hp_vals["max_hp"]
-            mipsy_hp_ratio = mipsy_hp_vals["current_hp"] / mipsy_hp_vals["max_hp"]
-            talinia_hp_ratio = talinia_hp_vals["current_hp"] / talinia_hp_vals["max_hp"]
-            velm_hp_ratio = velm_hp_vals["current_hp"] / velm_hp_vals["max_hp"]
-
-            lowest_hp_ratio = min(
-                [rohane_hp_ratio, mipsy_hp_ratio, talinia_hp_ratio, velm_hp_ratio]
-            )
-            if lowest_hp_ratio == rohane_hp_ratio:
-                actor_to_heal_id = BattleHandler.AllyId.ROHANE.value
-            elif lowest_hp_ratio == mipsy_hp_ratio:
-                actor_to_heal_id = BattleHandler.AllyId.MIPSY.value
-            elif lowest_hp_ratio == talinia_hp_ratio:
-                actor_to_heal_id = BattleHandler.AllyId.TALINIA.value
-            elif lowest_hp_ratio == velm_hp_ratio:
-                actor_to_heal_id = BattleHandler.AllyId.VELM.value
-            else:
-                logger.error(f"The HP ratio calculated did not match any ally actors! The ratio is: {lowest_hp_ratio}")
-                # TODO: create and throw custom exception for HP that does not match any ally's HP
-                raise ValueError(
-                    "Expected an HP ratio that matches an ally actor's HP ratio. This breaks Velm's turn and must be fixed."
-                )
+    def has_turn_advanced(self, turn: BattleTurn) -> bool:
+        """
+        Idempotency check for battle actions: the page no longer shows the turn the action was meant for.
+        :param turn: turn the action was submitted for
+        """
+        battle_state = self.battle_page.get_battle_state()
+        return (
+                battle_state.get_turn() != turn
+                or battle_state.turn_type == BattlePage.TurnType.BATTLE_OVER.name
+        )
 
-            single_heal_url = self.PLAYER_TARGETED_SPELLCAST_URL_TEMPLATE.format(
-                actor_to_heal_id,
-                SkillpointHandler.VelmSkill.HEAL.value,
-                BattleHandler.AllyId.VELM.value,
-            )
-            logger.info(
-                f"Velm is attempting to heal ally with actor id: {actor_to_heal_id}"
-            )
-            self.battle_page.go_to_url_and_wait_navigation(single_heal_url)
-            self.velm_turns_elapsed_counter += 1
+    def submit_turn(self, action_url: str, actor_id: int) -> bool:
+        """
+        Visit a battle action URL, tagged with the battle turn it is meant for. An action is never sent again once
+        the battle has moved past its turn: neither when the visit fails, nor when we find ourselves about to send
+        a second action for a turn we already acted on.
+        :param action_url: URL submitting the action
+        :param actor_id: actor the action is for
+        :return: True if the action was sent, False if it was dropped because its turn had already passed
+        """
+        turn = self.battle_page.get_battle_state().get_turn()
+        if turn.nxactor != actor_id:
+            logger.warning("Refusing to send an action for actor %s during %s", actor_id, turn)
+            self.battle_page.dump_page_history("battle actor desync")
+            return False
+        if turn in self.submitted_turns:
+            logger.warning("We already sent an action for %s. Checking the game before sending another...", turn)
+            self.battle_page.go_to_game_page()
+            if self.has_turn_advanced(turn):
+                logger.warning("The battle has moved on, so the action is dropped instead of being sent twice")
+                self.battle_page.dump_page_history("battle turn desync")
+                return False
+
+        self.submitted_turns.add(turn)
+        LogContext.next_turn()
+        logger.debug("Submitting %s for %s", action_url, turn)
+        self.battle_page.go_to_url_and_wait_navigation(
+            action_url,
+            is_already_done=lambda: self.has_turn_advanced(turn),
+            retry_policy=BATTLE_ACTION_RETRY_POLICY,
+        )
+        return True
 
-        return self.battle_page
+    def record_battle_rewards(self, battle_result_page: BattleResultPage) -> None:
+        """
+        Add the experience shown on a battle result page to the running total.
+        :param battle_result_page: page object for the result page, before leaving it
+        """
+        experience_gained = battle_result_page.get_experience_gained()
+        self.total_experience_gained += experience_gained
+        logger.info(
+            "Gained %s experience (%s total this run)", experience_gained, self.total_experience_gained
+        )
 
     # NOTE: The resulting page after using this method is NOT a BattlePage instance
     # We just put the end battle methods into here to avoid adding another really empty page class
     def end_battle(self) -> OverworldPage:
         """
-        Exit the battle instance and go to the post battle page
-        :return:
+        Exit a finished battle through the result page. Only uses what win_battle already worked out about the page,
+        each step is checked by the page it lands on instead, so ending a battle that is not over fails right there.
+        :return: OverworldPage for the same tab
         """
-        # # RESET THE CURRENT TARGET COUNT FOR BATTLE HANDLER TO ZERO AFTER FINISHING BATTLE
-        # self.current_target = 5
-        if self.is_battle_over():
-            # We need to check this because early exits jump straight to a special battle end page
-            # It is NOT a traditional battle end page -> clicking continue button or link leads to a real battle end page
-            # So we need to click the continue link TWICE
-            if self.battle_page.is_special_boss_early_exit():
-                logger.info(
-                    "Trying to exit special boss early exit that jumped right to special battle end!"
-                    "It should lead to a real battle end page."
-                )
-                self.battle_result_page = BattleResultPage(
-                    self.battle_page.page_instance
-                )
-                logger.info(
-                    "Advancing past the special battle end page. We should get a real results page after..."
-                )
-                self.battle_result_page.click_return_to_map_link()
-                logger.info("Now ending battle on the normal battle end page!")
-                self.battle_result_page.click_return_to_map_link()
-            else:
-                logger.info("Trying to exit the completed normal battle...")
-                actor_id = self.battle_page.get_next_actor_id()
-                self.battle_page.go_to_url_and_wait_navigation(
-                    BattleHandler.END_BATTLE_URL_TEMPLATE.format(actor_id)
-                )
-                self.battle_result_page = BattleResultPage(
-                    self.battle_page.page_instance
-                )
-                self.battle_result_page.click_return_to_map_link()
-
-            # Clean the battle state for the next battle
-            self.reset_battle_specific_counters()
-        else:
-            logger.error("Program tried to end the battle when the battle is not over!")
-            # TODO: create and throw custom exception for program ending battle when not over
-            raise Exception(
-                "Program tried to end the battle when the battle is not over, so we are confused!"
-            )
-        # Clicking return to map button results in an overworld page in MOST cases
+        page = self.battle_page
+        # Early exits jump straight to a special battle end page, which leads to the real result page
+        page_type = page.get_page_type()
+        if page_type != PageType.GAME_BATTLE_SPECIAL_END:
+            logger.info("Trying to exit the completed normal battle...")
+            page_type = perform(page, EndBattle(page.get_next_actor_id()))
+        if page_type == PageType.GAME_BATTLE_SPECIAL_END:
+            logger.info("Advancing past the special battle end page. We should get a real results page after...")
+            perform(page, LeaveSpecialBattleEnd())
+
+        self.battle_result_page = BattleResultPage(page.page_instance)
+        self.record_battle_rewards(self.battle_result_page)
+        self.battle_result_page.return_to_map()
+        # Clean the battle state for the next battle
+        self.reset_battle_specific_counters()
+        # Returning to the map results in an overworld page in MOST cases
         return OverworldPage(self.battle_result_page.page_instance)
@@ -0,0 +1,395 @@
+"""
+Battle policies decide what each ally does on their turn.
+
+A policy lists the candidate actions for the ally whose turn it is, scores each of them from the current
+BattleState, and the highest score wins. The BattleHandler only turns the chosen action into a URL and visits it,
+so swapping policies never touches the navigation code.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from enum import Enum, auto
+from typing import Dict, List, Set, Tuple
+
+from src.battle_state import ALLY_NAMES, BattleState
+from src.potion_handler import PotionHandler
+from src.skillpoint_handler import SkillpointHandler
+
+logger = logging.getLogger(__name__)
+
+# Enemies always have ID ranging from 5 to 8
+INITIAL_ENEMY_ID = 5
+
+
+def does_need_healing(current_hp: int, max_hp: int, threshold: float = 0.55) -> bool:
+    """
+    Evaluates a character's HP status and determines if they require potion healing
+    :param current_hp: character current HP
+    :param max_hp: character max HP
+    :param threshold: HP ratio below which the character needs healing
+    :return: True if HP ratio is below threshold, else False
+    """
+    return current_hp / max_hp < threshold
+
+
+def get_ally_actor_id(ally_name: str) -> int:
+    """Allies are actors 1 to 4 in the order Rohane, Mipsy, Talinia, Velm."""
+    return ALLY_NAMES.index(ally_name) + 1
+
+
+class BattleAction:
+    class Kind(Enum):
+        ATTACK = auto()
+        SKILL = auto()
+        POTION = auto()
+
+    def __init__(
+            self,
+            kind: Kind,
+            target: int = -1,
+            skill_id: int | None = None,
+            potion_id: int | None = None,
+    ) -> None:
+        """
+        :param kind: what sort of action this is
+        :param target: actor id of the target, or -1 for untargeted actions
+        :param skill_id: skill to cast for SKILL actions
+        :param potion_id: potion to drink for POTION actions
+        """
+        self.kind = kind
+        self.target = target
+        self.skill_id = skill_id
+        self.potion_id = potion_id
+
+    @property
+    def targets_enemy(self) -> bool:
+        return self.target >= INITIAL_ENEMY_ID
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BattleAction) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        return (
+            f"BattleAction({self.kind.name}, target={self.target}, skill_id={self.skill_id}, "
+            f"potion_id={self.potion_id})"
+        )
+
+    @staticmethod
+    def attack(target: int) -> "BattleAction":
+        return BattleAction(BattleAction.Kind.ATTACK, target=target)
+
+    @staticmethod
+    def skill(skill_id: int, target: int = -1) -> "BattleAction":
+        return BattleAction(BattleAction.Kind.SKILL, target=target, skill_id=skill_id)
+
+    @staticmethod
+    def potion(potion_id: int) -> "BattleAction":
+        return BattleAction(BattleAction.Kind.POTION, potion_id=potion_id)
+
+
+class BattlePolicy(ABC):
+    """
+    Base class for every battle policy. It keeps the little bit of memory a policy needs during one battle:
+    which enemy we are currently hitting, how many turns each ally took since their last buff and which skills
+    each ally actually has. Casts of skills an ally does not have are skipped for the next best action.
+    """
+
+    def __init__(self) -> None:
+        self.current_target = INITIAL_ENEMY_ID
+        self.turns_since_buff: Dict[str, int] = {}
+        self.known_skills: Dict[str, Set[int]] = {}
+        self.has_seen_buffs = False
+        # (ally name, skill id) of casts we wanted but skipped because the ally does not have the skill
+        self.avoided_casts: List[Tuple[str, int]] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Run this method at the end of each battle to clean the battle-specific memory.
+        """
+        self.current_target = INITIAL_ENEMY_ID
+        # -1 means the ally has not buffed at all this battle
+        self.turns_since_buff = {ally_name: -1 for ally_name in ALLY_NAMES}
+        # Skills each ally has, as seen in their action menu. Allies we have not seen yet are allowed anything
+        self.known_skills = {}
+        # Until the page shows a buff, we cannot tell "no buffs" apart from "buffs not shown" and go by turn counts
+        self.has_seen_buffs = False
+
+    @abstractmethod
+    def get_candidate_actions(self, ally_name: str, battle_state: BattleState) -> List[BattleAction]:
+        """
+        List every action worth considering for the ally whose turn it is.
+        """
+
+    @abstractmethod
+    def score_action(self, ally_name: str, action: BattleAction, battle_state: BattleState) -> float:
+        """
+        Score a candidate action. The highest scoring candidate is taken.
+        """
+
+    def get_fallback_action(self, ally_name: str, battle_state: BattleState) -> BattleAction:
+        """
+        Action to take when none of the candidates can be used, e.g. the ally does not have any of the skills yet.
+        """
+        return BattleAction.attack(self.current_target)
+
+    def is_buff_due(self, ally_name: str, skill_id: int, battle_state: BattleState, buff_interval: int) -> bool:
+        """
+        Determine if a group buff should be cast now: it is missing or about to run out on any living ally.
+        :param ally_name: ally who would cast the buff
+        :param skill_id: group buff skill id
+        :param battle_state: current battle state
+        :param buff_interval: recast every this many turns of the ally if the page has not shown any buffs yet
+        """
+        if not self.has_seen_buffs:
+            turns_since_buff = self.turns_since_buff[ally_name]
+            return turns_since_buff == -1 or turns_since_buff >= buff_interval
+
+        buff_name = BUFF_NAMES[skill_id]
+        for name, (current_hp, max_hp) in battle_state.allies.items():
+            if current_hp <= 0:
+                continue
+            # Missing counts as 0 rounds left. None means the page does not show how long it lasts, so leave it be
+            rounds_left = battle_state.buffs.get(name, {}).get(buff_name, 0)
+            if rounds_left is not None and rounds_left <= BUFF_REFRESH_ROUNDS:
+                return True
+        return False
+
+    def can_use(self, ally_name: str, action: BattleAction) -> bool:
+        if action.kind != BattleAction.Kind.SKILL or ally_name not in self.known_skills:
+            return True
+        return action.skill_id in self.known_skills[ally_name]
+
+    def choose_action(self, ally_name: str, battle_state: BattleState) -> BattleAction:
+        if battle_state.buffs:
+            self.has_seen_buffs = True
+        if battle_state.skills:
+            # The menu only shows the skills of the ally whose turn it is, and they do not change during a battle
+            self.known_skills[ally_name] = set(battle_state.skills)
+
+        candidate_actions = self.get_candidate_actions(ally_name, battle_state)
+        fallback_action = self.get_fallback_action(ally_name, battle_state)
+        if fallback_action not in candidate_actions:
+            candidate_actions.append(fallback_action)
+
+        # sorted is stable, so equally scored candidates stay in the order of preference they were listed in
+        ranked_actions = sorted(
+            candidate_actions,
+            key=lambda action: self.score_action(ally_name, action, battle_state),
+            reverse=True,
+        )
+        chosen_action = fallback_action
+        for action in ranked_actions:
+            if self.can_use(ally_name, action):
+                chosen_action = action
+                break
+            # Only casts we would actually have made are worth recording
+            self.avoided_casts.append((ally_name, action.skill_id))
+        logger.info("%s chose %s for %s", type(self).__name__, chosen_action, ally_name)
+        return chosen_action
+
+    def pop_avoided_casts(self) -> List[Tuple[str, int]]:
+        avoided_casts, self.avoided_casts = self.avoided_casts, []
+        return avoided_casts
+
+    def record_action(self, ally_name: str, action: BattleAction) -> None:
+        """
+        Update the battle memory once an action actually went through.
+        """
+        if action.kind == BattleAction.Kind.SKILL and action.skill_id in BUFF_SKILL_IDS:
+            self.turns_since_buff[ally_name] = 0
+        else:
+            self.turns_since_buff[ally_name] += 1
+
+    def on_invalid_target(self, action: BattleAction) -> int:
+        """
+        The target of the action was already defeated, so move on to the next enemy.
+        :return: actor id of the new target
+        """
+        self.current_target = max(self.current_target, action.target) + 1
+        return self.current_target
+
+    @staticmethod
+    def get_best_potion_id(battle_state: BattleState, current_hp: int, max_hp: int) -> int:
+        """
+        Takes current and max HP values and determines the most efficient potion we are carrying.
+        If the player has no potions, then just return -1 and handle in calling method.
+        """
+        for potion_id, potion_name in PotionHandler.get_best_potions_by_efficiency(current_hp, max_hp):
+            if potion_id in battle_state.potions:
+                return potion_id
+        return -1
+
+    @staticmethod
+    def get_lowest_hp_ally(battle_state: BattleState) -> str:
+        """
+        Determine which ally has the lowest HP ratio. Ties go to whoever comes first in the party order.
+        """
+        allies_in_party_order = [name for name in ALLY_NAMES if name in battle_state.allies]
+        return min(
+            allies_in_party_order,
+            key=lambda name: battle_state.allies[name][0] / battle_state.allies[name][1],
+        )
+
+    def get_potion_action(
+            self, ally_name: str, battle_state: BattleState, healing_threshold: float
+    ) -> BattleAction | None:
+        current_hp, max_hp = battle_state.allies[ally_name]
+        if not does_need_healing(current_hp, max_hp, healing_threshold):
+            return None
+        best_potion_id = BattlePolicy.get_best_potion_id(battle_state, current_hp, max_hp)
+        if best_potion_id == -1:
+            # Note: we considered throwing an error here, but it is a common scenario in early levels
+            logger.warning(
+                "%s needs to heal but we do not have any potions! Taking a battle action instead...", ally_name
+            )
+            return None
+        return BattleAction.potion(best_potion_id)
+
+
+ALLY_SKILLS = {
+    "Rohane": SkillpointHandler.RohaneSkill,
+    "Mipsy": SkillpointHandler.MipsySkill,
+    "Talinia": SkillpointHandler.TaliniaSkill,
+    "Velm": SkillpointHandler.VelmSkill,
+}
+
+# Skills that buff the whole party, and the name of the buff as the battle page shows it
+BUFF_NAMES = {
+    SkillpointHandler.MipsySkill.GROUP_HASTE.value: "Haste",
+    SkillpointHandler.VelmSkill.GROUP_SHIELD.value: "Shield",
+}
+BUFF_SKILL_IDS = set(BUFF_NAMES)
+# Refresh a buff once it has this many rounds or fewer left
+BUFF_REFRESH_ROUNDS = 1
+
+
+class DefaultBattlePolicy(BattlePolicy):
+    """
+    The behaviour the autoplayer has always had:
+    - anyone under 55% HP drinks the most efficient potion we have
+    - Rohane and Talinia attack the current target
+    - Mipsy casts group haste when it is missing or about to run out, otherwise direct damage
+    - Velm casts group shield when it is missing or about to run out, otherwise heals the weakest ally
+    If the page does not show buffs, haste and shield are recast every 4 turns of the caster instead.
+    """
+
+    HEALING_THRESHOLD = 0.55
+    BUFF_INTERVAL = 4
+
+    POTION_SCORE = 3
+    BUFF_SCORE = 2
+    DEFAULT_ACTION_SCORE = 1
+
+    def get_candidate_actions(self, ally_name: str, battle_state: BattleState) -> List[BattleAction]:
+        candidate_actions = []
+        potion_action = self.get_potion_action(ally_name, battle_state, self.HEALING_THRESHOLD)
+        if potion_action:
+            candidate_actions.append(potion_action)
+
+        if ally_name == "Mipsy":
+            candidate_actions.append(BattleAction.skill(SkillpointHandler.MipsySkill.GROUP_HASTE.value))
+            candidate_actions.append(
+                BattleAction.skill(SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value, self.current_target)
+            )
+        elif ally_name == "Velm":
+            candidate_actions.append(BattleAction.skill(SkillpointHandler.VelmSkill.GROUP_SHIELD.value))
+            candidate_actions.append(
+                BattleAction.skill(
+                    SkillpointHandler.VelmSkill.HEAL.value,
+                    get_ally_actor_id(BattlePolicy.get_lowest_hp_ally(battle_state)),
+                )
+            )
+        else:
+            candidate_actions.append(BattleAction.attack(self.current_target))
+        return candidate_actions
+
+    def score_action(self, ally_name: str, action: BattleAction, battle_state: BattleState) -> float:
+        if action.kind == BattleAction.Kind.POTION:
+            return self.POTION_SCORE
+        if action.skill_id in BUFF_SKILL_IDS:
+            is_due = self.is_buff_due(ally_name, action.skill_id, battle_state, self.BUFF_INTERVAL)
+            return self.BUFF_SCORE if is_due else 0
+        return self.DEFAULT_ACTION_SCORE
+
+
+class KillSpeedBattlePolicy(BattlePolicy):
+    """
+    Tries to end every battle in as few turns as possible, since each turn is a full round trip to the server:
+    - only drink potions when HP gets properly low
+    - focus the enemy with the least HP left, so enemies drop out (and stop taking turns) sooner
+    - only spend turns on group buffs when the fight looks long enough for them to pay off
+    - Velm hits the target with a basic attack unless someone actually needs healing
+    """
+
+    HEALING_THRESHOLD = 0.35
+    VELM_HEAL_THRESHOLD = 0.5
+    BUFF_INTERVAL = 6
+    # Combined enemy HP above which a fight is expected to last long enough for a group buff to pay off
+    LONG_FIGHT_ENEMY_HP = 150
+
+    def get_focus_target(self, battle_state: BattleState) -> int:
+        """
+        Pick the living enemy with the least HP left. Falls back to the current target if we cannot see enemy HP.
+        """
+        living_enemies = [
+            (current_hp, INITIAL_ENEMY_ID + index)
+            for index, (current_hp, max_hp) in enumerate(battle_state.enemies)
+            if current_hp > 0 and INITIAL_ENEMY_ID + index >= self.current_target
+        ]
+        if not living_enemies:
+            return self.current_target
+        return min(living_enemies)[1]
+
+    def is_long_fight(self, battle_state: BattleState) -> bool:
+        if not battle_state.enemies:
+            # Can't tell, so assume the worst like the default policy does
+            return True
+        remaining_enemy_hp = sum(current_hp for current_hp, max_hp in battle_state.enemies)
+        return remaining_enemy_hp >= self.LONG_FIGHT_ENEMY_HP
+
+    def get_candidate_actions(self, ally_name: str, battle_state: BattleState) -> List[BattleAction]:
+        candidate_actions = []
+        potion_action = self.get_potion_action(ally_name, battle_state, self.HEALING_THRESHOLD)
+        if potion_action:
+            candidate_actions.append(potion_action)
+
+        focus_target = self.get_focus_target(battle_state)
+        if ally_name == "Mipsy":
+            candidate_actions.append(BattleAction.skill(SkillpointHandler.MipsySkill.GROUP_HASTE.value))
+            candidate_actions.append(
+                BattleAction.skill(SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value, focus_target)
+            )
+        elif ally_name == "Velm":
+            candidate_actions.append(BattleAction.skill(SkillpointHandler.VelmSkill.GROUP_SHIELD.value))
+            candidate_actions.append(
+                BattleAction.skill(
+                    SkillpointHandler.VelmSkill.HEAL.value,
+                    get_ally_actor_id(BattlePolicy.get_lowest_hp_ally(battle_state)),
+                )
+            )
+            candidate_actions.append(BattleAction.attack(focus_target))
+        else:
+            candidate_actions.append(BattleAction.attack(focus_target))
+        return candidate_actions
+
+    def get_fallback_action(self, ally_name: str, battle_state: BattleState) -> BattleAction:
+        return BattleAction.attack(self.get_focus_target(battle_state))
+
+    def score_action(self, ally_name: str, action: BattleAction, battle_state: BattleState) -> float:
+        if action.kind == BattleAction.Kind.POTION:
+            return 4
+        if action.skill_id in BUFF_SKILL_IDS:
+            is_due = self.is_buff_due(ally_name, action.skill_id, battle_state, self.BUFF_INTERVAL)
+            return 2 if is_due and self.is_long_fight(battle_state) else 0
+        if action.skill_id == SkillpointHandler.VelmSkill.HEAL.value:
+            lowest_hp_ally = BattlePolicy.get_lowest_hp_ally(battle_state)
+            current_hp, max_hp = battle_state.allies[lowest_hp_ally]
+            return 3 if does_need_healing(current_hp, max_hp, self.VELM_HEAL_THRESHOLD) else 0
+        return 1
+
+
+BATTLE_POLICIES = {
+    "default": DefaultBattlePolicy,
+    "kill_speed": KillSpeedBattlePolicy,
+}
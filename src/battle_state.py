@@ -0,0 +1,352 @@
+"""
+Snapshot of everything the battle handler needs to know about the current battle page.
+
+There are two ways to build one:
+- from_html parses the serialized page HTML with BeautifulSoup (the original way of doing things)
+- from_page runs a single JavaScript function in the live DOM and gets the whole thing back as JSON,
+  so Python does no parsing at all and we only pay for one round trip to the browser
+Both are meant to return the exact same state for the same page.
+"""
+
+import re
+from typing import Dict, List
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from playwright.sync_api import Page
+
+GAME_CONTAINER_CLASS = "contentModule phpGamesNonPortalView"
+ALLY_NAMES = ["Rohane", "Mipsy", "Talinia", "Velm"]
+
+# Image sources that identify whose turn it is, checked in this order
+TURN_TYPE_IMAGES = [
+    ("ENEMY", "//images.neopets.com/nq2/x/com_next.gif"),
+    ("PLAYER", "//images.neopets.com/nq2/x/com_atk.gif"),
+    ("BATTLE_OVER", "//images.neopets.com/nq2/x/com_end.gif"),
+]
+
+HP_PATTERN = re.compile(r"^\d+/\d+$")
+# Skill ids (see SkillpointHandler) show up in the handlers of the action menu options for the ally whose turn it is
+SKILL_OPTION_PATTERN = re.compile(r"\b9[1-6]0[1-5]\b")
+# Active buffs are listed with the ally (as text or image alt/title), e.g. "Haste (3)" with the rounds left
+BUFF_PATTERN = re.compile(r"\b(Haste|Shield)\w*(?:\s*\((\d+)\))?")
+# Elements that innerText puts on lines of their own
+BLOCK_TAGS = frozenset(
+    {"div", "p", "center", "form", "table", "tr", "td", "th", "ul", "ol", "li", "h1", "h2", "h3", "h4", "h5", "h6"}
+)
+
+# Mirrors from_html line for line. Takes the known potion names and returns a plain JSON object.
+BATTLE_STATE_EXTRACTOR_JS = r"""
+([allyNames, turnTypeImages, potionNames]) => {
+    const container = document.querySelector("div.contentModule.phpGamesNonPortalView") || document.body;
+
+    const actorInput = document.querySelector("input[type='hidden'][name='nxactor']");
+    const nxactor = actorInput ? parseInt(actorInput.value, 10) : null;
+
+    let turnType = null;
+    for (const [name, src] of turnTypeImages) {
+        if (document.querySelector(`img[src='${src}']`)) {
+            turnType = name;
+            break;
+        }
+    }
+
+    const directText = (element) => Array.from(element.childNodes)
+        .filter((node) => node.nodeType === Node.TEXT_NODE)
+        .map((node) => node.textContent.trim());
+
+    const allies = {};
+    const enemies = [];
+    const buffs = {};
+    for (const font of container.querySelectorAll("font")) {
+        const hpText = font.textContent.trim();
+        if (!/^\d+\/\d+$/.test(hpText)) {
+            continue;
+        }
+        const tdHp = font.closest("td");
+        const table = tdHp ? tdHp.parentElement.closest("table") : null;
+        const parentTd = table ? table.parentElement.closest("td") : null;
+        if (!parentTd) {
+            continue;
+        }
+        let name = null;
+        for (const bold of parentTd.querySelectorAll("b")) {
+            if (allyNames.includes(bold.textContent.trim())) {
+                name = bold.textContent.trim();
+                break;
+            }
+        }
+        if (name === null) {
+            name = directText(parentTd).find((text) => allyNames.includes(text)) || null;
+        }
+        const [current, max] = hpText.split("/").map((value) => parseInt(value, 10));
+        if (name === null) {
+            enemies.push([current, max]);
+        } else if (!(name in allies)) {
+            allies[name] = [current, max];
+            const buffTexts = [parentTd.textContent];
+            for (const image of parentTd.querySelectorAll("img")) {
+                buffTexts.push(image.getAttribute("alt") || "", image.getAttribute("title") || "");
+            }
+            for (const match of buffTexts.join(" ").matchAll(/\b(Haste|Shield)\w*(?:\s*\((\d+)\))?/g)) {
+                buffs[name] = buffs[name] || {};
+                buffs[name][match[1]] = match[2] === undefined ? null : parseInt(match[2], 10);
+            }
+        }
+    }
+
+    const pageText = container.innerText.replace(/\s+/g, " ");
+    const escapeRegExp = (text) => text.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+    const potions = {};
+    for (const [potionId, potionName] of potionNames) {
+        if (!pageText.includes(potionName) || pageText.includes(`used a ${potionName}`)) {
+            continue;
+        }
+        const countMatch = pageText.match(new RegExp(`${escapeRegExp(potionName)}\\s*\\((\\d+)\\)`));
+        potions[potionId] = countMatch ? parseInt(countMatch[1], 10) : 1;
+    }
+
+    const skills = [];
+    for (const option of container.querySelectorAll("a")) {
+        const handler = `${option.getAttribute("onclick") || ""} ${option.getAttribute("href") || ""}`;
+        for (const match of handler.matchAll(/\b9[1-6]0[1-5]\b/g)) {
+            const skillId = parseInt(match[0], 10);
+            if (!skills.includes(skillId)) {
+                skills.push(skillId);
+            }
+        }
+    }
+
+    const messages = container.innerText.split("\n")
+        .map((line) => line.replace(/\s+/g, " ").trim())
+        .filter((line) => line.length > 0);
+
+    return {nxactor, turn_type: turnType, allies, enemies, potions, skills, buffs, messages};
+}
+"""
+
+
+class BattleTurn:
+    """
+    Identifies one turn of a battle: whose turn it is plus the battle log at that point. Two pages with the same turn
+    identity show the same moment of the battle, so an action sent for one must not be sent again for the other
+    once the battle has moved past it.
+    """
+
+    def __init__(self, nxactor: int | None, log_length: int, log_digest: int) -> None:
+        self.nxactor = nxactor
+        self.log_length = log_length
+        self.log_digest = log_digest
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BattleTurn) and vars(self) == vars(other)
+
+    def __hash__(self) -> int:
+        return hash((self.nxactor, self.log_length, self.log_digest))
+
+    def __repr__(self) -> str:
+        return f"BattleTurn(nxactor={self.nxactor}, log_length={self.log_length})"
+
+
+class BattleState:
+    def __init__(
+            self,
+            nxactor: int | None,
+            turn_type: str | None,
+            allies: Dict[str, List[int]],
+            enemies: List[List[int]],
+            potions: Dict[int, int],
+            messages: List[str],
+            skills: List[int] | None = None,
+            buffs: Dict[str, Dict[str, int | None]] | None = None,
+    ) -> None:
+        """
+        :param nxactor: actor id of the next (current turn) actor, None if the page has no actor input
+        :param turn_type: name of a BattlePage.TurnType member, None if no turn marker was found
+        :param allies: ally name -> [current HP, max HP]
+        :param enemies: [current HP, max HP] of every other combatant, in page order
+        :param potions: potion id -> number available
+        :param messages: lines of text in the game container, e.g. the battle log
+        :param skills: skill ids in the action menu of the ally whose turn it is, empty if none were found
+        :param buffs: ally name -> buff name -> rounds left (None if the page does not say), for active buffs only
+        """
+        self.nxactor = nxactor
+        self.turn_type = turn_type
+        self.allies = allies
+        self.enemies = enemies
+        self.potions = potions
+        self.messages = messages
+        self.skills = skills or []
+        self.buffs = buffs or {}
+        # Whitespace is collapsed so texts split over inline tags still match
+        self.page_text = " ".join(" ".join(messages).split())
+
+    def has_text(self, text: str) -> bool:
+        return text in self.page_text
+
+    def get_turn(self) -> BattleTurn:
+        return BattleTurn(self.nxactor, len(self.messages), hash(tuple(self.messages)))
+
+    def get_character_hp_vals(self) -> Dict[str, Dict[str, int]]:
+        """
+        Ally HP in the same shape BattlePage has always returned it.
+        """
+        return {
+            name: {"current_hp": current_hp, "max_hp": max_hp}
+            for name, (current_hp, max_hp) in self.allies.items()
+        }
+
+    def to_json(self) -> dict:
+        """
+        Plain JSON object in the same shape the in-page extractor returns, so from_json can read it back.
+        """
+        return {
+            "nxactor": self.nxactor,
+            "turn_type": self.turn_type,
+            "allies": self.allies,
+            "enemies": self.enemies,
+            "potions": self.potions,
+            "skills": self.skills,
+            "buffs": self.buffs,
+            "messages": self.messages,
+        }
+
+    @staticmethod
+    def from_json(battle_state_json: dict) -> "BattleState":
+        return BattleState(
+            battle_state_json["nxactor"],
+            battle_state_json["turn_type"],
+            battle_state_json["allies"],
+            battle_state_json["enemies"],
+            # JSON object keys are always strings
+            {
+                int(potion_id): count
+                for potion_id, count in battle_state_json["potions"].items()
+            },
+            battle_state_json["messages"],
+            # Battle logs recorded before skills and buffs were extracted do not have them
+            battle_state_json.get("skills", []),
+            battle_state_json.get("buffs", {}),
+        )
+
+    @staticmethod
+    def from_page(page: Page, potion_names: Dict[int, str]) -> "BattleState":
+        """
+        Extract the battle state straight from the live DOM with a single evaluate call.
+        :param page: Playwright page showing the battle
+        :param potion_names: potion id -> potion name for every potion we know about
+        """
+        battle_state_json = page.evaluate(
+            BATTLE_STATE_EXTRACTOR_JS,
+            [ALLY_NAMES, TURN_TYPE_IMAGES, list(potion_names.items())],
+        )
+        return BattleState.from_json(battle_state_json)
+
+    @staticmethod
+    def from_html(page_html: str, potion_names: Dict[int, str]) -> "BattleState":
+        """
+        Parse the battle state out of the serialized page HTML.
+        :param page_html: HTML of the battle page
+        :param potion_names: potion id -> potion name for every potion we know about
+        """
+        soup = BeautifulSoup(page_html, "html.parser")
+        container = soup.find("div", class_=GAME_CONTAINER_CLASS) or soup
+
+        actor_input = soup.find("input", attrs={"type": "hidden", "name": "nxactor"})
+        nxactor = int(actor_input["value"]) if actor_input else None
+
+        turn_type = None
+        for turn_type_name, image_src in TURN_TYPE_IMAGES:
+            if soup.find("img", attrs={"src": image_src}):
+                turn_type = turn_type_name
+                break
+
+        allies = {}
+        enemies = []
+        buffs = {}
+        for hp_tag in container.find_all("font"):
+            raw_hp_text = hp_tag.get_text(strip=True)
+            if not HP_PATTERN.match(raw_hp_text):
+                continue
+
+            # Walk up to the td holding the whole HP table, which is also where ally names live
+            # Monster names are not in there
+            td_hp = hp_tag.find_parent("td")
+            table = td_hp.find_parent("table") if td_hp else None
+            parent_td = table.find_parent("td") if table else None
+            if not parent_td:
+                continue
+
+            # On an ally's own turn their name is bold, otherwise it is plain text directly in the td
+            character_name = None
+            for name_tag in parent_td.find_all("b"):
+                if name_tag.get_text(strip=True) in ALLY_NAMES:
+                    character_name = name_tag.get_text(strip=True)
+                    break
+            if character_name is None:
+                for content in parent_td.contents:
+                    if isinstance(content, NavigableString) and str(content).strip() in ALLY_NAMES:
+                        character_name = str(content).strip()
+                        break
+
+            current_hp, max_hp = (int(hp_val) for hp_val in raw_hp_text.split("/"))
+            if character_name is None:
+                enemies.append([current_hp, max_hp])
+            elif character_name not in allies:
+                allies[character_name] = [current_hp, max_hp]
+                buff_texts = [parent_td.get_text()]
+                for image in parent_td.find_all("img"):
+                    buff_texts += [image.get("alt", ""), image.get("title", "")]
+                for buff_name, rounds_left in BUFF_PATTERN.findall(" ".join(buff_texts)):
+                    buffs.setdefault(character_name, {})[buff_name] = (
+                        int(rounds_left) if rounds_left else None
+                    )
+
+        skills = []
+        for option in container.find_all("a"):
+            handler = f"{option.get('onclick', '')} {option.get('href', '')}"
+            for skill_id in SKILL_OPTION_PATTERN.findall(handler):
+                if int(skill_id) not in skills:
+                    skills.append(int(skill_id))
+
+        messages = [" ".join(line.split()) for line in get_text_lines(container) if line.strip()]
+        page_text = " ".join(" ".join(messages).split())
+
+        potions = {}
+        for potion_id, potion_name in potion_names.items():
+            # Potion use text makes a potion show up in the page even when we just used the last one
+            if potion_name not in page_text or f"used a {potion_name}" in page_text:
+                continue
+            count_match = re.search(rf"{re.escape(potion_name)}\s*\((\d+)\)", page_text)
+            potions[potion_id] = int(count_match.group(1)) if count_match else 1
+
+        return BattleState(nxactor, turn_type, allies, enemies, potions, messages, skills, buffs)
+
+
+def get_text_lines(element: Tag) -> List[str]:
+    """
+    Split the text of an element into lines the way the browser's innerText does, so from_html and the extractor
+    see the same battle log: <br> and block elements start a new line, while line breaks in the HTML source are just
+    whitespace.
+    :param element: element whose text to split
+    """
+    text_parts: List[str] = []
+    append_text_parts(element, text_parts)
+    return "".join(text_parts).split("\n")
+
+
+def append_text_parts(element: Tag, text_parts: List[str]) -> None:
+    for child in element.children:
+        if isinstance(child, NavigableString):
+            # Comments, doctypes and the like are NavigableString subclasses that innerText leaves out
+            if type(child) is NavigableString:
+                text_parts.append(re.sub(r"\s", " ", child))
+        elif child.name == "br":
+            text_parts.append("\n")
+        elif child.name in ("script", "style"):
+            continue
+        elif child.name in BLOCK_TAGS:
+            text_parts.append("\n")
+            append_text_parts(child, text_parts)
+            text_parts.append("\n")
+        else:
+            append_text_parts(child, text_parts)
@@ -0,0 +1,161 @@
+"""
+Circuit breaker for site slowdowns. Every page load reports its latency or its failure, and the breaker keeps a rolling
+window of them. When the window's p95 latency or error rate goes past its threshold, the breaker opens. The autoplayer
+then stops at the next safe point (on the overworld, outside any battle) instead of pushing actions through a
+struggling site and burning retries on them. While paused it probes the game page now and then, and resumes once
+probes come back fast again. A maintenance page trips the breaker straight away, without waiting for the window.
+"""
+
+import collections
+import logging
+import time
+from typing import Callable, Deque
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyCircuitBreaker:
+    def __init__(
+            self,
+            window_size: int = 40,
+            min_samples: int = 10,
+            p95_threshold_ms: float = 10000,
+            error_rate_threshold: float = 0.3,
+            recovery_latency_ms: float = 3000,
+            recovery_probes: int = 2,
+            probe_interval_seconds: float = 60,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param window_size: most recent page loads the percentiles and error rate are taken over
+        :param min_samples: page loads needed in the window before the breaker can open
+        :param p95_threshold_ms: open when the window's p95 latency goes above this
+        :param error_rate_threshold: open when more than this share of the window failed
+        :param recovery_latency_ms: a probe counts as healthy when it loads faster than this
+        :param recovery_probes: healthy probes in a row needed to resume
+        :param probe_interval_seconds: wait between probes while paused
+        :param clock: monotonic clock in seconds, can be swapped out for tests
+        :param sleep: called with the wait between probes, can be swapped out for tests
+        """
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self.p95_threshold_ms = p95_threshold_ms
+        self.error_rate_threshold = error_rate_threshold
+        self.recovery_latency_ms = recovery_latency_ms
+        self.recovery_probes = recovery_probes
+        self.probe_interval_seconds = probe_interval_seconds
+        self.clock = clock
+        self.sleep = sleep
+        # Latency in milliseconds of every page load, None for the ones that failed
+        self.samples: Deque[float | None] = collections.deque(maxlen=window_size)
+        self.enabled = True
+        # Set by trip(), stays open until the probes recover
+        self.is_tripped = False
+        self.is_paused = False
+        self.times_opened = 0
+        self.seconds_paused = 0.0
+
+    def record_success(self, latency_ms: float) -> None:
+        self.samples.append(latency_ms)
+
+    def record_failure(self) -> None:
+        self.samples.append(None)
+
+    def trip(self, reason: str) -> None:
+        """
+        Open the breaker right away, e.g. when the site says it is down for maintenance.
+        :param reason: what happened, for the logs
+        """
+        if not self.is_tripped:
+            logger.warning("Tripped the circuit breaker: %s", reason)
+        self.is_tripped = True
+        self.record_failure()
+
+    def get_percentile_ms(self, percentile: float) -> float | None:
+        latencies = sorted(sample for sample in self.samples if sample is not None)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile))]
+
+    def get_observed_percentile_ms(self, percentile: float) -> float | None:
+        """
+        Like get_percentile_ms, but None until the window holds enough successful page loads to go by.
+        """
+        if sum(sample is not None for sample in self.samples) < self.min_samples:
+            return None
+        return self.get_percentile_ms(percentile)
+
+    def get_error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(sample is None for sample in self.samples) / len(self.samples)
+
+    def get_summary(self) -> str:
+        p50_ms = self.get_percentile_ms(0.5)
+        p95_ms = self.get_percentile_ms(0.95)
+        if p50_ms is None:
+            return f"no successful page loads in the last {len(self.samples)}"
+        return (
+            f"p50 {p50_ms:.0f} ms, p95 {p95_ms:.0f} ms, {self.get_error_rate():.0%} errors "
+            f"over the last {len(self.samples)} page loads"
+        )
+
+    def is_open(self) -> bool:
+        if not self.enabled:
+            return False
+        if self.is_tripped:
+            return True
+        if len(self.samples) < self.min_samples:
+            return False
+        if self.get_error_rate() > self.error_rate_threshold:
+            return True
+        p95_ms = self.get_percentile_ms(0.95)
+        return p95_ms is not None and p95_ms > self.p95_threshold_ms
+
+    def wait_if_open(self, probe: Callable[[], float | None]) -> float:
+        """
+        Called at safe points, or where the site is known to be down so nothing could reach the game anyway. Does
+        nothing while the site is healthy, otherwise pauses until probes recover.
+        :param probe: loads a harmless page and returns its latency in milliseconds, or None if it failed
+        :return: seconds paused
+        """
+        if self.is_paused or not self.is_open():
+            return 0.0
+        self.is_paused = True
+        try:
+            return self.pause_until_recovered(probe)
+        finally:
+            self.is_paused = False
+
+    def pause_until_recovered(self, probe: Callable[[], float | None]) -> float:
+        self.times_opened += 1
+        paused_at = self.clock()
+        logger.warning(
+            "The site is struggling (%s), pausing and probing every %.0f s",
+            self.get_summary(),
+            self.probe_interval_seconds,
+        )
+        healthy_probes = 0
+        while healthy_probes < self.recovery_probes:
+            self.sleep(self.probe_interval_seconds)
+            latency_ms = probe()
+            if latency_ms is not None and latency_ms <= self.recovery_latency_ms:
+                healthy_probes += 1
+            else:
+                healthy_probes = 0
+            if latency_ms is None:
+                logger.info("Probe failed, still paused")
+            else:
+                logger.info("Probe took %.0f ms, %d healthy in a row", latency_ms, healthy_probes)
+
+        seconds_paused = self.clock() - paused_at
+        self.seconds_paused += seconds_paused
+        # The slow samples describe a site that is not there anymore
+        self.samples.clear()
+        self.is_tripped = False
+        logger.warning("The site recovered after %.0f s, resuming", seconds_paused)
+        return seconds_paused
+
+
+CIRCUIT_BREAKER = LatencyCircuitBreaker()
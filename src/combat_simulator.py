@@ -0,0 +1,310 @@
+"""
+Offline combat simulator for comparing battle policies without spending real playtime.
+
+The CombatModel holds everything the simulator knows about a fight: ally max HP and damage, which enemy groups show
+up, how hard enemies hit, and what potions we carry. It is fitted from battle states recorded with
+BattlePage.battle_log_path (one BattleState JSON object per line). Fights are then played out turn by turn with the
+real BattlePolicy classes making every ally decision, so a policy behaves here exactly as it would in the game.
+
+Skill effects are deliberately simple: group haste multiplies ally damage, group shield cuts enemy damage and heal
+restores a fitted amount of HP, all for a fixed number of rounds.
+"""
+
+import json
+import random
+import re
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+from src.battle_policy import BATTLE_POLICIES, BattleAction, BattlePolicy, INITIAL_ENEMY_ID
+from src.battle_state import ALLY_NAMES, BattleState
+from src.potion_handler import PotionHandler
+from src.skillpoint_handler import SkillpointHandler
+
+# "Rohane attacks the Plains Lupe for 12 damage!"
+ALLY_DAMAGE_PATTERN = re.compile(rf"^({'|'.join(ALLY_NAMES)})\b.*? for (\d+) damage")
+# "The Plains Lupe bites Rohane for 12 damage!"
+ENEMY_DAMAGE_PATTERN = re.compile(rf"^The .+? ({'|'.join(ALLY_NAMES)}) for (\d+) damage")
+# Healing that did not come out of a potion, i.e. Velm's heal
+SKILL_HEAL_PATTERN = re.compile(r"^(?!.*used a ).*?(?:regains|regained|heals|healed) .*?(\d+)")
+
+# Used when the recorded logs have no samples at all for something
+DEFAULT_DAMAGE = (10.0, 3.0)
+DEFAULT_HEAL_AMOUNT = 30.0
+
+BUFF_DURATION_ROUNDS = 4
+HASTE_DAMAGE_MULTIPLIER = 1.5
+SHIELD_DAMAGE_MULTIPLIER = 0.7
+
+# Anything longer than this is counted as a stalemate instead of looping forever
+MAX_TURNS_PER_BATTLE = 500
+
+
+def get_damage_distribution(samples: List[int]) -> Tuple[float, float]:
+    if not samples:
+        return DEFAULT_DAMAGE
+    if len(samples) == 1:
+        return float(samples[0]), 0.0
+    return statistics.fmean(samples), statistics.stdev(samples)
+
+
+class CombatModel:
+    def __init__(
+            self,
+            ally_max_hp: Dict[str, int],
+            ally_damage: Dict[str, Tuple[float, float]],
+            enemy_groups: List[List[int]],
+            enemy_damage: Tuple[float, float],
+            heal_amount: float,
+            potions: Dict[int, int],
+    ) -> None:
+        """
+        :param ally_max_hp: ally name -> max HP, for every ally in the party
+        :param ally_damage: ally name -> (mean, standard deviation) of damage per hit
+        :param enemy_groups: max HP of every enemy in each enemy group we have seen, one group is drawn per battle
+        :param enemy_damage: (mean, standard deviation) of enemy damage per hit
+        :param heal_amount: HP restored by a heal skill
+        :param potions: potion id -> number carried at the start of every battle
+        """
+        self.ally_max_hp = ally_max_hp
+        self.ally_damage = ally_damage
+        self.enemy_groups = enemy_groups
+        self.enemy_damage = enemy_damage
+        self.heal_amount = heal_amount
+        self.potions = potions
+
+    @staticmethod
+    def fit(battle_state_jsons: Iterable[dict]) -> "CombatModel":
+        """
+        Fit a model from recorded battle states.
+        :param battle_state_jsons: BattleState JSON objects, e.g. the lines of a BattlePage.battle_log_path file
+        """
+        ally_max_hp = {}
+        ally_damage_samples = {}
+        enemy_damage_samples = []
+        heal_samples = []
+        enemy_groups = []
+        potions = {}
+        for battle_state_json in battle_state_jsons:
+            battle_state = BattleState.from_json(battle_state_json)
+            for name, (current_hp, max_hp) in battle_state.allies.items():
+                ally_max_hp[name] = max(ally_max_hp.get(name, 0), max_hp)
+
+            # A group where nobody has been hurt yet is the start of a fight, so each fight is counted once
+            if battle_state.enemies and all(
+                    current_hp == max_hp for current_hp, max_hp in battle_state.enemies
+            ):
+                enemy_groups.append([max_hp for current_hp, max_hp in battle_state.enemies])
+
+            if battle_state.potions:
+                potions = battle_state.potions
+
+            for message in battle_state.messages:
+                ally_damage_match = ALLY_DAMAGE_PATTERN.match(message)
+                enemy_damage_match = ENEMY_DAMAGE_PATTERN.match(message)
+                heal_match = SKILL_HEAL_PATTERN.match(message)
+                if ally_damage_match:
+                    ally_damage_samples.setdefault(ally_damage_match.group(1), []).append(
+                        int(ally_damage_match.group(2))
+                    )
+                elif enemy_damage_match:
+                    enemy_damage_samples.append(int(enemy_damage_match.group(2)))
+                elif heal_match:
+                    heal_samples.append(int(heal_match.group(1)))
+
+        if not ally_max_hp or not enemy_groups:
+            raise ValueError("The battle log needs at least one ally and one fresh enemy group to fit a model")
+
+        return CombatModel(
+            ally_max_hp,
+            {name: get_damage_distribution(ally_damage_samples.get(name, [])) for name in ally_max_hp},
+            enemy_groups,
+            get_damage_distribution(enemy_damage_samples),
+            statistics.fmean(heal_samples) if heal_samples else DEFAULT_HEAL_AMOUNT,
+            potions,
+        )
+
+    @staticmethod
+    def from_battle_log(battle_log_path: str) -> "CombatModel":
+        with open(battle_log_path, "r") as f:
+            return CombatModel.fit(json.loads(line) for line in f if line.strip())
+
+
+class SimulationReport:
+    def __init__(
+            self,
+            num_battles: int = 0,
+            num_turns: int = 0,
+            potions_used: int = 0,
+            num_deaths: int = 0,
+            num_stalemates: int = 0,
+    ) -> None:
+        self.num_battles = num_battles
+        self.num_turns = num_turns
+        self.potions_used = potions_used
+        self.num_deaths = num_deaths
+        self.num_stalemates = num_stalemates
+
+    def merge(self, other: "SimulationReport") -> "SimulationReport":
+        return SimulationReport(
+            self.num_battles + other.num_battles,
+            self.num_turns + other.num_turns,
+            self.potions_used + other.potions_used,
+            self.num_deaths + other.num_deaths,
+            self.num_stalemates + other.num_stalemates,
+        )
+
+    @property
+    def turns_per_battle(self) -> float:
+        return self.num_turns / self.num_battles if self.num_battles else 0.0
+
+    @property
+    def potions_per_battle(self) -> float:
+        return self.potions_used / self.num_battles if self.num_battles else 0.0
+
+    @property
+    def death_rate(self) -> float:
+        return self.num_deaths / self.num_battles if self.num_battles else 0.0
+
+
+def draw_damage(rng: random.Random, damage_distribution: Tuple[float, float]) -> int:
+    mean, standard_deviation = damage_distribution
+    return max(0, round(rng.gauss(mean, standard_deviation)))
+
+
+def simulate_battle(model: CombatModel, policy: BattlePolicy, rng: random.Random) -> SimulationReport:
+    """
+    Play out a single battle. Every ally action and every enemy action counts as one turn, since each of them is a
+    page load in the real game, and so does every attack that hits an already defeated enemy.
+    """
+    party = [name for name in ALLY_NAMES if name in model.ally_max_hp]
+    ally_hp = dict(model.ally_max_hp)
+    enemy_max_hp = rng.choice(model.enemy_groups)
+    enemy_hp = list(enemy_max_hp)
+    potions = dict(model.potions)
+    haste_rounds = 0
+    shield_rounds = 0
+    report = SimulationReport(num_battles=1)
+    policy.reset()
+
+    while report.num_turns < MAX_TURNS_PER_BATTLE:
+        for ally_name in party:
+            if ally_hp[ally_name] <= 0:
+                continue
+            active_buffs = {
+                buff_name: rounds_left
+                for buff_name, rounds_left in (("Haste", haste_rounds), ("Shield", shield_rounds))
+                if rounds_left
+            }
+            battle_state = BattleState(
+                ALLY_NAMES.index(ally_name) + 1,
+                "PLAYER",
+                {name: [max(hp, 0), model.ally_max_hp[name]] for name, hp in ally_hp.items()},
+                [[max(hp, 0), max_hp] for hp, max_hp in zip(enemy_hp, enemy_max_hp)],
+                {potion_id: count for potion_id, count in potions.items() if count > 0},
+                [],
+                buffs={name: active_buffs for name in party if ally_hp[name] > 0} if active_buffs else {},
+            )
+            action = policy.choose_action(ally_name, battle_state)
+            report.num_turns += 1
+
+            if action.kind == BattleAction.Kind.POTION:
+                potions[action.potion_id] -= 1
+                report.potions_used += 1
+                heal_val = PotionHandler.POTIONS[action.potion_id][1]
+                ally_hp[ally_name] = min(model.ally_max_hp[ally_name], ally_hp[ally_name] + heal_val)
+            elif action.skill_id == SkillpointHandler.MipsySkill.GROUP_HASTE.value:
+                haste_rounds = BUFF_DURATION_ROUNDS
+            elif action.skill_id == SkillpointHandler.VelmSkill.GROUP_SHIELD.value:
+                shield_rounds = BUFF_DURATION_ROUNDS
+            elif action.targets_enemy:
+                enemy_index = action.target - INITIAL_ENEMY_ID
+                while enemy_index >= len(enemy_hp) or enemy_hp[enemy_index] <= 0:
+                    # Wasted page load, same as the game telling us the target was already defeated
+                    report.num_turns += 1
+                    action.target = policy.on_invalid_target(action)
+                    enemy_index = action.target - INITIAL_ENEMY_ID
+                    if enemy_index >= len(enemy_hp):
+                        # Walked off the end of the enemy list, start over from the first enemy
+                        policy.current_target = INITIAL_ENEMY_ID
+                        action.target = INITIAL_ENEMY_ID
+                        enemy_index = 0
+                damage = draw_damage(rng, model.ally_damage[ally_name])
+                if haste_rounds:
+                    damage = round(damage * HASTE_DAMAGE_MULTIPLIER)
+                enemy_hp[enemy_index] -= damage
+            elif action.target != -1:
+                # Heal on an ally. A defeated ally stays down, so the turn is simply wasted
+                target_name = ALLY_NAMES[action.target - 1]
+                if ally_hp[target_name] > 0:
+                    ally_hp[target_name] = min(
+                        model.ally_max_hp[target_name], ally_hp[target_name] + round(model.heal_amount)
+                    )
+            policy.record_action(ally_name, action)
+
+            if all(hp <= 0 for hp in enemy_hp):
+                return report
+
+        for hp in enemy_hp:
+            if hp <= 0:
+                continue
+            living_allies = [name for name in party if ally_hp[name] > 0]
+            report.num_turns += 1
+            damage = draw_damage(rng, model.enemy_damage)
+            if shield_rounds:
+                damage = round(damage * SHIELD_DAMAGE_MULTIPLIER)
+            ally_hp[rng.choice(living_allies)] -= damage
+            if all(ally_hp[name] <= 0 for name in party):
+                report.num_deaths += 1
+                return report
+
+        haste_rounds = max(0, haste_rounds - 1)
+        shield_rounds = max(0, shield_rounds - 1)
+
+    report.num_stalemates += 1
+    return report
+
+
+def simulate_battles(model: CombatModel, policy_name: str, num_battles: int, seed: int) -> SimulationReport:
+    """
+    Simulate a batch of battles in this process. Each batch gets its own seeded RNG so runs are repeatable.
+    """
+    rng = random.Random(seed)
+    policy = BATTLE_POLICIES[policy_name]()
+    report = SimulationReport()
+    for _ in range(num_battles):
+        report = report.merge(simulate_battle(model, policy, rng))
+    return report
+
+
+def run_simulation(
+        model: CombatModel,
+        policy_name: str,
+        num_battles: int,
+        num_workers: int | None = None,
+        seed: int = 0,
+        batch_size: int = 1000,
+) -> SimulationReport:
+    """
+    Simulate num_battles battles for a policy, split into batches spread over a process pool.
+    :param model: fitted combat model
+    :param policy_name: key in BATTLE_POLICIES
+    :param num_battles: total number of battles to simulate
+    :param num_workers: number of processes, defaults to one per CPU core
+    :param seed: base seed, batch i uses seed + i
+    :param batch_size: battles per batch handed to a worker
+    """
+    batch_sizes = [batch_size] * (num_battles // batch_size)
+    if num_battles % batch_size:
+        batch_sizes.append(num_battles % batch_size)
+
+    report = SimulationReport()
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(simulate_battles, model, policy_name, size, seed + batch_index)
+            for batch_index, size in enumerate(batch_sizes)
+        ]
+        for future in futures:
+            report = report.merge(future.result())
+    return report
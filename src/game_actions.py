@@ -0,0 +1,155 @@
+"""
+URL-first game actions. Starting a battle, ending it, leaving the result page and switching movement mode are each a
+prebuilt URL, sent through perform() with no page reads beforehand and checked once afterwards against the page they
+landed on. The same check tells a failed attempt that actually went through from one that did not, so nothing is sent
+twice. Battle turns and movement already work this way, with checks of their own in BattleHandler and OverworldPage.
+"""
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import FrozenSet
+
+from src.Constants.url_navigation_constants import (
+    NEOQUEST_BATTLE_END_URL_TEMPLATE,
+    NEOQUEST_BATTLE_FINISH_URL,
+    NEOQUEST_BATTLE_START_URL,
+    NEOQUEST_MOVEMENT_HUNTING_URL,
+    NEOQUEST_MOVEMENT_NORMAL_URL,
+)
+from src.Pages.neopets_page import NeopetsPage
+from src.page_parser import PageParser
+from src.page_types import PageType
+from src.retry_policy import BATTLE_ACTION_RETRY_POLICY, NAVIGATION_RETRY_POLICY, RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+BATTLE_END_PAGE_TYPES = frozenset({PageType.GAME_BATTLE_RESULT, PageType.GAME_BATTLE_SPECIAL_END})
+
+
+class GameActionError(Exception):
+    """
+    A game action went through without an error but the game did not land where the action should have taken it.
+    """
+
+    def __init__(self, action: GameAction, page_type: PageType, url: str) -> None:
+        """
+        :param action: the action that was performed
+        :param page_type: type of the page the game shows instead
+        :param url: URL of that page
+        """
+        super().__init__(f"{action} landed on a {page_type.name} page at {url} instead")
+        self.action = action
+        self.page_type = page_type
+        self.url = url
+
+
+class GameAction(ABC):
+    """
+    Base class for game actions. Subclasses hold the data their URL needs and say where the game should end up.
+    """
+
+    # Page types the game shows once the action went through
+    LANDS_ON: FrozenSet[PageType] = frozenset()
+    # Sending the action twice does no harm, so a failed attempt is simply sent again without checking the game first
+    IS_IDEMPOTENT = False
+    RETRY_POLICY: RetryPolicy = BATTLE_ACTION_RETRY_POLICY
+
+    @abstractmethod
+    def get_url(self) -> str:
+        """
+        :return: URL that submits the action
+        """
+
+    def has_landed(self, page: NeopetsPage) -> bool:
+        """
+        Post-condition of the action.
+        :param page: page object wrapping the tab the action was sent from
+        """
+        return page.get_page_type() in type(self).LANDS_ON
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"{type(self).__name__}({fields})"
+
+
+class StartBattle(GameAction):
+    LANDS_ON = frozenset({PageType.GAME_BATTLE})
+
+    def get_url(self) -> str:
+        return NEOQUEST_BATTLE_START_URL
+
+
+class EndBattle(GameAction):
+    LANDS_ON = BATTLE_END_PAGE_TYPES
+
+    def __init__(self, actor_id: int) -> None:
+        """
+        :param actor_id: nxactor of the page showing the battle is over
+        """
+        self.actor_id = actor_id
+
+    def get_url(self) -> str:
+        return NEOQUEST_BATTLE_END_URL_TEMPLATE.format(self.actor_id)
+
+
+class LeaveSpecialBattleEnd(GameAction):
+    def get_url(self) -> str:
+        return NEOQUEST_BATTLE_FINISH_URL
+
+    def has_landed(self, page: NeopetsPage) -> bool:
+        # The real result page can still show the flee text and pass for the special end again, so only the link
+        # back to the map counts
+        return PageParser.has_battle_result_link(page.get_page_content())
+
+
+class ReturnToMap(GameAction):
+    # Usually the overworld, but the story can pick up right away with a fight or an NPC
+    LANDS_ON = frozenset(
+        {PageType.GAME_OVERWORLD, PageType.GAME_BATTLE_START, PageType.GAME_NPC_TALK, PageType.GAME_NPC_TRADE}
+    )
+
+    def get_url(self) -> str:
+        return NEOQUEST_BATTLE_FINISH_URL
+
+
+class SwitchMovementMode(GameAction):
+    LANDS_ON = frozenset({PageType.GAME_OVERWORLD})
+    IS_IDEMPOTENT = True
+    RETRY_POLICY = NAVIGATION_RETRY_POLICY
+
+    MODE_URLS = {1: NEOQUEST_MOVEMENT_NORMAL_URL, 2: NEOQUEST_MOVEMENT_HUNTING_URL}
+
+    def __init__(self, mode: int) -> None:
+        """
+        :param mode: 1 for normal, 2 for hunting, i.e. an OverworldHandler.MovementMode value
+        """
+        self.mode = mode
+
+    def get_url(self) -> str:
+        return SwitchMovementMode.MODE_URLS[self.mode]
+
+
+def perform(page: NeopetsPage, action: GameAction) -> PageType:
+    """
+    The one way game actions reach the site: visit the action's URL, retrying as its policy says, then check once
+    that the game landed where the action should have taken it.
+    :param page: page object wrapping the tab to act on
+    :param action: what to do
+    :return: type of the page the action landed on
+    """
+    logger.info("Performing %s", action)
+    page.go_to_url_and_wait_navigation(
+        action.get_url(),
+        is_already_done=None if action.IS_IDEMPOTENT else lambda: action.has_landed(page),
+        retry_policy=action.RETRY_POLICY,
+    )
+    page_type = page.get_page_type()
+    if not action.has_landed(page):
+        logger.error("%s landed on a %s page at %s", action, page_type.name, page.page_instance.url)
+        raise GameActionError(action, page_type, page.page_instance.url)
+    return page_type
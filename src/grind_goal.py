@@ -0,0 +1,66 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GrindGoal:
+    """
+    Describes when a grinding session should stop. Any condition that is set can end the session,
+    so a level target can be combined with e.g. a wall-clock budget as a safety net.
+    """
+
+    def __init__(
+            self,
+            target_level: int | None = None,
+            target_experience: int | None = None,
+            potion_floor: int | None = None,
+            time_budget_seconds: float | None = None,
+            max_steps: int | None = None,
+    ) -> None:
+        """
+        :param target_level: stop once the party reaches this level
+        :param target_experience: stop once this much experience was gained during the session
+        :param potion_floor: stop once fewer than this many healing potions are left
+        :param time_budget_seconds: stop once the session has run this long
+        :param max_steps: stop after this many steps in hunting mode
+        """
+        if all(
+                condition is None
+                for condition in (target_level, target_experience, potion_floor, time_budget_seconds, max_steps)
+        ):
+            raise ValueError("A grind goal needs at least one stop condition, otherwise it never ends.")
+        if max_steps is not None and max_steps % 2 != 0:
+            raise ValueError(
+                "The number of specified steps must be even so the battler returns"
+                " to the tile it started on."
+            )
+        self.target_level = target_level
+        self.target_experience = target_experience
+        self.potion_floor = potion_floor
+        self.time_budget_seconds = time_budget_seconds
+        self.max_steps = max_steps
+
+    def get_stop_reason(
+            self,
+            party_level: int | None,
+            experience_gained: int,
+            potion_count: int | None,
+            elapsed_seconds: float,
+            num_steps: int,
+    ) -> str | None:
+        """
+        Check the progress of a grinding session against every stop condition.
+        Values we could not read from the page (None) never trigger a stop.
+        :return: human readable reason to stop, or None to keep grinding
+        """
+        if self.target_level is not None and party_level is not None and party_level >= self.target_level:
+            return f"party reached level {party_level}"
+        if self.target_experience is not None and experience_gained >= self.target_experience:
+            return f"gained {experience_gained} experience"
+        if self.potion_floor is not None and potion_count is not None and potion_count < self.potion_floor:
+            return f"only {potion_count} potions left"
+        if self.time_budget_seconds is not None and elapsed_seconds >= self.time_budget_seconds:
+            return f"time budget of {self.time_budget_seconds} seconds used up"
+        if self.max_steps is not None and num_steps >= self.max_steps:
+            return f"walked {num_steps} steps"
+        return None
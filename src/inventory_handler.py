@@ -43,7 +43,7 @@ class InventoryHandler(AutoplayerBaseHandler):
         # Then we navigate back to the main game page
 
     def equip_equipment(self, equipment_id: int, ally_id: int) -> OverworldPage:
-        logger.info(f"Equipping item with id {equipment_id} on ally with id {ally_id}")
+        logger.info("Equipping item with id %s on ally with id %s", equipment_id, ally_id)
         self.overworld_page.go_to_url_and_wait_navigation(
             self.EQUIP_EQUIPMENT_URL_TEMPLATE.format(equipment_id, ally_id)
         )
@@ -1,6 +1,192 @@
+"""
+Logging setup for the autoplayer.
+
+Everything is driven by a config dict (DEFAULT_LOGGING_CONFIG, optionally overridden by a JSON file):
+- per-module levels, so Playwright and asyncio stay quiet while our own modules can go down to DEBUG
+- records are handed to a QueueHandler on the bot thread, and a QueueListener thread does the formatting and I/O
+- the log file is JSON lines tagged with run, section, battle and turn ids, rotated by size
+- the console gets the usual human-readable lines
+
+Call configure_logging() once at startup. Hot paths log with %-style arguments, so a message that is filtered out by
+its level is never formatted at all.
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import uuid
+from typing import Any, Dict
 
-logging.basicConfig(
-    level=logging.DEBUG,  # or DEBUG for detailed logs during development
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+LOGS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "RequiredData", "Logs")
 )
+
+DEFAULT_LOGGING_CONFIG: Dict[str, Any] = {
+    # Logger name -> level. "" is the root logger
+    "levels": {
+        "": "INFO",
+        "src": "INFO",
+        # Request timings and queueing delays, logged at DEBUG so they only go to the file
+        "src.Pages.neopets_page": "DEBUG",
+        "src.request_pacer": "DEBUG",
+        "playwright": "WARNING",
+        "asyncio": "WARNING",
+    },
+    "console_level": "INFO",
+    "file": {
+        "path": os.path.join(LOGS_DIR, "autoplayer.jsonl"),
+        "level": "DEBUG",
+        "max_bytes": 10 * 1024 * 1024,
+        "backup_count": 5,
+    },
+}
+
+
+class LogContext:
+    """
+    Ids describing what the bot is doing right now. Attached to every record by LogContextFilter.
+    """
+
+    run_id: str = uuid.uuid4().hex[:12]
+    section: str | None = None
+    battle_id: int | None = None
+    turn: int | None = None
+
+    @staticmethod
+    def start_section(section: str | None) -> None:
+        LogContext.section = section
+
+    @staticmethod
+    def start_battle() -> None:
+        LogContext.battle_id = (LogContext.battle_id or 0) + 1
+        LogContext.turn = 0
+
+    @staticmethod
+    def next_turn() -> None:
+        LogContext.turn = (LogContext.turn or 0) + 1
+
+    @staticmethod
+    def end_battle() -> None:
+        LogContext.turn = None
+
+
+class LogContextFilter(logging.Filter):
+    # Runs on the thread that logged, before the record crosses the queue, so the ids are the ones at logging time
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.run_id = LogContext.run_id
+        record.section = LogContext.section
+        record.battle_id = LogContext.battle_id
+        record.turn = LogContext.turn
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # Numbers passed with extra={...} that become fields of their own, so they can be read back from the log
+    METRIC_FIELDS = ["latency_ms", "queue_delay_ms"]
+
+    def format(self, record: logging.LogRecord) -> str:
+        log_entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "section": getattr(record, "section", None),
+            "battle_id": getattr(record, "battle_id", None),
+            "turn": getattr(record, "turn", None),
+        }
+        for metric in JsonLinesFormatter.METRIC_FIELDS:
+            value = getattr(record, metric, None)
+            if value is not None:
+                log_entry[metric] = round(value, 1)
+        if record.exc_info:
+            log_entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(log_entry)
+
+
+def load_logging_config(config_path: str | None = None) -> Dict[str, Any]:
+    """
+    Start from the defaults and apply whatever the JSON config file sets. Levels are merged, the rest is replaced.
+    :param config_path: optional path to a JSON file shaped like DEFAULT_LOGGING_CONFIG
+    """
+    config = json.loads(json.dumps(DEFAULT_LOGGING_CONFIG))
+    if config_path:
+        with open(config_path, "r") as f:
+            overrides = json.load(f)
+        config["levels"].update(overrides.pop("levels", {}))
+        config["file"].update(overrides.pop("file", {}) or {})
+        config.update(overrides)
+    return config
+
+
+class InProcessQueueHandler(logging.handlers.QueueHandler):
+    # The listener runs in this process, so records can go through the queue untouched and the message is only
+    # formatted on the listener thread. The stock QueueHandler formats on the logging thread to make records picklable
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_queue_listener: logging.handlers.QueueListener | None = None
+
+
+def configure_logging(config: Dict[str, Any] | None = None) -> logging.handlers.QueueListener:
+    """
+    Set up levels and handlers from a config dict. Safe to call again, e.g. in tests, the old listener is stopped.
+    :param config: config shaped like DEFAULT_LOGGING_CONFIG, defaults to it
+    """
+    global _queue_listener
+    config = config or load_logging_config()
+
+    stop_logging()
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(config["console_level"])
+    console_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    )
+    handlers: list[logging.Handler] = [console_handler]
+
+    file_config = config.get("file")
+    if file_config:
+        os.makedirs(os.path.dirname(os.path.abspath(file_config["path"])), exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            file_config["path"],
+            maxBytes=file_config["max_bytes"],
+            backupCount=file_config["backup_count"],
+            encoding="utf-8",
+        )
+        file_handler.setLevel(file_config["level"])
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = InProcessQueueHandler(log_queue)
+    queue_handler.addFilter(LogContextFilter())
+
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+
+    for logger_name, level in config["levels"].items():
+        logging.getLogger(logger_name or None).setLevel(level)
+
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    return _queue_listener
+
+
+@atexit.register
+def stop_logging() -> None:
+    """
+    Stop the listener thread, writing out whatever is still queued. Runs at exit, and is harmless to call twice.
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
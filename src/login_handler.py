@@ -1,7 +1,9 @@
 import logging
 import os.path
 
+from src.Constants.url_navigation_constants import NEOQUEST_OVERWORLD_URL
 from src.Pages.neopets_page import NeopetsPage
+from src.retry_policy import NAVIGATION_RETRY_POLICY
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +16,7 @@ USER_INFO_FILE = "user_info.txt"
 base_dir = os.path.dirname(os.path.abspath(__file__))
 
 user_info_file_path = os.path.join(base_dir, os.path.pardir, REQUIRED_DATA_DIR, TEXT_FILES_DIR, USER_INFO_FILE)
-logger.info(f"The full path to user_info file is: {user_info_file_path}")
+logger.info("The full path to user_info file is: %s", user_info_file_path)
 
 
 class LoginHandler:
@@ -72,6 +74,8 @@ class LoginHandler:
                 self.user_password = f.readline().strip()
 
                 logger.info("Reading traditional login info...")
+        # Requests from this tab count against this account's share of the request rate
+        neopets_page.navigation_state.account = self.username
 
     def is_logged_in(self) -> bool:
         """
@@ -96,11 +100,37 @@ class LoginHandler:
             else:
                 logger.info("Attempting login with traditional login...")
                 self.login_traditional()
+        self.neopets_page.pace_request(LoginHandler.GAME_PAGE)
         self.neopets_page.page_instance.goto(LoginHandler.GAME_PAGE)
 
         return self.neopets_page
 
+    def reauthenticate(self, logged_out_page: NeopetsPage) -> None:
+        """
+        Log back in after the session was lost mid-run, and bring the tab that noticed back to the game.
+        The game keeps our position server-side, so the caller only has to retry whatever it was doing.
+        Every handler holds on to its own page object for the original tab, so a Neopass login that finishes in a
+        new tab has that tab closed again once the session is set up, and the original tab carries on.
+        :param logged_out_page: page object for the tab that landed on a login page
+        """
+        original_tab = logged_out_page.page_instance
+        self.neopets_page = logged_out_page
+        if self.use_neopass:
+            logger.info("Logging back in with Neopass...")
+            self.login_with_neopass()
+        else:
+            logger.info("Logging back in with traditional login...")
+            self.login_traditional()
+
+        if self.neopets_page.page_instance is not original_tab:
+            self.neopets_page.page_instance.close()
+            self.neopets_page = logged_out_page
+        logged_out_page.pace_request(NEOQUEST_OVERWORLD_URL)
+        original_tab.goto(NEOQUEST_OVERWORLD_URL)
+        original_tab.wait_for_load_state("load")
+
     def login_with_neopass(self) -> NeopetsPage:
+        self.neopets_page.pace_request(self.NEOPASS_LOGIN_URL)
         self.neopets_page.page_instance.goto(url=self.NEOPASS_LOGIN_URL)
 
         # Not authenticated on Neopass at all
@@ -121,6 +151,7 @@ class LoginHandler:
             sign_in_button = self.neopets_page.page_instance.locator(
                 self.NEOPASS_SIGN_IN_LOCATOR
             )
+            self.neopets_page.pace_request(self.NEOPASS_LOGIN_URL)
             sign_in_button.click()
         # Otherwise, we already authenticated on a previous try and just need to start session
 
@@ -129,6 +160,7 @@ class LoginHandler:
             launch_button = self.neopets_page.page_instance.locator(
                 self.NEOPASS_LAUNCH_BUTTON_LOCATOR
             )
+            self.neopets_page.pace_request(self.NEOPASS_AUTHENTICATED_URL)
             launch_button.click()
         account_selection_tab = new_page_info.value
         account_selection_tab.wait_for_load_state()
@@ -142,19 +174,22 @@ class LoginHandler:
             self.NEOPASS_CONTINUE_BUTTON_LOCATOR
         )
         with account_selection_tab.expect_navigation(
-                wait_until="domcontentloaded", timeout=30000
+                wait_until="domcontentloaded", timeout=NAVIGATION_RETRY_POLICY.get_timeout_ms()
         ):
+            self.neopets_page.pace_request(account_selection_tab.url)
             continue_button.click()
 
         logger.info(
             "Login with Neopass should be complete. Returning control to autoplayer"
         )
         self.neopets_page = NeopetsPage(account_selection_tab)
+        self.neopets_page.navigation_state.account = self.username
 
         return self.neopets_page
 
     def login_traditional(self) -> NeopetsPage:
         # Note: we didn't actually test if this works because we don't have an account available to do that
+        self.neopets_page.pace_request(self.TRADITIONAL_LOGIN_URL)
         self.neopets_page.page_instance.goto(url=self.TRADITIONAL_LOGIN_URL)
         self.neopets_page.page_instance.wait_for_selector(
             self.TRADITIONAL_LOGIN_BUTTON_LOCATOR
@@ -173,8 +208,9 @@ class LoginHandler:
             self.TRADITIONAL_SIGN_IN_LOCATOR
         )
         with self.neopets_page.page_instance.expect_navigation(
-                wait_until="domcontentloaded", timeout=30000
+                wait_until="domcontentloaded", timeout=NAVIGATION_RETRY_POLICY.get_timeout_ms()
         ):
+            self.neopets_page.pace_request(self.TRADITIONAL_LOGIN_URL)
             sign_in_button.click()
         logger.info(
             "Login with traditional login should be complete. Returning control to autoplayer"
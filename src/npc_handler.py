@@ -208,7 +208,7 @@ class NpcHandler(AutoplayerBaseHandler):
         :param dialogue_urls: A list of URL strings to visit
         """
         for link in dialogue_urls:
-            logger.info(f"Visiting NPC link: {link}")
+            logger.info("Visiting NPC link: %s", link)
             self.npc_page.go_to_url_and_wait_navigation(link)
 
         logger.info("NPC interactions completed, returning to Overworld.")
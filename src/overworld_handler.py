@@ -5,6 +5,10 @@ from typing import List
 from src.Pages.battle_start_page import BattleStartPage
 from src.Pages.neopets_page import NeopetsPage
 from src.Pages.overworld_page import OverworldPage
+from src.logging_config import LogContext
+from src.game_actions import SwitchMovementMode, perform
+from src.page_types import PageType
+from src.world_atlas import MapSnapshot, WorldAtlas
 
 logger = logging.getLogger(__name__)
 
@@ -39,20 +43,25 @@ class OverworldHandler:
         NORMAL = 1
         HUNTING = 2
 
+    # Set to record every move into the world atlas, saved to atlas_path by save_atlas
+    atlas: WorldAtlas | None = None
+    atlas_path: str | None = None
+
     def __init__(self, current_page: NeopetsPage) -> None:
         logger.info("Initialized overworld handler with current page...")
         self.overworld_page = OverworldPage(current_page.page_instance)
+        # Sections leave the game in normal mode, so that is what we assume until we switch
+        self.movement_mode = OverworldHandler.MovementMode.NORMAL
 
     def is_overworld(self) -> bool:
         """
         Used to determine if the current page is actually on the overworld.
         """
-        return self.overworld_page.nav_map.count() > 0
+        return self.overworld_page.get_page_type() == PageType.GAME_OVERWORLD
 
-    # TODO: probably put this in a constant
     def is_battle_start(self) -> bool:
         """Used to determine if the result of a movement action was a random encounter."""
-        return "You are attacked by" in self.overworld_page.get_page_content()
+        return self.overworld_page.get_page_type() == PageType.GAME_BATTLE_START
 
     def take_step(self, direction: str) -> OverworldPage | BattleStartPage:
         """
@@ -61,15 +70,64 @@ class OverworldHandler:
         """
 
         map_coords = self.get_overworld_map_coordinates()
+        prev_snapshot = self.get_map_snapshot()
         movement_url = OverworldPage.MOVEMENT_URL_TEMPLATE.format(direction)
         self.overworld_page.go_to_movement_url_with_wait(
             movement_url, prev_map_coords=map_coords
         )
         if self.is_overworld():
+            snapshot = self.get_map_snapshot()
+            if prev_snapshot is not None and snapshot is not None:
+                OverworldHandler.atlas.record_move(
+                    prev_snapshot, direction, snapshot, count_encounters=self.is_normal_mode()
+                )
+                if LogContext.section:
+                    OverworldHandler.atlas.record_section_tile(LogContext.section, snapshot)
             return self.overworld_page
         else:
+            if prev_snapshot is not None and self.is_normal_mode() and self.is_battle_start():
+                OverworldHandler.atlas.record_encounter(prev_snapshot, direction)
             return BattleStartPage(self.overworld_page.page_instance)
 
+    def is_normal_mode(self) -> bool:
+        return self.movement_mode == OverworldHandler.MovementMode.NORMAL
+
+    def record_section_start(self, section_name: str) -> None:
+        """
+        Remember where a section starts, so the next launch can tell whether the party is at its start.
+        :param section_name: name of the Autoplayer method running the section
+        """
+        snapshot = self.get_map_snapshot()
+        if snapshot is not None:
+            OverworldHandler.atlas.record_section_start(section_name, snapshot)
+
+    @staticmethod
+    def record_battle(seconds: float) -> None:
+        """
+        How long a random encounter kept us off the map, for routes that avoid fights.
+        :param seconds: time from the step that started the fight until we were back on the map
+        """
+        if OverworldHandler.atlas is not None:
+            OverworldHandler.atlas.record_battle(seconds)
+
+    def get_map_snapshot(self) -> MapSnapshot | None:
+        """
+        Read the visible map tiles for the world atlas, from the page content we already have.
+        :return: the snapshot, or None if we are not recording the atlas or not on the overworld
+        """
+        if OverworldHandler.atlas is None or not self.is_overworld():
+            return None
+        return MapSnapshot.from_html(self.overworld_page.get_page_content())
+
+    @staticmethod
+    def save_atlas() -> None:
+        if OverworldHandler.atlas is None or OverworldHandler.atlas_path is None:
+            return
+        try:
+            OverworldHandler.atlas.save(OverworldHandler.atlas_path)
+        except OSError as e:
+            logger.warning("Could not save the world atlas to %s: %s", OverworldHandler.atlas_path, e)
+
     @staticmethod
     def invert_path(map_path: str) -> str:
         """
@@ -100,16 +158,9 @@ class OverworldHandler:
             raise ValueError(f"Invalid direction '{e.args[0]}' encountered in path.")
 
     def switch_movement_mode(self, mode: MovementMode) -> None:
-        if mode == OverworldHandler.MovementMode.NORMAL:
-            logger.info("Switching to normal movement mode...")
-            self.overworld_page.go_to_url_and_wait_navigation(
-                OverworldPage.SWITCH_NORMAL_NODE_URL
-            )
-        else:
-            logger.info("Switching to hunting movement mode...")
-            self.overworld_page.go_to_url_and_wait_navigation(
-                OverworldPage.SWITCH_HUNTING_MODE_URL
-            )
+        self.movement_mode = mode
+        logger.info("Switching to %s movement mode...", mode.name.lower())
+        perform(self.overworld_page, SwitchMovementMode(mode.value))
 
     def get_overworld_map_coordinates(self) -> List[str]:
         """
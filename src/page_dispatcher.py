@@ -0,0 +1,80 @@
+import logging
+from typing import Callable, Dict
+
+from src.Pages.neopets_page import NeopetsPage
+from src.Pages.overworld_page import OverworldPage
+from src.page_types import PageType
+
+logger = logging.getLogger(__name__)
+
+PageRoute = Callable[[NeopetsPage], None]
+
+
+class OverworldNotReachedError(Exception):
+    """
+    The dispatcher kept being handed pages other than the overworld and gave up.
+    """
+
+
+class PageDispatcher:
+    """
+    Classifies whatever page the game left us on and routes it to the handler that knows how to deal with it.
+    Movements, NPC visits and battles can all end up on a page we did not expect, so this is the one place that
+    decides how to get back to the overworld instead of every caller reloading and hoping.
+    """
+
+    # Enough for the longest legitimate chain (special boss end -> battle result -> overworld) plus a few detours
+    MAX_TRANSITIONS = 10
+
+    def __init__(self, routes: Dict[PageType, PageRoute]) -> None:
+        self.routes = routes
+
+    def dispatch(self, page: NeopetsPage) -> PageType:
+        """
+        Classify the current page once and hand it to its route.
+        Page types without a route are simply walked back to the main game page.
+        :param page: page object wrapping the tab to act on
+        :return: the page type that was handled
+        """
+        page_type = page.get_page_type()
+        route = self.routes.get(page_type, PageDispatcher.return_to_main_game_page)
+        logger.info("Dispatching page of type %s...", page_type.name)
+        route(page)
+        return page_type
+
+    def settle_on_overworld(self, page: NeopetsPage) -> OverworldPage:
+        """
+        Keep dispatching until the tab is back on the overworld.
+        :param page: page object wrapping the tab to act on
+        :return: OverworldPage for the same tab
+        """
+        for _ in range(PageDispatcher.MAX_TRANSITIONS):
+            if page.get_page_type() == PageType.GAME_OVERWORLD:
+                return OverworldPage(page.page_instance)
+            self.dispatch(page)
+
+        logger.error(
+            "Still not on the overworld after %d page transitions. Last page was %s",
+            PageDispatcher.MAX_TRANSITIONS,
+            page.page_instance.url,
+        )
+        page.dump_page_history("could not get back to the overworld")
+        raise OverworldNotReachedError(
+            f"Could not get back to the overworld from {page.page_instance.url} "
+            f"in {PageDispatcher.MAX_TRANSITIONS} page transitions"
+        )
+
+    @staticmethod
+    def return_to_main_game_page(page: NeopetsPage) -> None:
+        """
+        Default route: any game page we have nothing to do on (NPC dialogue, shop, skills, inventory, errors...)
+        goes back to the main game page, which shows the overworld or whatever battle is still pending.
+        """
+        page_type = page.get_page_type()
+        if page_type == PageType.UNRECOGNIZED:
+            logger.warning(
+                "Landed on an unrecognized page at %s. Returning to the main game page...", page.page_instance.url
+            )
+        else:
+            logger.info("Leaving %s page for the main game page...", page_type.name)
+        page.go_to_url_and_wait_navigation(NeopetsPage.MAIN_GAME_URL)
@@ -0,0 +1,150 @@
+"""
+Flight recorder for post-mortems: the last pages we saw and the actions we sent, kept in memory and only written
+to disk when something goes wrong.
+
+Page bodies are zlib-compressed as they come in, and the buffer is bounded both by entry count and by compressed
+size, so a long run costs a fixed amount of memory no matter how many pages it visits.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+import traceback
+import zipfile
+import zlib
+from collections import deque
+from typing import Deque, Dict, List
+
+from src.logging_config import LogContext
+
+logger = logging.getLogger(__name__)
+
+CRASH_BUNDLES_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "RequiredData", "CrashBundles")
+)
+
+
+class PageHistoryEntry:
+    PAGE = "page"
+    ACTION = "action"
+
+    def __init__(self, sequence: int, kind: str, url: str, compressed_body: bytes | None = None) -> None:
+        self.sequence = sequence
+        self.time = time.time()
+        self.kind = kind
+        self.url = url
+        self.compressed_body = compressed_body
+
+    @property
+    def size(self) -> int:
+        return len(self.compressed_body) if self.compressed_body else 0
+
+
+class PageHistory:
+    def __init__(
+            self,
+            max_entries: int = 40,
+            max_compressed_bytes: int = 2 * 1024 * 1024,
+            directory: str = CRASH_BUNDLES_DIR,
+    ) -> None:
+        """
+        :param max_entries: number of pages and actions kept, oldest dropped first
+        :param max_compressed_bytes: total size of the compressed page bodies kept, oldest dropped first
+        :param directory: where dump puts bundles unless told otherwise
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_compressed_bytes = max_compressed_bytes
+        self.entries: Deque[PageHistoryEntry] = deque()
+        self.compressed_bytes = 0
+        self.sequence = 0
+        # Several layers can report the same failure (the raise site, then the section wrapper), one bundle is enough
+        self.last_dumped_sequence: int | None = None
+        self.last_bundle_path: str | None = None
+
+    def record_page(self, url: str, body: bytes) -> None:
+        """
+        Remember a page we read.
+        :param url: URL of the page
+        :param body: page HTML as bytes
+        """
+        self._append(PageHistoryEntry(self.sequence, PageHistoryEntry.PAGE, url, zlib.compress(body)))
+
+    def record_action(self, description: str) -> None:
+        """
+        Remember something we sent to the game, e.g. an action URL or a click.
+        :param description: URL visited or description of the element clicked
+        """
+        self._append(PageHistoryEntry(self.sequence, PageHistoryEntry.ACTION, description))
+
+    def _append(self, entry: PageHistoryEntry) -> None:
+        self.sequence += 1
+        self.entries.append(entry)
+        self.compressed_bytes += entry.size
+        while len(self.entries) > self.max_entries or (
+                self.compressed_bytes > self.max_compressed_bytes and len(self.entries) > 1
+        ):
+            self.compressed_bytes -= self.entries.popleft().size
+
+    def dump(self, reason: str, directory: str | None = None) -> str | None:
+        """
+        Write everything in the buffer to a timestamped zip bundle: a manifest with the reason, the current log
+        context and the traceback being handled (if any), plus one HTML file per page.
+        Asking again without anything new recorded returns the previous bundle instead of writing a copy.
+        :param reason: what went wrong, goes into the manifest and the file name
+        :param directory: where to put the bundle, defaults to the history's directory
+        :return: path of the bundle, or None if it could not be written
+        """
+        if self.last_dumped_sequence == self.sequence:
+            return self.last_bundle_path
+        if directory is None:
+            directory = self.directory
+
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        reason_slug = re.sub(r"[^a-z0-9]+", "-", reason.lower()).strip("-")[:60]
+        bundle_path = os.path.join(directory, f"{timestamp}-{reason_slug}.zip")
+
+        manifest_entries: List[Dict[str, object]] = []
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with zipfile.ZipFile(bundle_path, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+                for entry in self.entries:
+                    manifest_entry: Dict[str, object] = {
+                        "sequence": entry.sequence,
+                        "time": entry.time,
+                        "kind": entry.kind,
+                        "url": entry.url,
+                    }
+                    if entry.compressed_body is not None:
+                        file_name = f"pages/{entry.sequence:06d}.html"
+                        bundle.writestr(file_name, zlib.decompress(entry.compressed_body))
+                        manifest_entry["file"] = file_name
+                    manifest_entries.append(manifest_entry)
+
+                exception_text = traceback.format_exc()
+                manifest = {
+                    "reason": reason,
+                    "time": timestamp,
+                    "run_id": LogContext.run_id,
+                    "section": LogContext.section,
+                    "battle_id": LogContext.battle_id,
+                    "turn": LogContext.turn,
+                    "exception": None if exception_text.startswith("NoneType: None") else exception_text,
+                    "entries": manifest_entries,
+                }
+                bundle.writestr("manifest.json", json.dumps(manifest, indent=2))
+        except OSError as e:
+            # Never let the post-mortem hide the original failure
+            logger.error("Could not write the page history bundle to %s: %s", bundle_path, e)
+            return None
+
+        logger.error("Wrote the last %s pages and actions to %s (%s)", len(self.entries), bundle_path, reason)
+        self.last_dumped_sequence = self.sequence
+        self.last_bundle_path = bundle_path
+        return bundle_path
+
+
+# Shared by every page object, so the history follows the bot across tabs and handlers
+PAGE_HISTORY = PageHistory()
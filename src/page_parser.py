@@ -1,3 +1,12 @@
+import re
+
+from src.Constants.url_navigation_constants import (
+    LOGIN_NEOPASS_URL,
+    LOGIN_TRADITIONAL_URL,
+    NEOPASS_ACCOUNTS_SELECTION_URL,
+    NEOPASS_ACCOUNTS_URL,
+    NEOQUEST_INDEX_URL,
+)
 from src.page_types import PageType
 from bs4 import BeautifulSoup
 
@@ -23,14 +32,229 @@ class PageParser:
         "alt": "Begin the Fight!",
     }
 
+    # Every battle page (ally turn, enemy turn or won fight) carries the hidden actor input
+    BATTLE_IDENTIFIER = {"type": "hidden", "name": "nxactor"}
+    BATTLE_RESULT_IDENTIFIER = {"href": "nq2.phtml?finish=1"}
+    BATTLE_RESULT_LINK_MARKER = re.compile(r"""href=["']nq2\.phtml\?finish=1["']""")
+    # Same texts as BattlePage uses to detect a special boss early exit
+    BOSS_FLEE_TEXTS = [
+        "Ramtor grunts as he is struck",
+        "The Faerie Thief leaps away",
+        "The Faerie Thief stumbles back",
+    ]
+
+    ERROR_IDENTIFIER = {"class": "errorOuter"}
+
+    # Raw HTML markers for the fast path. These mirror the soup identifiers above, so a page matching exactly one of
+    # them can be classified without building a soup tree at all. Every marker for a page type has to match.
+    FAST_PATH_MARKERS = {
+        PageType.NEOPASS_LOGIN: [
+            re.compile(r"""type=["']email["']"""),
+            re.compile(r"""for=["']email["']"""),
+        ],
+        PageType.TRADITIONAL_LOGIN: [
+            re.compile(r"""class=["'][^"']*\blogin-form\b"""),
+        ],
+        PageType.HOME: [
+            re.compile(r"""class=["']container theme-bg["']"""),
+        ],
+        PageType.GAME_OVERWORLD: [
+            re.compile(r"""name=["']navmap["']"""),
+        ],
+        PageType.GAME_BATTLE_START: [
+            re.compile(r"//images\.neopets\.com/nq2/x/com_begin\.gif"),
+        ],
+        # Flee text and the result link, same as is_battle_special_end_page
+        PageType.GAME_BATTLE_SPECIAL_END: [
+            re.compile("|".join(re.escape(flee_text) for flee_text in BOSS_FLEE_TEXTS)),
+            BATTLE_RESULT_LINK_MARKER,
+        ],
+        PageType.GAME_BATTLE_RESULT: [
+            BATTLE_RESULT_LINK_MARKER,
+        ],
+        PageType.GAME_BATTLE: [
+            re.compile(r"""name=["']nxactor["']"""),
+        ],
+        PageType.ERROR: [
+            re.compile(r"""class=["']errorOuter["']"""),
+        ],
+    }
+
+    # When a page type on the left matches, the ones on the right do not count, in the same order as the soup path.
+    # Every battle end page still carries the nxactor input of the battle page, and a special end has the result link
+    FAST_PATH_PRIORITIES = {
+        PageType.GAME_BATTLE_SPECIAL_END: frozenset({PageType.GAME_BATTLE_RESULT, PageType.GAME_BATTLE}),
+        PageType.GAME_BATTLE_RESULT: frozenset({PageType.GAME_BATTLE}),
+    }
+
+    # Pages the site serves instead of the game when it is struggling. They have no stable element to look for, so
+    # these match their text, and only on pages that carry no game marker, since NPCs are free to say anything
+    SITE_TROUBLE_MARKERS = {
+        PageType.SITE_MAINTENANCE: re.compile(
+            r"undergoing (?:scheduled )?maintenance|down for maintenance|maintenance in progress", re.IGNORECASE
+        ),
+        PageType.RATE_LIMITED: re.compile(
+            r"too many requests|you are being rate limited|error 1015\b", re.IGNORECASE
+        ),
+        PageType.SERVER_ERROR: re.compile(
+            r"<title>[^<]*(?:\b50[0-4]\b|internal server error|bad gateway|service unavailable|gateway time-?out)"
+            r"|error code:? 52[0-6]\b",
+            re.IGNORECASE,
+        ),
+    }
+    # Everything that is not visible content. A page that is empty once this is gone is a blank body
+    NON_CONTENT_PATTERN = re.compile(r"<(head|script|style)\b.*?</\1\s*>|<[^>]*>|&nbsp;|\s", re.IGNORECASE | re.DOTALL)
+    VISIBLE_ELEMENT_PATTERN = re.compile(r"<(?:img|input|iframe|frame)\b", re.IGNORECASE)
+
+    # Pages without a reliable element of their own are told apart by the URL that produced them.
+    # Only consulted when the content says nothing, since e.g. a talk URL for an NPC out of range shows the overworld.
+    URL_IDENTIFIERS = [
+        (NEOPASS_ACCOUNTS_SELECTION_URL, PageType.NEOPASS_ACCOUNT_SELECTION),
+        (NEOPASS_ACCOUNTS_URL, PageType.NEOPASS_ACCOUNT_VIEW),
+        (NEOQUEST_INDEX_URL, PageType.GAME_INDEX),
+        ("act=skills", PageType.GAME_SKILLS),
+        ("act=inv", PageType.GAME_INVENTORY),
+        ("act=merch", PageType.GAME_NPC_TRADE),
+        ("act=talk", PageType.GAME_NPC_TALK),
+    ]
+
+    # Any of these means the game session is gone and we have to log back in
+    LOGGED_OUT_PAGE_TYPES = frozenset(
+        {
+            PageType.NEOPASS_LOGIN,
+            PageType.TRADITIONAL_LOGIN,
+            PageType.NEOPASS_ACCOUNT_VIEW,
+            PageType.NEOPASS_ACCOUNT_SELECTION,
+        }
+    )
+    SITE_TROUBLE_PAGE_TYPES = frozenset(
+        {PageType.SITE_MAINTENANCE, PageType.RATE_LIMITED, PageType.SERVER_ERROR, PageType.BLANK}
+    )
+    # A game URL visited without a session redirects to one of these
+    LOGGED_OUT_URLS = [LOGIN_TRADITIONAL_URL, LOGIN_NEOPASS_URL, NEOPASS_ACCOUNTS_URL]
+
     @staticmethod
-    def get_page_type(page_html: str) -> PageType:
+    def is_logged_out(page_html: str, page_url: str) -> bool:
+        """
+        Cheap check for a lost session, meant to run after every navigation: the URL first, then only the login
+        page markers of the fast path, without classifying the page any further.
+        :param page_html: raw HTML of the page
+        :param page_url: URL of the page
+        :return: True if the page is a login or account page instead of the game
         """
-        This method parses the given page HTML and walks through a series of unique page identifiers.
-        It uses the page identifier to determine which page the user is on.
+        if any(page_url.startswith(logged_out_url) for logged_out_url in PageParser.LOGGED_OUT_URLS):
+            return True
+        return any(
+            all(marker.search(page_html) for marker in PageParser.FAST_PATH_MARKERS[page_type])
+            for page_type in (PageType.NEOPASS_LOGIN, PageType.TRADITIONAL_LOGIN)
+        )
+
+    @staticmethod
+    def get_site_trouble(
+            page_html: str, status: int | None = None, fast_path_matches: list[PageType] | None = None
+    ) -> PageType | None:
+        """
+        Cheap check for a page the site served instead of the game, meant to run right after every navigation so a bad
+        page is noticed straight away instead of when a locator wait times out.
+        :param page_html: raw HTML of the page
+        :param status: HTTP status of the document, if known
+        :param fast_path_matches: get_fast_path_matches of the page, if already known
+        :return: one of SITE_TROUBLE_PAGE_TYPES, or None if the page looks fine
+        """
+        if fast_path_matches is None:
+            fast_path_matches = PageParser.get_fast_path_matches(page_html)
+        # Neopets' own error box is an ordinary page the dispatcher knows how to leave
+        if any(page_type != PageType.ERROR for page_type in fast_path_matches):
+            return None
+        page_type = PageParser.get_site_trouble_from_markers(page_html)
+        if page_type is not None:
+            return page_type
+        if PageParser.is_blank_page(page_html):
+            return PageType.BLANK
+        if status == 429:
+            return PageType.RATE_LIMITED
+        if status is not None and status >= 500:
+            return PageType.SERVER_ERROR
+        return None
+
+    @staticmethod
+    def get_site_trouble_from_markers(page_html: str) -> PageType | None:
+        for page_type, marker in PageParser.SITE_TROUBLE_MARKERS.items():
+            if marker.search(page_html):
+                return page_type
+        return None
+
+    @staticmethod
+    def is_blank_page(page_html: str) -> bool:
+        return not PageParser.NON_CONTENT_PATTERN.sub("", page_html) and not PageParser.VISIBLE_ELEMENT_PATTERN.search(
+            page_html
+        )
+
+    @staticmethod
+    def get_page_type(
+            page_html: str, page_url: str | None = None, fast_path_matches: list[PageType] | None = None
+    ) -> PageType:
+        """
+        This method walks through a series of unique page identifiers to determine which page the user is on.
+        Cheap substring markers are checked against the raw HTML first, and the page is only parsed with BeautifulSoup
+        when the markers are ambiguous (no match, or more than one page type matched).
+        If the content is not recognized at all, the page URL is used as a last resort.
 
         Mainly meant to be used in combination with PageFactory class to return the proper page object.
         :param page_html:
+        :param page_url: URL the page was loaded from, if known
+        :param fast_path_matches: get_fast_path_matches of the page, if already known
+        :return: enum value containing the specific page type
+        """
+        if fast_path_matches is None:
+            fast_path_matches = PageParser.get_fast_path_matches(page_html)
+        if len(fast_path_matches) == 1:
+            return fast_path_matches[0]
+        if not fast_path_matches:
+            site_trouble = PageParser.get_site_trouble_from_markers(page_html)
+            if site_trouble is not None:
+                return site_trouble
+
+        page_type = PageParser.get_page_type_from_soup(page_html)
+        if page_type == PageType.UNRECOGNIZED and page_url:
+            page_type = PageParser.get_page_type_from_url(page_url)
+        return page_type
+
+    @staticmethod
+    def get_page_type_from_url(page_url: str) -> PageType:
+        """
+        Classify a page purely from the URL it was loaded from.
+        :param page_url: URL of the page
+        :return: enum value containing the specific page type, or UNRECOGNIZED
+        """
+        for url_identifier, page_type in PageParser.URL_IDENTIFIERS:
+            if url_identifier in page_url:
+                return page_type
+        return PageType.UNRECOGNIZED
+
+    @staticmethod
+    def get_fast_path_matches(page_html: str) -> list[PageType]:
+        """
+        Check the raw HTML against the precompiled markers of every page type.
+        :param page_html: raw HTML of the page
+        :return: every page type whose markers all appear in the HTML and that is not outranked by another match,
+         in priority order
+        """
+        matches = [
+            page_type
+            for page_type, markers in PageParser.FAST_PATH_MARKERS.items()
+            if all(marker.search(page_html) for marker in markers)
+        ]
+        outranked = set()
+        for page_type in matches:
+            outranked |= PageParser.FAST_PATH_PRIORITIES.get(page_type, frozenset())
+        return [page_type for page_type in matches if page_type not in outranked]
+
+    @staticmethod
+    def get_page_type_from_soup(page_html: str) -> PageType:
+        """
+        Slow path of get_page_type. Parses the whole page and looks for the identifying elements.
+        :param page_html: raw HTML of the page
         :return: enum value containing the specific page type
         """
         # Read into bs object
@@ -48,6 +272,14 @@ class PageParser:
             return PageType.GAME_OVERWORLD
         elif PageParser.is_battle_start_page(soup):
             return PageType.GAME_BATTLE_START
+        elif PageParser.is_battle_special_end_page(soup):
+            return PageType.GAME_BATTLE_SPECIAL_END
+        elif PageParser.is_battle_result_page(soup):
+            return PageType.GAME_BATTLE_RESULT
+        elif PageParser.is_battle_page(soup):
+            return PageType.GAME_BATTLE
+        elif PageParser.is_error_page(soup):
+            return PageType.ERROR
         else:
             # Extremely dumb, just want to see though
             return PageType.UNRECOGNIZED
@@ -78,3 +310,33 @@ class PageParser:
     def is_battle_start_page(soup: BeautifulSoup) -> bool:
         begin_battle_tag = soup.find(attrs=PageParser.BATTLE_START_IDENTIFIER)
         return begin_battle_tag is not None
+
+    @staticmethod
+    def is_battle_special_end_page(soup: BeautifulSoup) -> bool:
+        page_text = soup.get_text()
+        has_flee_text = any(flee_text in page_text for flee_text in PageParser.BOSS_FLEE_TEXTS)
+        return has_flee_text and PageParser.is_battle_result_page(soup)
+
+    @staticmethod
+    def is_battle_result_page(soup: BeautifulSoup) -> bool:
+        return_to_map_tag = soup.find("a", attrs=PageParser.BATTLE_RESULT_IDENTIFIER)
+        return return_to_map_tag is not None
+
+    @staticmethod
+    def has_battle_result_link(page_html: str) -> bool:
+        """
+        Whether the page links back to the map the way battle result pages do. Unlike the page type, this does not
+        care about flee text, which the real result page after a boss flees can still show.
+        :param page_html: raw HTML of the page
+        """
+        return PageParser.BATTLE_RESULT_LINK_MARKER.search(page_html) is not None
+
+    @staticmethod
+    def is_battle_page(soup: BeautifulSoup) -> bool:
+        actor_input_tag = soup.find("input", attrs=PageParser.BATTLE_IDENTIFIER)
+        return actor_input_tag is not None
+
+    @staticmethod
+    def is_error_page(soup: BeautifulSoup) -> bool:
+        error_tag = soup.find(attrs=PageParser.ERROR_IDENTIFIER)
+        return error_tag is not None
@@ -14,7 +14,20 @@ class PageType(Enum):
     GAME_OVERWORLD = auto()
     GAME_SKILLS = auto()
     GAME_INVENTORY = auto()
+    GAME_NPC_TALK = auto()
     GAME_NPC_TRADE = auto()
     GAME_BATTLE_START = auto()
+    GAME_BATTLE = auto()
+    GAME_BATTLE_RESULT = auto()
+    # Bosses like Ramtor flee mid-fight and drop us on a continue page before the real result page
+    GAME_BATTLE_SPECIAL_END = auto()
+
+    ERROR = auto()
+
+    # Served by the site instead of the game when it is struggling
+    SITE_MAINTENANCE = auto()
+    RATE_LIMITED = auto()
+    SERVER_ERROR = auto()
+    BLANK = auto()
 
     UNRECOGNIZED = auto()
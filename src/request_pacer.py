@@ -0,0 +1,148 @@
+"""
+Request pacing: every navigation and click that reaches the site first takes a token from its account's bucket and from
+its host's bucket. Buckets refill at a steady rate up to a burst size, so short bursts go through untouched and a
+sustained run settles at the configured rate instead of whatever the page load time happens to allow.
+
+The time requests spend waiting for a token is the queueing delay. Every wait is logged as queue_delay_ms, and the
+pacer keeps a rolling summary that is logged with the run ledger after each section. A delay that is always zero means
+the rate could go up, a delay that keeps growing means requests are arriving faster than the rate allows.
+Buckets live in this process, so accounts played from one process share their host's bucket.
+"""
+
+import collections
+import logging
+import statistics
+import threading
+import time
+from typing import Callable, Deque, Dict
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ACCOUNT = "default"
+
+
+class TokenBucket:
+    def __init__(
+            self, rate_per_second: float, burst: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        :param rate_per_second: sustained rate the bucket refills at
+        :param burst: most tokens the bucket holds, i.e. how many requests can go out back to back
+        :param clock: monotonic clock in seconds, can be swapped out for tests
+        """
+        if rate_per_second <= 0 or burst < 1:
+            raise ValueError(f"Need a positive rate and a burst of at least 1, got {rate_per_second} and {burst}")
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.last_refill = clock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if there is none, so callers queue up in the order they asked.
+        :return: seconds to wait before the request may go out
+        """
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate_per_second)
+        self.last_refill = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate_per_second
+
+
+class RequestPacer:
+    """
+    One token bucket per account and one per host. A request waits for whichever of its two buckets is slower.
+    """
+
+    # Queueing delays kept for the rolling summary
+    WINDOW_SIZE = 1000
+
+    def __init__(
+            self,
+            account_rate_per_second: float = 2.0,
+            account_burst: float = 5,
+            host_rate_per_second: float = 4.0,
+            host_burst: float = 10,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        :param account_rate_per_second: sustained requests per second for one account
+        :param account_burst: requests one account can send back to back
+        :param host_rate_per_second: sustained requests per second to one host, over all accounts
+        :param host_burst: requests all accounts together can send to one host back to back
+        :param clock: monotonic clock in seconds, can be swapped out for tests
+        :param sleep: called with the queueing delay, can be swapped out for tests
+        """
+        self.account_rate_per_second = account_rate_per_second
+        self.account_burst = account_burst
+        self.host_rate_per_second = host_rate_per_second
+        self.host_burst = host_burst
+        self.clock = clock
+        self.sleep = sleep
+        self.account_buckets: Dict[str, TokenBucket] = {}
+        self.host_buckets: Dict[str, TokenBucket] = {}
+        self.queue_delays: Deque[float] = collections.deque(maxlen=RequestPacer.WINDOW_SIZE)
+        self.lock = threading.Lock()
+
+    def configure(
+            self,
+            account_rate_per_second: float,
+            account_burst: float,
+            host_rate_per_second: float,
+            host_burst: float,
+    ) -> None:
+        """
+        Change the rates, e.g. from the command line. Buckets start over full.
+        """
+        with self.lock:
+            self.account_rate_per_second = account_rate_per_second
+            self.account_burst = account_burst
+            self.host_rate_per_second = host_rate_per_second
+            self.host_burst = host_burst
+            self.account_buckets = {}
+            self.host_buckets = {}
+
+    def acquire(self, url: str, account: str = DEFAULT_ACCOUNT) -> float:
+        """
+        Wait until a request to the URL may go out.
+        :param url: URL about to be requested, its host picks the host bucket
+        :param account: account the request is made for
+        :return: seconds waited
+        """
+        host = urlsplit(url).hostname or ""
+        with self.lock:
+            if account not in self.account_buckets:
+                self.account_buckets[account] = TokenBucket(
+                    self.account_rate_per_second, self.account_burst, self.clock
+                )
+            if host not in self.host_buckets:
+                self.host_buckets[host] = TokenBucket(self.host_rate_per_second, self.host_burst, self.clock)
+            delay = max(self.account_buckets[account].reserve(), self.host_buckets[host].reserve())
+            self.queue_delays.append(delay)
+
+        if delay > 0:
+            queue_delay_ms = delay * 1000
+            logger.debug(
+                "Waiting %.0f ms before requesting %s", queue_delay_ms, url, extra={"queue_delay_ms": queue_delay_ms}
+            )
+            self.sleep(delay)
+        return delay
+
+    def get_summary(self) -> str:
+        with self.lock:
+            delays = list(self.queue_delays)
+        if not delays:
+            return "no requests paced yet"
+        delays_ms = sorted(delay * 1000 for delay in delays)
+        p95_ms = delays_ms[min(len(delays_ms) - 1, int(len(delays_ms) * 0.95))]
+        num_waited = sum(delay > 0 for delay in delays_ms)
+        return (
+            f"{num_waited} of the last {len(delays_ms)} requests waited, queueing delay mean "
+            f"{statistics.fmean(delays_ms):.0f} ms, p95 {p95_ms:.0f} ms, max {delays_ms[-1]:.0f} ms"
+        )
+
+
+REQUEST_PACER = RequestPacer()
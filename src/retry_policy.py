@@ -0,0 +1,185 @@
+"""
+One retry policy for everything that talks to the game: navigations, clicks, movement and battle actions.
+
+Failed attempts back off exponentially with full jitter instead of sleeping a fixed amount, and every attempt gets a
+timeout suited to the kind of action. Before an action is resubmitted, the caller gets a chance to reload the game
+and check whether the action actually went through (turn advanced, position changed, page changed...), so a slow
+response never turns into a double submission.
+
+Timeouts follow the site: once enough page loads have been timed, an attempt's timeout is the recent p99 load time times
+a multiplier, doubled on every retry and kept between the policy's floor and ceiling. On a healthy connection a hung
+request fails over in seconds, and a slow period stretches the timeouts instead of failing every attempt.
+"""
+
+import logging
+import random
+import time
+from typing import Callable, TypeVar
+
+from src.circuit_breaker import CIRCUIT_BREAKER
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RetryExhaustedError(Exception):
+    """Every attempt at an action failed. The last attempt's exception is chained as __cause__."""
+
+
+class RetryPolicy:
+    # Adaptive timeouts are this many times the recent latency percentile below
+    LATENCY_MULTIPLIER = 3.0
+    LATENCY_PERCENTILE = 0.99
+
+    def __init__(
+            self,
+            max_attempts: int = 5,
+            timeout_ms: float = 30000,
+            base_delay_seconds: float = 0.5,
+            max_delay_seconds: float = 8.0,
+            rng: random.Random | None = None,
+            sleep: Callable[[float], None] = time.sleep,
+            min_timeout_ms: float | None = None,
+            max_timeout_ms: float | None = None,
+            observed_latency_ms: Callable[[float], float | None] | None = None,
+    ) -> None:
+        """
+        :param max_attempts: number of times the action is tried before giving up
+        :param timeout_ms: timeout handed to the action for each attempt, or until there are latencies to go by
+        :param base_delay_seconds: backoff ceiling after the first failure, doubled after every further failure
+        :param max_delay_seconds: the backoff ceiling never goes above this
+        :param rng: random source for the jitter
+        :param sleep: called with the backoff delay, can be swapped out for tests
+        :param min_timeout_ms: adaptive timeouts never go below this
+        :param max_timeout_ms: adaptive timeouts never go above this
+        :param observed_latency_ms: returns the given percentile of recent load times in milliseconds, or None while
+         there are too few. Leave out for a fixed timeout
+        """
+        self.max_attempts = max_attempts
+        self.timeout_ms = timeout_ms
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+        self.min_timeout_ms = min_timeout_ms
+        self.max_timeout_ms = max_timeout_ms
+        self.observed_latency_ms = observed_latency_ms
+
+    def with_max_attempts(self, max_attempts: int) -> "RetryPolicy":
+        return RetryPolicy(
+            max_attempts,
+            self.timeout_ms,
+            self.base_delay_seconds,
+            self.max_delay_seconds,
+            self.rng,
+            self.sleep,
+            self.min_timeout_ms,
+            self.max_timeout_ms,
+            self.observed_latency_ms,
+        )
+
+    def get_timeout_ms(self, attempt: int = 0) -> float:
+        """
+        :param attempt: 0-based number of the attempt the timeout is for
+        :return: timeout in milliseconds
+        """
+        if self.observed_latency_ms is None:
+            return self.timeout_ms
+        latency_ms = self.observed_latency_ms(RetryPolicy.LATENCY_PERCENTILE)
+        if latency_ms is None:
+            timeout_ms = self.timeout_ms
+        else:
+            timeout_ms = latency_ms * RetryPolicy.LATENCY_MULTIPLIER
+        # Whatever timed out once gets more room the next time
+        timeout_ms *= 2 ** attempt
+        if self.min_timeout_ms is not None:
+            timeout_ms = max(self.min_timeout_ms, timeout_ms)
+        if self.max_timeout_ms is not None:
+            timeout_ms = min(self.max_timeout_ms, timeout_ms)
+        return timeout_ms
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Full jitter: anywhere between 0 and the exponential ceiling, so retries from a hiccup do not line up.
+        :param attempt: 0-based number of the attempt that just failed
+        """
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt)
+        return self.rng.uniform(0, ceiling)
+
+    def run(
+            self,
+            action: Callable[[float], T],
+            description: str,
+            is_already_done: Callable[[], bool] | None = None,
+            recover: Callable[[float], None] | None = None,
+    ) -> T | None:
+        """
+        Run an action until it succeeds, backing off between attempts.
+        :param action: called with the per-attempt timeout in milliseconds
+        :param description: what the action does, for logs and errors
+        :param is_already_done: checked after recovering from a failure. If it returns True, the failed attempt
+         actually went through and the action is not resubmitted
+        :param recover: called with the timeout after a failure to get the page back into a known state
+        :return: whatever the action returned, or None if a failed attempt turned out to have gone through
+        :raises RetryExhaustedError: if every attempt failed
+        """
+        last_error = None
+        for attempt in range(self.max_attempts):
+            timeout_ms = self.get_timeout_ms(attempt)
+            try:
+                return action(timeout_ms)
+            except Exception as e:
+                last_error = e
+                logger.warning("Attempt %s to %s failed: %s", attempt, description, e)
+
+            self.sleep(self.get_delay(attempt))
+            try:
+                if recover:
+                    recover(timeout_ms)
+                if is_already_done and is_already_done():
+                    logger.info("The page failed to load but we managed to %s. Not resubmitting", description)
+                    return None
+            except Exception as e:
+                logger.warning("Could not check whether we managed to %s: %s", description, e)
+
+        logger.error("Failed to %s after %s attempts.", description, self.max_attempts)
+        raise RetryExhaustedError(f"Max retries exceeded trying to {description}") from last_error
+
+
+NAVIGATION_RETRY_POLICY = RetryPolicy(
+    max_attempts=5,
+    timeout_ms=30000,
+    min_timeout_ms=5000,
+    max_timeout_ms=60000,
+    observed_latency_ms=CIRCUIT_BREAKER.get_observed_percentile_ms,
+)
+CLICK_RETRY_POLICY = RetryPolicy(
+    max_attempts=5,
+    timeout_ms=15000,
+    min_timeout_ms=3000,
+    max_timeout_ms=30000,
+    observed_latency_ms=CIRCUIT_BREAKER.get_observed_percentile_ms,
+)
+MOVEMENT_RETRY_POLICY = RetryPolicy(
+    max_attempts=6,
+    timeout_ms=30000,
+    min_timeout_ms=5000,
+    max_timeout_ms=60000,
+    observed_latency_ms=CIRCUIT_BREAKER.get_observed_percentile_ms,
+)
+BATTLE_ACTION_RETRY_POLICY = RetryPolicy(
+    max_attempts=5,
+    timeout_ms=20000,
+    min_timeout_ms=4000,
+    max_timeout_ms=45000,
+    observed_latency_ms=CIRCUIT_BREAKER.get_observed_percentile_ms,
+)
+# Reading the page we are already on should be quick, and reloading is cheap
+PAGE_READ_RETRY_POLICY = RetryPolicy(
+    max_attempts=5,
+    timeout_ms=10000,
+    min_timeout_ms=2000,
+    max_timeout_ms=20000,
+    observed_latency_ms=CIRCUIT_BREAKER.get_observed_percentile_ms,
+)
@@ -0,0 +1,365 @@
+"""
+Shortest routes over the world atlas, as digit paths that Autoplayer.follow_path can walk.
+
+Routes go between waypoints: named tiles kept in RequiredData/Atlas/waypoints.json (towns, bosses, grind spots), plus
+every NPC the atlas has seen, named "npc:<name>", and every recorded section start, named "section:<name>". Only
+tiles the atlas knows to be walkable are used. A move through a cave, stairs or portal is assumed to land where it
+landed when it was recorded, so callers should plan again after crossing one (see RoutePlanner.get_next_leg).
+
+With a cost model, routes minimise expected time instead of steps: every step costs a request plus the chance of a
+fight on that tile (from the encounters the atlas counted) times how long fights take, so of two equally long
+corridors the quieter one wins.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterator, List, Set, Tuple
+
+import click
+
+from src.logging_config import DEFAULT_LOGGING_CONFIG
+from src.section_script import SectionCostModel
+from src.world_atlas import DEFAULT_ATLAS_PATH, DIRECTION_OFFSETS, AtlasMap, Position, WorldAtlas
+
+logger = logging.getLogger(__name__)
+
+ATLAS_DIR = os.path.dirname(DEFAULT_ATLAS_PATH)
+DEFAULT_WAYPOINTS_PATH = os.path.join(ATLAS_DIR, "waypoints.json")
+DEFAULT_ROUTE_TABLE_PATH = os.path.join(ATLAS_DIR, "route_table.json")
+
+RouteStep = Tuple[str, Position]
+
+
+class RoutePlanningError(Exception):
+    """The world atlas could not get us where we wanted to go."""
+
+
+class UnknownWaypointError(RoutePlanningError, ValueError):
+    """A route was asked for by a waypoint name that is neither in the waypoints file nor derived from the atlas."""
+
+
+def load_waypoints(atlas: WorldAtlas, path: str = DEFAULT_WAYPOINTS_PATH) -> Dict[str, Position]:
+    """
+    :param atlas: atlas whose NPCs and section starts become waypoints too
+    :param path: JSON file of name -> {"map": ..., "x": ..., "y": ...}, skipped if it does not exist
+    :return: waypoint name -> position
+    """
+    waypoints = {
+        f"npc:{npc['name']}": (str(npc["map"]), int(npc["x"]), int(npc["y"])) for npc in atlas.npcs.values()
+    }
+    for section_name, start in atlas.section_starts.items():
+        waypoints[f"section:{section_name}"] = start
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for name, waypoint in json.load(f).items():
+                waypoints[name] = (str(waypoint["map"]), int(waypoint["x"]), int(waypoint["y"]))
+    return waypoints
+
+
+class RoutePlanner:
+    """
+    A* over the atlas tiles, moving in the same 8 directions as the navigation map.
+    Without a cost model every step costs the same, with one a step costs its expected seconds in normal mode.
+    """
+
+    # How many steps the map-wide encounter rate is worth against a tile's own counts
+    PRIOR_STEPS = 10
+
+    def __init__(
+            self,
+            atlas: WorldAtlas,
+            waypoints: Dict[str, Position] | None = None,
+            cost_model: SectionCostModel | None = None,
+    ) -> None:
+        """
+        :param atlas: tiles to route over
+        :param waypoints: waypoint name -> position
+        :param cost_model: weigh steps by their expected fights, None to count steps
+        """
+        self.atlas = atlas
+        self.waypoints = waypoints if waypoints is not None else {}
+        self.cost_model = cost_model
+        if cost_model is not None:
+            self.battle_seconds = atlas.get_mean_battle_seconds() or (
+                cost_model.requests_per_battle * cost_model.seconds_per_request
+            )
+            # Tiles we never walked get their map's rate, maps we never walked get the cost model's
+            self.map_encounter_rates = {}
+            for map_key in atlas.maps:
+                encounters, steps = atlas.get_map_encounter_rate(map_key)
+                self.map_encounter_rates[map_key] = (
+                    encounters + cost_model.normal_mode_encounter_rate * RoutePlanner.PRIOR_STEPS
+                ) / (steps + RoutePlanner.PRIOR_STEPS)
+        self.passable_images, self.blocked_images = atlas.get_passable_images()
+        # Moves that do not land next door: (position we step from, direction) -> where we landed
+        self.transition_moves: Dict[Tuple[Position, str], Position] = {}
+        for transition in atlas.transitions:
+            dx, dy = DIRECTION_OFFSETS[transition["direction"]]
+            from_position = (transition["map"], transition["x"] - dx, transition["y"] - dy)
+            to_position = (transition["to_map"], transition["to_x"], transition["to_y"])
+            self.transition_moves[(from_position, transition["direction"])] = to_position
+        # Map -> (tile we step from, where we land) of every transition leaving it, for the A* heuristic
+        self.transitions_by_map: Dict[str, List[Tuple[Position, Position]]] = {}
+        for (from_position, _), to_position in self.transition_moves.items():
+            self.transitions_by_map.setdefault(from_position[0], []).append((from_position, to_position))
+
+    @staticmethod
+    def from_files(
+            atlas_path: str = DEFAULT_ATLAS_PATH,
+            waypoints_path: str = DEFAULT_WAYPOINTS_PATH,
+            cost_model: SectionCostModel | None = None,
+    ) -> RoutePlanner:
+        atlas = WorldAtlas.load(atlas_path)
+        return RoutePlanner(atlas, load_waypoints(atlas, waypoints_path), cost_model)
+
+    def get_waypoint(self, name: str) -> Position:
+        if name not in self.waypoints:
+            raise UnknownWaypointError(f"Unknown waypoint {name}. Known waypoints: {sorted(self.waypoints)}")
+        return self.waypoints[name]
+
+    def is_walkable(self, map_key: str, x: int, y: int) -> bool:
+        atlas_map = self.atlas.maps.get(map_key)
+        if atlas_map is None or not atlas_map.contains(x, y):
+            return False
+        index = atlas_map.get_index(x, y)
+        flags = atlas_map.flags[index]
+        if flags & AtlasMap.TRANSITION:
+            # Stepping on it takes us somewhere else, that is what transition_moves is for
+            return False
+        if flags & AtlasMap.VISITED:
+            return True
+        if flags & AtlasMap.BLOCKED:
+            return False
+        return atlas_map.images[index] in self.passable_images
+
+    def get_neighbours(self, position: Position) -> Iterator[RouteStep]:
+        map_key, x, y = position
+        for direction, (dx, dy) in DIRECTION_OFFSETS.items():
+            if (position, direction) in self.transition_moves:
+                yield direction, self.transition_moves[(position, direction)]
+            elif self.is_walkable(map_key, x + dx, y + dy):
+                yield direction, (map_key, x + dx, y + dy)
+
+    def get_step_cost(self, position: Position, direction: str, next_position: Position) -> float:
+        if self.cost_model is None:
+            return 1.0
+        # Fights start on the tile we step onto, even when it sends us somewhere else
+        map_key, x, y = position
+        dx, dy = DIRECTION_OFFSETS[direction]
+        encounter_rate = self.atlas.get_encounter_rate(
+            map_key,
+            x + dx,
+            y + dy,
+            self.map_encounter_rates.get(map_key, self.cost_model.normal_mode_encounter_rate),
+            RoutePlanner.PRIOR_STEPS,
+        )
+        return self.cost_model.seconds_per_request + encounter_rate * self.battle_seconds
+
+    def get_min_step_cost(self) -> float:
+        """
+        Lower bound of get_step_cost, used by the A* heuristic.
+        """
+        return 1.0 if self.cost_model is None else self.cost_model.seconds_per_request
+
+    def estimate_cost(self, position: Position, goal: Position) -> float:
+        """
+        A* heuristic: never more than the cheapest route could cost, so the route found is the cheapest.
+        Walking straight there is one bound, taking any transition off this map is the other: the steps to it, the
+        transition itself, and the steps from where it lands if that is on the goal's map.
+        """
+        if position[0] != goal[0]:
+            # Some transition is on the way and we cannot tell how far it is
+            return 0.0
+        num_steps = RoutePlanner.get_distance(position, goal)
+        for from_position, to_position in self.transitions_by_map.get(position[0], []):
+            steps_after = RoutePlanner.get_distance(to_position, goal) if to_position[0] == goal[0] else 0
+            num_steps = min(num_steps, RoutePlanner.get_distance(position, from_position) + 1 + steps_after)
+        return num_steps * self.get_min_step_cost()
+
+    @staticmethod
+    def get_distance(position: Position, other_position: Position) -> int:
+        """
+        Chebyshev distance, i.e. the fewest steps between two tiles of one map when diagonals are allowed.
+        """
+        return max(abs(position[1] - other_position[1]), abs(position[2] - other_position[2]))
+
+    def find_route(self, start: Position, goal: Position) -> List[RouteStep] | None:
+        """
+        :param start: where the party stands
+        :param goal: where it should end up
+        :return: the cheapest steps as (direction, position after the step), None if the atlas has no way there
+        """
+        found = self.search(start, {goal}, lambda position: self.estimate_cost(position, goal))
+        return None if found is None else found[1]
+
+    def find_nearest(self, start: Position, goals: Dict[str, Position]) -> Tuple[str, List[RouteStep]] | None:
+        """
+        :param start: where the party stands
+        :param goals: name -> position of every place we would be happy to reach
+        :return: name of the cheapest one to reach and the route there, None if none can be reached
+        """
+        found = self.search(start, set(goals.values()), lambda position: 0.0)
+        if found is None:
+            return None
+        goal, route, _ = found
+        return next(name for name, position in goals.items() if position == goal), route
+
+    def search(
+            self, start: Position, goals: Set[Position], estimate_cost: Callable[[Position], float]
+    ) -> Tuple[Position, List[RouteStep], float] | None:
+        """
+        A* until the first of the goals comes off the frontier.
+        :return: the goal reached, the route there and its cost, None if no goal can be reached
+        """
+        tie_breaker = itertools.count()
+        frontier = [(estimate_cost(start), 0.0, next(tie_breaker), start)]
+        came_from: Dict[Position, RouteStep | None] = {start: None}
+        cost_so_far = {start: 0.0}
+        while frontier:
+            _, cost, _, position = heapq.heappop(frontier)
+            if position in goals:
+                return position, self.reconstruct_route(came_from, position), cost
+            if cost > cost_so_far[position]:
+                continue
+            for direction, next_position in self.get_neighbours(position):
+                next_cost = cost + self.get_step_cost(position, direction, next_position)
+                if next_cost < cost_so_far.get(next_position, float("inf")):
+                    cost_so_far[next_position] = next_cost
+                    came_from[next_position] = (direction, position)
+                    heapq.heappush(
+                        frontier, (next_cost + estimate_cost(next_position), next_cost, next(tie_breaker), next_position)
+                    )
+        return None
+
+    @staticmethod
+    def reconstruct_route(came_from: Dict[Position, RouteStep | None], goal: Position) -> List[RouteStep]:
+        route = []
+        position = goal
+        while came_from[position] is not None:
+            direction, previous_position = came_from[position]
+            route.append((direction, position))
+            position = previous_position
+        route.reverse()
+        return route
+
+    def find_path(self, start: Position, goal: Position) -> str | None:
+        route = self.find_route(start, goal)
+        return None if route is None else "".join(direction for direction, _ in route)
+
+    def get_next_leg(self, start: Position, goal: Position) -> str | None:
+        """
+        The part of the route up to and including the first transition, after which the party may not be where the
+        atlas says, so the rest has to be planned again from wherever it lands.
+        """
+        route = self.find_route(start, goal)
+        if route is None:
+            return None
+        leg = ""
+        position = start
+        for direction, next_position in route:
+            leg += direction
+            if (position, direction) in self.transition_moves:
+                break
+            position = next_position
+        return leg
+
+
+class RouteTable:
+    """
+    Waypoint-to-waypoint paths cached on disk. The cache belongs to one version of the atlas and one way of costing
+    steps, and is thrown away when either changes.
+    """
+
+    def __init__(self, route_planner: RoutePlanner, path: str = DEFAULT_ROUTE_TABLE_PATH) -> None:
+        self.route_planner = route_planner
+        self.path = path
+        self.atlas_fingerprint = route_planner.atlas.get_fingerprint()
+        cost_model = route_planner.cost_model
+        self.cost_model_settings = None if cost_model is None else vars(cost_model)
+        self.routes: Dict[str, str | None] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("atlas") == self.atlas_fingerprint and cache.get("cost_model") == self.cost_model_settings:
+                self.routes = cache["routes"]
+            else:
+                logger.info("The atlas or step costs changed since %s was written, planning routes again", path)
+
+    def get_path(self, start_name: str, goal_name: str) -> str | None:
+        key = f"{start_name}->{goal_name}"
+        if key not in self.routes:
+            self.routes[key] = self.route_planner.find_path(
+                self.route_planner.get_waypoint(start_name), self.route_planner.get_waypoint(goal_name)
+            )
+            self.save()
+        return self.routes[key]
+
+    def precompute(self) -> int:
+        """
+        Plan every waypoint-to-waypoint route that is not cached yet.
+        :return: number of reachable pairs
+        """
+        names = sorted(self.route_planner.waypoints)
+        for start_name, goal_name in itertools.permutations(names, 2):
+            key = f"{start_name}->{goal_name}"
+            if key not in self.routes:
+                self.routes[key] = self.route_planner.find_path(
+                    self.route_planner.waypoints[start_name], self.route_planner.waypoints[goal_name]
+                )
+        self.save()
+        return sum(path is not None for path in self.routes.values())
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"atlas": self.atlas_fingerprint, "cost_model": self.cost_model_settings, "routes": self.routes},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+
+
+@click.command()
+@click.argument("start", required=False)
+@click.argument("goal", required=False)
+@click.option("--atlas", "atlas_path", default=DEFAULT_ATLAS_PATH, type=click.Path(exists=True, dir_okay=False))
+@click.option("--waypoints", "waypoints_path", default=DEFAULT_WAYPOINTS_PATH, type=click.Path(dir_okay=False))
+@click.option("--route-table", "route_table_path", default=DEFAULT_ROUTE_TABLE_PATH, type=click.Path(dir_okay=False))
+@click.option("--precompute", is_flag=True, default=False, help="Plan and cache the routes between all waypoints")
+@click.option("--fewest-steps", is_flag=True, default=False,
+              help="Count steps instead of expected time including random encounters")
+def main(
+        start: str | None,
+        goal: str | None,
+        atlas_path: str,
+        waypoints_path: str,
+        route_table_path: str,
+        precompute: bool,
+        fewest_steps: bool,
+) -> None:
+    """
+    Print the path from waypoint START to waypoint GOAL, ready for "Follow a custom path".
+    """
+    cost_model = None if fewest_steps else SectionCostModel.from_log(DEFAULT_LOGGING_CONFIG["file"]["path"])
+    route_table = RouteTable(RoutePlanner.from_files(atlas_path, waypoints_path, cost_model), route_table_path)
+    if precompute:
+        num_routes = route_table.precompute()
+        click.echo(f"{num_routes} routes between {len(route_table.route_planner.waypoints)} waypoints")
+    if start and goal:
+        try:
+            path = route_table.get_path(start, goal)
+        except UnknownWaypointError as e:
+            raise click.BadParameter(str(e), param_hint="START/GOAL")
+        click.echo(path if path is not None else f"The atlas has no known way from {start} to {goal}")
+    elif not precompute:
+        click.echo("\n".join(sorted(route_table.route_planner.waypoints)))
+
+
+if __name__ == "__main__":
+    main()
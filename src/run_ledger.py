@@ -0,0 +1,26 @@
+import logging
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+class RunLedger:
+    """
+    Running tally of notable things that happened during a run, e.g. skill casts we skipped because the ally
+    did not have the skill yet. Summarized at the end of every game section.
+    """
+
+    def __init__(self) -> None:
+        self.entries: Counter[str] = Counter()
+
+    def record(self, entry: str, count: int = 1) -> None:
+        self.entries[entry] += count
+
+    def record_avoided_cast(self, ally_name: str, skill_name: str) -> None:
+        logger.info("%s does not have %s yet, so we did not try to cast it", ally_name, skill_name)
+        self.record(f"avoided cast: {ally_name} {skill_name}")
+
+    def get_summary(self) -> str:
+        if not self.entries:
+            return "Nothing recorded"
+        return ", ".join(f"{entry} x{count}" for entry, count in self.entries.most_common())
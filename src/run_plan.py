@@ -0,0 +1,184 @@
+"""
+Unattended runs: a run plan is a list of sections, custom paths, grinds and waypoint walks that BatchRunner plays back
+to back without asking anything, stopping or carrying on after a failure as the plan says, and ending with an exit code
+a scheduler can act on.
+
+A plan file is JSON, e.g.
+{
+    "on_failure": "stop",
+    "entries": [
+        {"section": "complete_act1_zombom"},
+        {"grind": {"max_steps": 2000, "potion_floor": 3}, "initial_path": "3333"},
+        {"path": "33335"},
+        {"walk_to": "npc:Mother"}
+    ]
+}
+The same entries can be given on the command line as complete_act1_zombom, grind:2000, path:33335 and walk:npc:Mother.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any, Dict, List
+
+from src.autoplayer import Autoplayer
+from src.grind_goal import GrindGoal
+from src.section_script import FollowPath, Grind, SectionRunner, SectionStep
+
+logger = logging.getLogger(__name__)
+
+# Exit codes of an unattended run. 2 is left to click for bad command lines.
+EXIT_SUCCESS = 0
+EXIT_FAILURES_SKIPPED = 1
+EXIT_STOPPED_ON_FAILURE = 3
+EXIT_SETUP_FAILED = 4
+EXIT_INTERRUPTED = 130
+
+ON_FAILURE_POLICIES = ["stop", "continue"]
+
+
+class RunSection(SectionStep):
+    def __init__(self, name: str) -> None:
+        """
+        :param name: name of the Autoplayer section method, e.g. complete_act1_zombom
+        """
+        self.name = name
+
+
+class WalkTo(SectionStep):
+    def __init__(self, waypoint_name: str) -> None:
+        self.waypoint_name = waypoint_name
+
+
+class RunPlan:
+    def __init__(self, entries: List[SectionStep], on_failure: str = "stop") -> None:
+        """
+        :param entries: what to play, in order
+        :param on_failure: "stop" to end the run at the first failure, "continue" to get back to the overworld and go
+         on with the next entry
+        """
+        if on_failure not in ON_FAILURE_POLICIES:
+            raise ValueError(f"on_failure must be one of {ON_FAILURE_POLICIES}, got {on_failure}")
+        self.entries = entries
+        self.on_failure = on_failure
+
+    @staticmethod
+    def from_file(path: str, on_failure: str | None = None) -> RunPlan:
+        """
+        :param path: JSON plan file, see the module docstring
+        :param on_failure: overrides the file's failure policy if given
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            plan = json.load(f)
+        entries = [parse_plan_entry(entry) for entry in plan["entries"]]
+        return RunPlan(entries, on_failure or plan.get("on_failure", "stop"))
+
+
+def parse_plan_entry(entry: Dict[str, Any]) -> SectionStep:
+    """
+    :param entry: one entry of a plan file
+    """
+    if "section" in entry:
+        return RunSection(validate_section_name(entry["section"]))
+    if "path" in entry:
+        return FollowPath(validate_path(entry["path"]))
+    if "grind" in entry:
+        initial_path = entry.get("initial_path")
+        return Grind(GrindGoal(**entry["grind"]), validate_path(initial_path) if initial_path else None)
+    if "walk_to" in entry:
+        return WalkTo(entry["walk_to"])
+    raise ValueError(f"Plan entries need one of section, path, grind or walk_to, got {entry}")
+
+
+def parse_command_line_entry(text: str) -> SectionStep:
+    """
+    :param text: complete_<section>, path:<digits>, grind:<steps> or walk:<waypoint>
+    """
+    kind, _, value = text.partition(":")
+    match kind:
+        case "path":
+            return FollowPath(validate_path(value))
+        case "grind":
+            if not value.isnumeric():
+                raise ValueError(f"Expected grind:<number of steps>, got {text}")
+            return Grind(GrindGoal(max_steps=int(value)))
+        case "walk":
+            return WalkTo(value)
+        case _:
+            return RunSection(validate_section_name(text))
+
+
+def validate_section_name(name: str) -> str:
+    if not name.startswith("complete_") or not hasattr(Autoplayer, name):
+        raise ValueError(f"Unknown section {name}")
+    return name
+
+
+def validate_path(path: str) -> str:
+    if not path or any(step not in "12345678" for step in path):
+        raise ValueError(f"Paths are digits from 1 to 8, got {path}")
+    return path
+
+
+class BatchRunner:
+    """
+    Plays a run plan with nobody at the keyboard.
+    """
+
+    def __init__(self, autoplayer: Autoplayer) -> None:
+        self.autoplayer = autoplayer
+
+    def run(self, run_plan: RunPlan) -> int:
+        """
+        :return: exit code for the whole run
+        """
+        num_failures = 0
+        for entry_number, entry in enumerate(run_plan.entries, start=1):
+            logger.info("Run plan entry %d of %d: %s", entry_number, len(run_plan.entries), entry)
+            started_at = time.monotonic()
+            try:
+                self.run_entry(entry)
+            except KeyboardInterrupt:
+                logger.warning("Run interrupted during entry %d: %s", entry_number, entry)
+                return EXIT_INTERRUPTED
+            except Exception:
+                num_failures += 1
+                logger.exception("Run plan entry %d failed: %s", entry_number, entry)
+                self.autoplayer.current_page.dump_page_history(f"run plan entry {entry_number} failed")
+                if run_plan.on_failure == "stop":
+                    return EXIT_STOPPED_ON_FAILURE
+                if not self.try_recover():
+                    return EXIT_STOPPED_ON_FAILURE
+                continue
+            logger.info("Finished entry %d in %.0f s", entry_number, time.monotonic() - started_at)
+
+        logger.info(
+            "Run plan done: %d of %d entries succeeded", len(run_plan.entries) - num_failures, len(run_plan.entries)
+        )
+        return EXIT_FAILURES_SKIPPED if num_failures else EXIT_SUCCESS
+
+    def run_entry(self, entry: SectionStep) -> None:
+        match entry:
+            case RunSection(name=name):
+                getattr(self.autoplayer, name)()
+            case WalkTo(waypoint_name=waypoint_name):
+                self.autoplayer.walk_to(waypoint_name)
+            case _:
+                SectionRunner(self.autoplayer).run_step(entry)
+
+    def try_recover(self) -> bool:
+        """
+        Get back to the overworld so the next entry starts from somewhere sensible.
+        :return: False if even that failed
+        """
+        try:
+            overworld_handler = self.autoplayer.overworld_handler
+            overworld_handler.overworld_page = self.autoplayer.page_dispatcher.settle_on_overworld(
+                overworld_handler.overworld_page
+            )
+        except Exception:
+            logger.exception("Could not get back to the overworld after a failed entry, stopping the run")
+            return False
+        return True
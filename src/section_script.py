@@ -0,0 +1,320 @@
+"""
+Game sections as data. A section is an ordered list of typed steps (walk a path, grind, talk to an NPC, equip,
+spend skillpoints...) that SectionRunner plays against the autoplayer and SectionCostEstimator prices without
+touching the game, so a whole act can be budgeted before it is run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import statistics
+from typing import TYPE_CHECKING, Dict, List
+
+from src.grind_goal import GrindGoal
+from src.overworld_handler import OverworldHandler
+from src.skillpoint_handler import SkillpointHandler
+
+if TYPE_CHECKING:
+    from src.autoplayer import Autoplayer
+
+logger = logging.getLogger(__name__)
+
+
+class UnknownSectionStepError(ValueError):
+    """A section holds a step that the runner or the estimator does not know how to interpret."""
+
+    def __init__(self, step: SectionStep, verb: str) -> None:
+        """
+        :param step: the step that could not be interpreted
+        :param verb: what we were trying to do with it, e.g. "run" or "estimate"
+        """
+        super().__init__(f"Do not know how to {verb} section step {step!r}")
+        self.step = step
+
+
+class SectionStep:
+    """
+    Base class for everything a section can do. Steps only hold data, the runner and the estimator interpret them.
+    """
+
+    def __eq__(self, other: object) -> bool:
+        return type(self) is type(other) and vars(self) == vars(other)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in vars(self).items())
+        return f"{type(self).__name__}({fields})"
+
+
+class FollowPath(SectionStep):
+    def __init__(self, path: str) -> None:
+        """
+        :param path: digits of the directions to walk, fighting whatever we run into
+        """
+        self.path = path
+
+
+class Grind(SectionStep):
+    def __init__(self, goal: GrindGoal, initial_path: str | None = None) -> None:
+        """
+        :param goal: when to stop grinding
+        :param initial_path: path to the grinding spot, walked back once the goal is met
+        """
+        self.goal = goal
+        self.initial_path = initial_path
+
+
+class TalkTo(SectionStep):
+    def __init__(self, dialogue_urls: List[str]) -> None:
+        """
+        :param dialogue_urls: NPC dialogue links to visit in order, one of the NpcHandler link lists
+        """
+        self.dialogue_urls = dialogue_urls
+
+
+class Equip(SectionStep):
+    def __init__(self, equipment_id: int, ally_id: int) -> None:
+        self.equipment_id = equipment_id
+        self.ally_id = ally_id
+
+
+class SpendSkillpoints(SectionStep):
+    def __init__(self, ally: SkillpointHandler.AllyType, skill_id: int, num_points: int) -> None:
+        self.ally = ally
+        self.skill_id = skill_id
+        self.num_points = num_points
+
+
+class SetMovementMode(SectionStep):
+    def __init__(self, mode: OverworldHandler.MovementMode) -> None:
+        self.mode = mode
+
+
+class Repeat(SectionStep):
+    def __init__(self, times: int, steps: List[SectionStep]) -> None:
+        self.times = times
+        self.steps = steps
+
+
+class Section:
+    def __init__(self, name: str, act: int, steps: List[SectionStep], description: str = "") -> None:
+        """
+        :param name: name of the Autoplayer method running the section, e.g. complete_act1_zombom
+        :param act: act the section is listed under in the menu
+        :param steps: what the section does, in order
+        :param description: one line for menus and dry runs
+        """
+        self.name = name
+        self.act = act
+        self.steps = steps
+        self.description = description
+
+
+class SectionRunner:
+    """
+    Plays section steps against the autoplayer's handlers.
+    """
+
+    def __init__(self, autoplayer: Autoplayer) -> None:
+        self.autoplayer = autoplayer
+
+    def run(self, steps: List[SectionStep]) -> None:
+        for step in steps:
+            self.run_step(step)
+
+    def run_step(self, step: SectionStep) -> None:
+        autoplayer = self.autoplayer
+        match step:
+            case FollowPath(path=path):
+                autoplayer.follow_path(path)
+            case Grind(goal=goal, initial_path=initial_path):
+                autoplayer.grind_until(goal, initial_path)
+            case TalkTo(dialogue_urls=dialogue_urls):
+                autoplayer.npc_handler.talk_with_npc(dialogue_urls)
+            case Equip(equipment_id=equipment_id, ally_id=ally_id):
+                autoplayer.inventory_handler.equip_equipment(equipment_id, ally_id)
+            case SpendSkillpoints(ally=ally, skill_id=skill_id, num_points=num_points):
+                autoplayer.skillpoint_handler.try_spend_multiple_skillpoints(ally, skill_id, num_points)
+            case SetMovementMode(mode=mode):
+                autoplayer.overworld_handler.switch_movement_mode(mode)
+            case Repeat(times=times, steps=steps):
+                for _ in range(times):
+                    self.run(steps)
+            case _:
+                raise UnknownSectionStepError(step, "run")
+
+
+class SectionEstimate:
+    def __init__(self) -> None:
+        self.requests = 0.0
+        self.steps_walked = 0
+        # Every step in normal mode can start a fight, this is the count if they all do
+        self.worst_case_normal_mode_encounters = 0
+        self.expected_encounters = 0.0
+        # Grinds that only stop on a level or experience target, so their length is a guess
+        self.open_ended_grinds = 0
+
+    def add(self, other: SectionEstimate) -> None:
+        self.requests += other.requests
+        self.steps_walked += other.steps_walked
+        self.worst_case_normal_mode_encounters += other.worst_case_normal_mode_encounters
+        self.expected_encounters += other.expected_encounters
+        self.open_ended_grinds += other.open_ended_grinds
+
+
+class SectionCostModel:
+    """
+    Rough costs used to price section steps. Latency comes from the request timings in the JSON lines log when there
+    is one, the rest are ballpark numbers from watching runs.
+    """
+
+    def __init__(
+            self,
+            seconds_per_request: float = 1.0,
+            normal_mode_encounter_rate: float = 0.1,
+            hunting_mode_encounter_rate: float = 0.5,
+            requests_per_battle: float = 14,
+            open_ended_grind_steps: int = 300,
+    ) -> None:
+        """
+        :param seconds_per_request: average time for one page load
+        :param normal_mode_encounter_rate: chance that a step in normal mode starts a fight
+        :param hunting_mode_encounter_rate: chance that a step in hunting mode starts a fight
+        :param requests_per_battle: page loads for a whole fight, from the start page to the result page
+        :param open_ended_grind_steps: steps assumed for a grind without a step limit
+        """
+        self.seconds_per_request = seconds_per_request
+        self.normal_mode_encounter_rate = normal_mode_encounter_rate
+        self.hunting_mode_encounter_rate = hunting_mode_encounter_rate
+        self.requests_per_battle = requests_per_battle
+        self.open_ended_grind_steps = open_ended_grind_steps
+
+    @staticmethod
+    def from_log(log_path: str) -> SectionCostModel:
+        """
+        Take the average request latency from the JSON lines log. Falls back to the default if the log has none.
+        :param log_path: path to the autoplayer's JSON lines log
+        """
+        latencies_ms = []
+        try:
+            with open(log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    latency_ms = json.loads(line).get("latency_ms")
+                    if latency_ms is not None:
+                        latencies_ms.append(latency_ms)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read request timings from %s: %s", log_path, e)
+
+        if not latencies_ms:
+            return SectionCostModel()
+        return SectionCostModel(seconds_per_request=statistics.fmean(latencies_ms) / 1000)
+
+
+class SectionCostEstimator:
+    """
+    Walks section steps without running them and adds up what they would cost.
+    Movement mode is tracked across steps, since it decides how likely every step is to start a fight.
+    """
+
+    def __init__(self, cost_model: SectionCostModel | None = None) -> None:
+        self.cost_model = cost_model or SectionCostModel()
+        self.movement_mode = OverworldHandler.MovementMode.NORMAL
+
+    def estimate(self, steps: List[SectionStep]) -> SectionEstimate:
+        estimate = SectionEstimate()
+        for step in steps:
+            estimate.add(self.estimate_step(step))
+        return estimate
+
+    def estimate_step(self, step: SectionStep) -> SectionEstimate:
+        match step:
+            case FollowPath(path=path):
+                return self.estimate_walk(len(path))
+            case Grind(goal=goal, initial_path=initial_path):
+                return self.estimate_grind(goal, initial_path)
+            case TalkTo(dialogue_urls=dialogue_urls):
+                # Every dialogue link, then back to the main game page
+                return self.estimate_requests(len(dialogue_urls) + 1)
+            case Equip():
+                return self.estimate_requests(2)
+            case SpendSkillpoints(num_points=num_points):
+                return self.estimate_requests(2 * num_points)
+            case SetMovementMode(mode=mode):
+                self.movement_mode = mode
+                return self.estimate_requests(1)
+            case Repeat(times=times, steps=steps):
+                estimate = SectionEstimate()
+                for _ in range(times):
+                    estimate.add(self.estimate(steps))
+                return estimate
+            case _:
+                raise UnknownSectionStepError(step, "estimate")
+
+    def estimate_requests(self, requests: float) -> SectionEstimate:
+        estimate = SectionEstimate()
+        estimate.requests = requests
+        return estimate
+
+    def estimate_walk(self, num_steps: int) -> SectionEstimate:
+        estimate = SectionEstimate()
+        if self.movement_mode == OverworldHandler.MovementMode.HUNTING:
+            encounter_rate = self.cost_model.hunting_mode_encounter_rate
+        else:
+            encounter_rate = self.cost_model.normal_mode_encounter_rate
+            estimate.worst_case_normal_mode_encounters = num_steps
+        estimate.steps_walked = num_steps
+        estimate.expected_encounters = num_steps * encounter_rate
+        estimate.requests = num_steps + estimate.expected_encounters * self.cost_model.requests_per_battle
+        return estimate
+
+    def estimate_grind(self, goal: GrindGoal, initial_path: str | None) -> SectionEstimate:
+        # Same moves as Autoplayer.grind_until: there, hunting mode on, grind, hunting mode off, back
+        estimate = SectionEstimate()
+        if initial_path:
+            estimate.add(self.estimate_walk(len(initial_path)))
+        estimate.add(self.estimate_step(SetMovementMode(OverworldHandler.MovementMode.HUNTING)))
+        if goal.max_steps is not None:
+            estimate.add(self.estimate_walk(goal.max_steps))
+        else:
+            estimate.add(self.estimate_walk(self.cost_model.open_ended_grind_steps))
+            estimate.open_ended_grinds += 1
+        estimate.add(self.estimate_step(SetMovementMode(OverworldHandler.MovementMode.NORMAL)))
+        if initial_path:
+            estimate.add(self.estimate_walk(len(initial_path)))
+        return estimate
+
+    def get_expected_seconds(self, estimate: SectionEstimate) -> float:
+        return estimate.requests * self.cost_model.seconds_per_request
+
+
+def format_estimates(sections: List[Section], cost_model: SectionCostModel) -> str:
+    """
+    Dry-run report: one line per section and a total per act.
+    :param sections: sections to price, in the order they are played
+    :param cost_model: costs to price them with
+    """
+    lines = [f"Assuming {cost_model.seconds_per_request:.2f}s per request"]
+    act_totals: Dict[int, SectionEstimate] = {}
+    for section in sections:
+        # Every section starts in normal mode, that is how the previous one leaves it
+        estimator = SectionCostEstimator(cost_model)
+        estimate = estimator.estimate(section.steps)
+        act_totals.setdefault(section.act, SectionEstimate()).add(estimate)
+        lines.append(format_estimate(f"Act {section.act} {section.name}", estimate, estimator))
+
+    for act, estimate in act_totals.items():
+        lines.append(format_estimate(f"Act {act} total", estimate, SectionCostEstimator(cost_model)))
+    return "\n".join(lines)
+
+
+def format_estimate(label: str, estimate: SectionEstimate, estimator: SectionCostEstimator) -> str:
+    line = (
+        f"{label}: ~{estimate.requests:.0f} requests, {estimate.steps_walked} steps, "
+        f"up to {estimate.worst_case_normal_mode_encounters} encounters in normal mode "
+        f"(~{estimate.expected_encounters:.0f} fights expected), "
+        f"~{estimator.get_expected_seconds(estimate) / 60:.0f} min"
+    )
+    if estimate.open_ended_grinds:
+        line += f" ({estimate.open_ended_grinds} grind(s) without a step limit, assumed "
+        line += f"{estimator.cost_model.open_ended_grind_steps} steps)"
+    return line
@@ -0,0 +1,885 @@
+"""
+Every game section the autoplayer can complete, written down as data for SectionRunner.
+Paths and grind spots come from the community guides, see the README for where each section starts.
+"""
+
+from src.grind_goal import GrindGoal
+from src.inventory_handler import InventoryHandler
+from src.npc_handler import NpcHandler
+from src.overworld_handler import OverworldHandler
+from src.section_script import (
+    Equip,
+    FollowPath,
+    Grind,
+    Repeat,
+    Section,
+    SetMovementMode,
+    SpendSkillpoints,
+    TalkTo,
+)
+from src.skillpoint_handler import SkillpointHandler
+
+# We are super weak at the start, so every step outside is followed by a trip home to heal with mother.
+# Ends back in the starting position for the rest of the training
+WALK_OUT_AND_HEAL_AT_HOME = [
+    FollowPath("7"),
+    FollowPath("2666222866333"),
+    TalkTo(NpcHandler.MOTHER_INTERACTION_LINKS),
+    FollowPath("3333"),
+]
+
+ACT1_INITIAL_TRAINING = Section(
+    "complete_act1_initial_training",
+    act=1,
+    description=(
+        "Starts from level 1 and takes one step northeast for 30 steps, battling along the way. "
+        "After 30 steps, continue fighting for additional 150 steps for further leveling. "
+        "Tries to spend skillpoints when possible."
+    ),
+    steps=[
+        FollowPath("3333"),
+        SetMovementMode(OverworldHandler.MovementMode.HUNTING),
+        # One step out and back home to heal, 30 times. Try to spend a skillpoint every 15 steps
+        Repeat(
+            2,
+            [
+                Repeat(14, WALK_OUT_AND_HEAL_AT_HOME),
+                FollowPath("7"),
+                SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.STUN.value, 1),
+                *WALK_OUT_AND_HEAL_AT_HOME[1:],
+            ],
+        ),
+        # Should be strong enough to survive with healing from potions
+        # Grind outside of town and return to original starting tile at end, spending a skillpoint every 30 steps
+        Repeat(
+            5,
+            [
+                FollowPath("12" * 15),
+                SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.STUN.value, 1),
+            ],
+        ),
+        # Finally, switch back to normal mode
+        SetMovementMode(OverworldHandler.MovementMode.NORMAL),
+    ],
+)
+
+
+ACT2_MINER_FOREMAN = Section(
+    "complete_act2_miner_foreman",
+    act=1,
+    description=(
+        "Walk from outside of Trestin all the way to the Miner Foreman, stopping to train in the middle. "
+        "Afterwards, walk to White River City."
+    ),
+    steps=[
+        FollowPath("33333357111111117111111882"),
+        Grind(GrindGoal(max_steps=100)),
+
+        # Rohane: 7 stun
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.STUN.value, 2),
+
+        FollowPath("882282288884444447444477777777771777448488226663666266222222226662222266333333333336333336666662"),
+        # At this point, you are one tile ABOVE the Miner Foreman!
+        # Walking one step down puts you into battle, one step further puts you to where he was
+        FollowPath("2222"),
+        # Now follow the given path to go from outside cave entrance to outside of uh... White City or something
+        FollowPath("84444444444444448444488888888444484444448"),
+    ],
+)
+
+
+ACT1_ZOMBOM = Section(
+    "complete_act1_zombom",
+    act=1,
+    steps=[
+        # The Underground Cave drops close to zero potions for some reason
+        # Get as close as we can to level 11 as possible before moving on
+        # Pretty sure you can grind for hundreds of battles and still only reach level 11
+        # So stop as soon as we get there, and keep the old step count as an upper bound
+        Grind(GrindGoal(target_level=11, max_steps=600), "7777"),
+
+        # Rohane: 10 stun
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.STUN.value, 3),
+        # Sprint to Zombom and do NOT fight in the cave because the potion drops are extremely low
+        # Go buy gear from Tebor
+        FollowPath("2666333"),
+        TalkTo(NpcHandler.TEBOR_INTERACTION_LINKS),
+        Equip(InventoryHandler.IRON_SHORTSWORD_ID, InventoryHandler.AllyId.ROHANE.value),
+        Equip(InventoryHandler.RUSTY_CHAIN_TUNIC_ID, InventoryHandler.AllyId.ROHANE.value),
+        # Walk to the cave
+        FollowPath("447777"),
+        # Head all the way through to Zombom
+        FollowPath(
+            "77777777777488844882222222622288888444447777774444488888888844888288848228444"
+            "77777771111517744362222222222222284453555511111222"
+        ),
+        # Finally, walk all the way back to Mipsy
+        FollowPath("222"),
+        FollowPath("515155553555535533333666666333335555511117111555113555366666666666222222222222222222222226663"),
+
+        # Recruit Mipsy and then try to invest her skillpoints into direct damage
+        TalkTo(NpcHandler.MIPSY_INTERACTION_LINKS),
+
+        # Mipsy only has 58 HP at level 12 - can't get full value of direct damage right away
+        # Mipsy: 11 direct damage - gained a level from Zombom I think
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value, 11),
+    ],
+)
+
+
+ACT1_SAND_GRUNDO = Section(
+    "complete_act1_sand_grundo",
+    act=1,
+    steps=[
+        # Train in grass area for a bit
+        FollowPath("48882"),
+        Grind(GrindGoal(max_steps=200), "88"),
+
+        # Rohane: 13 stun
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.STUN.value, 2),
+        # Mipsy: 13 direct damage
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value, 2),
+
+        # Walk from White River City to Fudra (we don't need anything from her, but you can buy)
+        FollowPath("44444444744444448222222666666633333333366666666666666666666666663333517774"),
+
+        # Walk to Potraddo and talk to him
+        FollowPath("33335555551155"),
+        FollowPath("41111111111111444444111111111111114444444111335333335633333333333322222"),
+        TalkTo(NpcHandler.POTRADDO_INTERACTION_LINKS),
+
+        # Walk outside the town and train for a bit before heading over to the Lost City
+        FollowPath("11177444444444478444448482633336622222222662666222222882222222888822222224444477777"),
+        # I don't actually think we need to grind here, but ok
+        Grind(GrindGoal(max_steps=100)),
+
+        FollowPath("77777744488822266666666666638888"),
+        # Must talk to the ghost to gain entry
+        TalkTo(NpcHandler.WITHERED_GHOST_INTERACTION_LINKS),
+        FollowPath("888888888"),
+        # Train inside the city for a bit because enemies after are quite dangerous if underleveled
+        Grind(GrindGoal(max_steps=160)),
+
+        # Rohane: 13 stun, 2 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 2),
+        # Mipsy: 13 direct damage, 2 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 2),
+        FollowPath("8888882844444444888882222228882222222284444444484"),
+
+        # Beat the Mutant Sand Grundo and enter the portal
+        FollowPath("444"),
+    ],
+)
+
+
+ACT1_RAMTOR1 = Section(
+    "complete_act1_ramtor1",
+    act=1,
+    steps=[
+        Grind(GrindGoal(max_steps=200), "222"),
+
+        # Rohane: 13 stun, 4 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 2),
+        # Mipsy: 13 direct damage, 4 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 2),
+
+        # Exit the tower and walk all the way to next town
+        FollowPath(
+            "22222222222287744447771177828448222222263333663333351151111562651111111174444477771717111111117777777447"
+            "444448888888884888444444444777"
+        ),
+
+        # Lands us one tile below Uthare -> good upgrades, so buy
+        FollowPath("1"),
+        TalkTo(NpcHandler.UTHARE_INTERACTION_LINKS),
+        FollowPath("2888844822"),
+        TalkTo(NpcHandler.PATANNIS_INTERACTION_LINKS),
+        FollowPath("115533333333333"),
+        Grind(GrindGoal(max_steps=100), "666"),
+
+        # Rohane: 13 stun, 5 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 1),
+        # Mipsy: 13 direct damage, 5 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 1),
+
+        # Now walk to Ramtor 1
+        FollowPath("66666666666666666666666666222663633333335555555335511"),
+    ],
+)
+
+
+ACT1_RAMTOR2 = Section(
+    "complete_act1_ramtor2",
+    act=1,
+    steps=[
+        FollowPath("22888888844444444"),
+        TalkTo(NpcHandler.GUARD_THYET_INTERACTION_LINKS),
+        # Exit the castle, then walk to the tower
+        FollowPath("844"),
+        FollowPath("63333333333333366633333333333335555555555535335"),
+        FollowPath("1111115533"),
+        Grind(GrindGoal(max_steps=160)),
+
+        # Rohane: 13 stun, 7 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 2),
+        # Mipsy: 13 direct damage, 7 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 2),
+
+        # Navigate through tower all the way to Ramtor
+        FollowPath("356228866334744477711177744477715515333666222366333551111115848888884444447446662666663332223"),
+        FollowPath("33"),
+    ],
+)
+
+
+ACT2_LEXIMP_AND_WALK_CAVE = Section(
+    "complete_act2_leximp_and_walk_cave",
+    act=2,
+    description=(
+        "Go to the cave and beat Leximp to get the wordstone. It is too much of a pain to actually buy stuff "
+        "though."
+    ),
+    steps=[
+        FollowPath("44"),
+        FollowPath("7844447747444444884882888822888815555555551155533336363363333356"),
+        Grind(GrindGoal(max_steps=200), "7844444"),
+
+        # Rohane: 13 stun, 9 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 2),
+        # Mipsy: 13 direct damage, 9 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 2),
+
+        # Walk through Terror Mountain overworld to cave entrance
+        FollowPath("78444477474444441774474444444444447744444477444444444444444444444444444444477777777777771"),
+    ],
+)
+
+
+ACT2_CAVES_OF_TERROR = Section(
+    "complete_act2_caves_of_terror",
+    act=2,
+    steps=[
+        FollowPath("1"),
+        Grind(GrindGoal(max_steps=300), "115"),
+
+        # Rohane: 13 stun, 11 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 2),
+        # Mipsy: 13 direct damage, 11 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 2),
+
+        # Long walk through cave and all the way out to Talinia at inn
+        FollowPath(
+            "1555533336663633633333555353533355777774444447444447774775553336335553353577711555177444447"
+            "444448447471111111117771178"
+        ),
+
+        FollowPath("8"),
+        TalkTo(NpcHandler.TALINIA_INTERACTION_LINKS),
+
+        # Talinia: 13 ranged attacks, 11 shockwave
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.RANGED_ATTACKS.value, 13),
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.SHOCKWAVE.value, 11),
+    ],
+)
+
+
+ACT2_KOLVARS_AND_GRIND = Section(
+    "complete_act2_kolvars_and_grind",
+    act=2,
+    steps=[
+        # Leave town and walk to Kolvars
+        FollowPath("553"),
+        FollowPath("55551155555555555555335333355333333555636333333355155366633336633363511777155366366626"),
+        # Grind a bit to make sure we are ready for harder monsters up to camp
+        # Rohane 3 damage increase, mipsy 3 haste, talinia 2 haste so far
+        Grind(GrindGoal(max_steps=200)),
+
+        # Rohane: 13 stun, 13 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MELEE_HASTE.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.MELEE_DEFENSE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.SHOCKWAVE.value, 2),
+
+        # Fights Kolvars
+        FollowPath("6"),
+
+        # Walk to underneath the town
+        FollowPath("666666666222268"),
+    ],
+)
+
+
+ACT2_SCUZZY = Section(
+    "complete_act2_scuzzy",
+    act=2,
+    steps=[
+        # Walk all the way to beneath camp
+        FollowPath("222822222888888888888444444444444444447444844444444888447774777747777711114"),
+        # Go rest at camp site to be safe
+        FollowPath("57774"),
+        TalkTo(NpcHandler.ALLDEN_INTERACTION_LINKS),
+        FollowPath("33555111555"),
+
+        # Grind a LOT to be safe and get ready for Act 3
+        Grind(GrindGoal(max_steps=250), "555"),
+
+        # Rohane: 13 stun, 13 haste, 3 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 3),
+        # Mipsy: 13 direct damage, 13 melee defense, 3 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.GROUP_HASTE.value, 3),
+        # Talinia: 13 ranged attacks, 13 shockwave, 3 melee haste
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 3),
+
+        # Finally walk to Scuzzy
+        FollowPath("7"),
+        FollowPath(
+            "353355553333355115355355117155553333533333333553662222266355111282844444711111115115333351"
+            "7447441111355555222666222888266665555555333333666666335555555355551111117171155333333333333333"
+        ),
+
+        FollowPath("633363333636663622666228888444444444477"),
+
+        # Beat Scuzzy, but player is responsible for navigating back to the overworld
+        FollowPath("77"),
+    ],
+)
+
+
+ACT3_SILICLAST = Section(
+    "complete_act3_siliclast",
+    act=3,
+    steps=[
+        # Get out of the palace
+        FollowPath("333555333333333"),
+
+        # Walk to equipment shop and buy welfare upgrades
+        FollowPath("3364"),
+        TalkTo(NpcHandler.SABALIZ_INTERACTION_LINKS),
+
+        # Return to next starting position
+        FollowPath("337444"),
+
+        # Equip the new equipment
+        Equip(InventoryHandler.IRON_LONGSWORD_ID, InventoryHandler.AllyId.ROHANE.value),
+        Equip(InventoryHandler.STEEL_SPLINT_MAIL_ID, InventoryHandler.AllyId.ROHANE.value),
+
+        Equip(InventoryHandler.ACOLYTE_ROBE_ID, InventoryHandler.AllyId.MIPSY.value),
+
+        Equip(InventoryHandler.ASH_SHORT_BOW_ID, InventoryHandler.AllyId.TALINIA.value),
+        Equip(InventoryHandler.REINFORCED_LEATHER_TUNIC_ID, InventoryHandler.AllyId.TALINIA.value),
+
+        # Begin walking to Siliclast
+        FollowPath("111777777"),
+        # Grind in the desert for a bit to make sure we aren't underleveled
+        Grind(GrindGoal(max_steps=100)),
+        # Invest skillpoints if we have them
+
+        # Rohane: 13 stun, 13 haste, 5 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 5 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.GROUP_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 5 melee haste
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 2),
+
+        # Continue walking to Siliclast
+        FollowPath("4444444444"),
+        # Walk from entrance all the way to Siliclast
+        FollowPath("1111111155335111533333333333333551118226222222844477777777777744444"),
+        # Train for a bit to make sure we aren't underleveled because enemies can be quite dangerous
+        Grind(GrindGoal(max_steps=150)),
+
+        # Rohane: 13 stun, 13 haste, 7 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 7 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.GROUP_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 7 melee haste,
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 2),
+        FollowPath("4444444888882222222222284826333333333351511111"),
+
+        # Finally, beat Siliclast and step into portal
+        FollowPath("5"),
+        FollowPath("111111"),
+
+        # MAY NEED TO WALK RIGHT TWO STEPS TO NEXT STARTING LOCATION
+        FollowPath("44"),
+    ],
+)
+
+
+ACT3_GEBARN = Section(
+    "complete_act3_gebarn",
+    act=3,
+    steps=[
+        # Walk out of palace again
+        FollowPath("333555333333333"),
+        #
+        # Walk to the temple
+        FollowPath("111111111111774747711115511555155"),
+        # Stop in middle to train a bit
+        FollowPath("511111111155551111533588822228448222263336263622844444444711174777111111111177744222226333"),
+        Grind(GrindGoal(max_steps=100)),
+
+        # Rohane: 13 stun, 13 haste, 8 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 1),
+        # Mipsy: 13 direct damage, 13 melee defense, 8 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 1),
+        # Talinia: 13 ranged attacks, 13 shockwave, 8 melee haste
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 1),
+
+        FollowPath("3335111115626822222222663335551117477715553344444448666688882222228"),
+
+        FollowPath("2222"),
+        FollowPath("44"),
+    ],
+)
+
+
+ACT3_REVENANT = Section(
+    "complete_act3_revenant",
+    act=3,
+    steps=[
+        # Walk from Gebarn portal exit to Velm
+        FollowPath("333555333333333"),
+        FollowPath("11111111117747477111155115551711151144884"),
+
+        # Velm: 13 single heal, 13 group shield, 8 haste
+        TalkTo(NpcHandler.VELM_INTERACTION_LINKS),
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.HEAL.value, 13),
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.GROUP_SHIELD.value, 13),
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.CASTING_HASTE.value, 8),
+
+        # Leave Waset Village
+        FollowPath("3555"),
+        FollowPath("3333555555555553333666666666666666666622226223355"),
+        # Small leadup to the actual temple entrance
+        FollowPath("53"),
+        FollowPath("555511155553335555111111753666371117748471777111111111111111111111111"),
+        # Fight the revenant
+        FollowPath("1"),
+
+        # NEED TO TALK TO THE PRINCESS BEFORE LEAVING!!!
+        FollowPath("17747"),
+        TalkTo(NpcHandler.LIFIRA_INTERACTION_LINKS),
+        # Walk one step below Lifira to next movement location
+        FollowPath("2"),
+        FollowPath("33333331544447777777777777777777111778848888888484444444744828477"),
+
+        # This actually overshoots by quite a bit, but it is okay. Just walk backwards a bit...
+        FollowPath("6633"),
+
+        # Now talk with Lifira again
+        FollowPath("744828477"),
+        TalkTo(NpcHandler.LIFIRA_PART2_INTERACTION_LINKS),
+        # Walk back out
+        FollowPath("663353552"),
+    ],
+)
+
+
+ACT3_COLTZAN = Section(
+    "complete_act3_coltzan",
+    act=3,
+    steps=[
+        FollowPath("33355555555555511111111111111115555555333333333333332"),
+        TalkTo(NpcHandler.BUKARU_INTERACTION_LINKS),
+        # DON'T FORGET TO PICK UP MEDALLION HERE
+        FollowPath("77777777777777774444444444"),
+        TalkTo(NpcHandler.MEDALLION_INTERACTION_LINKS),
+        Grind(GrindGoal(max_steps=100), "333"),
+
+        # Rohane: 13 stun, 13 haste, 9 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 1),
+        # Mipsy: 13 direct damage, 13 melee defense, 9 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.GROUP_HASTE.value, 1),
+        # Talinia: 13 ranged attacks, 13 shockwave, 9 melee haste
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 1),
+        # Velm: 13 single heal, 13 group shield, 9 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.CASTING_HASTE.value, 1),
+
+        # Walk from medallion location all the way to Coltzan
+        FollowPath("22888888888888888888822222222228888888888444488888888882222222266663333355533551111111111111111111111111111555533333551111153351"),
+        # Now fight Coltzan
+        FollowPath("1"),
+        # NOT SURE WE EVEN NEED TO TALK TO COLTZAN
+        TalkTo(NpcHandler.COLTZAN_INTERACTION_LINKS),
+        FollowPath("75"),
+        TalkTo(NpcHandler.MEDALLION_CENTREPIECE_INTERACTION_LINKS),
+        # Back to second medallion location?
+        FollowPath("2222848882222844884488822222222222222222222222262288884844444477771111111155555555555555511111111"),
+        # Need to grab the medallion still
+        TalkTo(NpcHandler.MEDALLION_GEMSTONE_INTERACTION_LINKS),
+    ],
+)
+
+
+ACT3_PYRAMID = Section(
+    "complete_act3_pyramid",
+    act=3,
+    steps=[
+        # Walk from the gemstone spot to pyramid
+        FollowPath("5515555333333335533666666666666622222222222888444888882222226666666666666666662222"),
+        # DON'T FORGET TO GRIND A BIT INSIDE THE PYRAMID!
+        FollowPath("33333511111111153333333333663333333553333333333622222222288444488444"),
+        Grind(GrindGoal(max_steps=100)),
+
+        # Rohane: 13 stun, 13 haste, 11 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 11 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.GROUP_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 11 melee haste
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 2),
+        # Velm: 13 single heal, 13 group shield, 11 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.CASTING_HASTE.value, 2),
+
+        FollowPath("444774884488848244488444488226633366223333333333333333333333333333111111115577712228844444444715333335511111782888747111111"),
+
+        # Fight Anubits!
+        FollowPath("11"),
+    ],
+)
+
+
+ACT4_MEUKA = Section(
+    "complete_act4_meuka",
+    act=4,
+    steps=[
+        # Walk to starting tile
+        FollowPath("628"),
+
+        # Walk to Meuka
+        FollowPath("2628822222222822888844444477774777111111555111"),
+        FollowPath("1111111111444444444444444444488222488844444444444711535533336251533363335111174448444"),
+        Grind(GrindGoal(max_steps=100)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.DAMAGE_INCREASE.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MELEE_HASTE.value, 2),
+        # Velm: 13 single heal, 13 group shield, 13 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.CASTING_HASTE.value, 2),
+
+        # I think this actually fights Meuka for you lol
+        FollowPath("448444888771115333311333"),
+        # Walk to Von Roo for next script start location
+        FollowPath("55"),
+    ],
+)
+
+
+ACT4_SPIDER_GRUNDO = Section(
+    "complete_act4_spider_grundo",
+    act=4,
+    steps=[
+        # Walk to the cave
+        FollowPath("5755774444444844844444474488222222222228884444777778844444444828844447115174448888447772"),
+        # Grind in the middle
+        FollowPath("4444448888888884444477777777488888822222228828222822626663363335355177474711533633333333333"),
+        Grind(GrindGoal(max_steps=100)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 2 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 2 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 2 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            2,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 2 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 2),
+
+        FollowPath("3333333333333333333388888888844444488844444882"),
+        # Beat Spider Grundo and then walk up to him again
+        FollowPath("22"),
+    ],
+)
+
+
+ACT4_FAERIES = Section(
+    "complete_act4_faeries",
+    act=4,
+    steps=[
+        # Walk to Balthazar in the forest
+        FollowPath("63363333333333333633333622226662226662222222888226666663333333333335553"),
+        # Walk through the fun house and grind a lot to prep for faeries
+        FollowPath("5171111111111177747533"),
+        Grind(GrindGoal(max_steps=200)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 4 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 4 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 4 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            2,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 4 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 2),
+
+        # Walk all the way through the rest of the funhouse and talk to everyone
+        FollowPath("336633555117884444447777753366333553336222284862662844444717488847115117111111533663336263511174444411111"),
+        # NEED TO TALK TO THE BRAIN TREE!!!
+        TalkTo(NpcHandler.BRAIN_TREE_INTERACTION_LINKS),
+        # Now buy from Auger
+        FollowPath("33"),
+        TalkTo(NpcHandler.AUGUR_FAUNT_INTERACTION_LINKS),
+        FollowPath("633336622222222222222222882222226265"),
+        # Walk left to fight the faeries -> might be too risky on InSaNe
+        FollowPath("3"),
+    ],
+)
+
+
+ACT4_HUBRID_NOX = Section(
+    "complete_act4_hubrid_nox",
+    act=4,
+    steps=[
+        # Walk to Tower of Nox
+        FollowPath("55555555555555555533333333333333333336666666333555333666622288844747"),
+        # Enter and grind in the middle
+        FollowPath("111533351111784556222222228745562265111174475574444"),
+        Grind(GrindGoal(max_steps=60)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 5 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 1),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 5 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 1),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 5 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            1,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 5 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 1),
+
+        # Walk up all the stairs to Nox
+        FollowPath("4442226336663366447557753351114482222633628444444777115512263622226555111717748888226715333335"),
+
+        # Now fight Hubrid Nox
+        # Ends in position that we need for next script
+        FollowPath("5"),
+    ],
+)
+
+
+ACT4_ESOPHAGOR = Section(
+    "complete_act4_esophagor",
+    act=4,
+    steps=[
+        FollowPath("3518826666666628888884444444444488478848888448488884"),
+        FollowPath("44"),
+    ],
+)
+
+
+ACT5_FALLEN_ANGEL = Section(
+    "complete_act5_fallen_angel",
+    act=5,
+    steps=[
+        # Walk from starting location to Fallen Angel
+        FollowPath("2222228888288888844444888888822222228688"),
+        FollowPath("71"),
+        FollowPath("66622222626262622666222288228222266633662888888447744482"),
+        # Should be at the Fallen Angel I think
+        FollowPath("84"),
+
+        # Start off where we beat Fallen Angel
+        FollowPath("4444884888222668282622288882282222286633"),
+        Grind(GrindGoal(max_steps=100)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 7 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 3),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 7 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 3),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 7 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            3,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 7 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 3),
+
+        FollowPath("33662222228882662226222844444474884447774482274777444488884"),
+    ],
+)
+
+
+ACT5_DEVILPUSS = Section(
+    "complete_act5_devilpuss",
+    act=5,
+    steps=[
+        # Walk halfway through Devilpuss location and train
+        FollowPath("48888444471117711747153333333335111111111174444444444444444444444444444822266222226333"),
+        Grind(GrindGoal(max_steps=80)),
+        # Rohane: 13 stun, 13 haste, 13 damage, 10 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 3),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 10 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 3),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 10 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            3,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 10 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 3),
+
+        # Walk the rest of the location and fight
+        FollowPath("3336622226636362222663333622288444482222844444444444444444444444447111111115333351111111774444"),
+        FollowPath("4"),
+    ],
+)
+
+
+ACT5_FAERIE_THIEF = Section(
+    "complete_act5_faerie_thief",
+    act=5,
+    steps=[
+        # Walk to next town
+        FollowPath("4444477744447771555553535711777771144448"),
+        FollowPath("2263"),
+        # Don't really want to buy weapon upgrades here... but we can pick them up for Rohane and Talinia to be safe
+        TalkTo(NpcHandler.CAERELI_INTERACTION_LINKS),
+        FollowPath("477744822"),
+        # Whoops, this is just resting at the inn
+        TalkTo(NpcHandler.DELERI_INTERACTION_LINKS),
+        FollowPath("11536662222263"),
+        TalkTo(NpcHandler.MEKAVA_INTERACTION_LINKS),
+        FollowPath("477711111144444444444446"),
+
+        # Go to Faerie Thief location
+        # I think that surely you will get the Cybunny avatar from random encounters even on normal mode here
+        FollowPath("4477115555717177111151511117744488848884844747777771111111"),
+        TalkTo(NpcHandler.LUSINA_INTERACTION_LINKS),
+        FollowPath("711777774444447117444771111551111174482536263362228888866636224444"),
+        Grind(GrindGoal(max_steps=80)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 12 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 2),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 12 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 2),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 12 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            2,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 12 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 2),
+        FollowPath("4448226333333333353"),
+
+        # Walk one step to fight Faerie Thief first encounter
+        FollowPath("3"),
+        FollowPath("44844444444447115515357755555111744717484533622222882222223333362263333366633622263333333333"),
+        Grind(GrindGoal(max_steps=60)),
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 13 crit
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.CRIT.value, 1),
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 13 haste
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.CASTING_HASTE.value, 1),
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 13 damage
+        SpendSkillpoints(
+            SkillpointHandler.AllyType.TALINIA,
+            SkillpointHandler.TaliniaSkill.INCREASE_BOW_DAMAGE.value,
+            1,
+        ),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 13 defense
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.MELEE_DEFENSE.value, 1),
+        FollowPath("333333351115555117111744777111777748448222222447482666333362222217482222"),
+        FollowPath("6"),
+
+        FollowPath("7111153622111174444777156335711153356336622226663362262228888228444444444"),
+        Grind(GrindGoal(max_steps=80)),
+
+        # Use up all our remaining skill points here
+
+        # Rohane: 13 stun, 13 haste, 13 damage, 13 crit, 7 magic resist
+        SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, SkillpointHandler.RohaneSkill.MAGIC_RESIST.value, 7),
+
+        # Mipsy: 13 direct damage, 13 melee defense, 13 group haste, 13 haste, 7 damage shields
+        SpendSkillpoints(SkillpointHandler.AllyType.MIPSY, SkillpointHandler.MipsySkill.DAMAGE_SHIELDS.value, 7),
+
+        # Talinia: 13 ranged attacks, 13 shockwave, 13 melee haste, 13 damage, 7 magic resist
+        SpendSkillpoints(SkillpointHandler.AllyType.TALINIA, SkillpointHandler.TaliniaSkill.MAGIC_RESIST.value, 7),
+        # Velm: 13 single heal, 13 group shield, 13 haste, 13 defense, 7 celestial hammer
+        SpendSkillpoints(SkillpointHandler.AllyType.VELM, SkillpointHandler.VelmSkill.CELESTIAL_HAMMER.value, 7),
+        FollowPath("4444444851111111111535111111111111111111151171111177771"),
+
+        # Finally, fight the Faerie Thief last time
+        FollowPath("1"),
+        FollowPath("11111111"),
+    ],
+)
+
+
+ACT5_FINALE = Section(
+    "complete_act5_finale",
+    act=5,
+    steps=[
+        TalkTo(NpcHandler.STENVELA_INTERACTION_LINKS),
+        # Walk through the huge maze to the next floor and to the next NPC
+        FollowPath(
+            "44444447111177774471557444828711111533335555335111744444444447111111111153333333362222226333622222636636266263533368222284482222222"
+            "63366333333335551111111111744784471111533351774877111555336665111111782877711174444447448444488211"
+        ),
+        TalkTo(NpcHandler.VITRINI_INTERACTION_LINKS),
+        # Go to right pant devil
+        FollowPath("44444448882228444475335744444471115626335156222265351533688634477166632755744828487111178284471782226333333684486333355511153333333"),
+        # Go to left pant devil
+        FollowPath("333333333333666222633335744753333335111782844717822447174482266284335518884251771153362633315626335156222844444486336844447111777444444444444"),
+        # IMPORTANT: must assemble key!
+        TalkTo(NpcHandler.VITRINI_KEY_INTERACTION_LINKS),
+        FollowPath("44444448882228884444822222222226663333333333622222222228717444444444486334822636217884751533511533688226336211147"),
+        FollowPath("11"),
+        # Centre between pillars
+        FollowPath("4"),
+        # Now walk all the way over
+        FollowPath(
+            "1111111111111111117744444444447771111111111533335551115553333333333333333333666222666333362222222222888444444444482"
+            "222222222263515711571533362222666226535511111111144863622284444822228444444451111111551533622222222263336"
+        ),
+        # Rest with Lyra - no need to buy potions since we are maxed from before
+        TalkTo(NpcHandler.LYRA_INTERACTION_LINKS),
+        # One step before Terask II - leave to user to fight
+        FollowPath("511111111111528888888"),
+    ],
+)
+
+
+
+# In the order they are played
+SECTIONS = [
+    ACT1_INITIAL_TRAINING,
+    ACT2_MINER_FOREMAN,
+    ACT1_ZOMBOM,
+    ACT1_SAND_GRUNDO,
+    ACT1_RAMTOR1,
+    ACT1_RAMTOR2,
+    ACT2_LEXIMP_AND_WALK_CAVE,
+    ACT2_CAVES_OF_TERROR,
+    ACT2_KOLVARS_AND_GRIND,
+    ACT2_SCUZZY,
+    ACT3_SILICLAST,
+    ACT3_GEBARN,
+    ACT3_REVENANT,
+    ACT3_COLTZAN,
+    ACT3_PYRAMID,
+    ACT4_MEUKA,
+    ACT4_SPIDER_GRUNDO,
+    ACT4_FAERIES,
+    ACT4_HUBRID_NOX,
+    ACT4_ESOPHAGOR,
+    ACT5_FALLEN_ANGEL,
+    ACT5_DEVILPUSS,
+    ACT5_FAERIE_THIEF,
+    ACT5_FINALE,
+]
+SECTIONS_BY_NAME = {section.name: section for section in SECTIONS}
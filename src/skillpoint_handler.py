@@ -68,7 +68,7 @@ class SkillpointHandler(AutoplayerBaseHandler):
         Try to spend a skillpoint for a character on the overworld page.
         We do not always keep track of when player has leveled, so handle cases where it can fail.
         """
-        logger.info(f"Trying to invest a skillpoint for ally: {ally}")
+        logger.info("Trying to invest a skillpoint for ally: %s", ally)
         if ally is SkillpointHandler.AllyType.ROHANE:
             skillpoint_spend_url = self.ROHANE_SKILLPOINT_SPEND_TEMPLATE.format(skill_id)
         elif ally is SkillpointHandler.AllyType.MIPSY:
@@ -81,7 +81,7 @@ class SkillpointHandler(AutoplayerBaseHandler):
             logger.error("We did not receive a valid ally to spend a skillpoint for!")
             raise ValueError(f"Expected a valid ally name but got: {ally}")
 
-        logger.info(f"Trying to invest a skillpoint for skill_id: {skill_id}")
+        logger.info("Trying to invest a skillpoint for skill_id: %s", skill_id)
         self.overworld_page.go_to_url_and_wait_navigation(skillpoint_spend_url)
 
         logger.info("Returning to main game page after spending skillpoint...")
@@ -89,6 +89,6 @@ class SkillpointHandler(AutoplayerBaseHandler):
         return True
 
     def try_spend_multiple_skillpoints(self, ally: AllyType, skill_id: int, num_points: int) -> None:
-        logger.info(f"Attempting to spend {num_points} points for ally: {ally}")
+        logger.info("Attempting to spend %s points for ally: %s", num_points, ally)
         for i in range(num_points):
             self.try_spend_skillpoint(ally, skill_id)
@@ -0,0 +1,622 @@
+"""
+World atlas: a persistent tile graph stitched together from the overworld pages we see while playing.
+
+Every overworld page shows the tiles around the party, each tagged with its map coordinates in a coords(...) call
+(the same thing OverworldPage.get_map_coords compares to tell whether a move went through). MapSnapshot reads one
+page, and WorldAtlas merges snapshots and the moves between them into one grid per map:
+- passability: tiles we stood on are passable, a move that did not change our position marks its target blocked
+- zone transitions: a move that lands anywhere but the neighbouring tile (caves, stairs, portals)
+- NPC tiles: "Talk to ..." commands offered on the tile we stand on
+- the zone name ("You are in the village of Trestin") of every tile we stood on
+- how often a step onto each tile in normal mode started a fight, and how long fights took
+- a fingerprint of what every visited tile looks like, to recognise where the party is
+- where every section started and which tiles it walked, to tell which section a location belongs to
+
+The grids are plain arrays saved as raw bytes behind a small JSON header, so loading the atlas takes milliseconds.
+Assumptions about the markup: coords(x, y) or coords(map, x, y), with x growing east and y growing south. When
+there is no map number, everything shares one coordinate space.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import zipfile
+from array import array
+from typing import Dict, List, Tuple
+
+import click
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ATLAS_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "RequiredData", "Atlas", "world_atlas.bin")
+)
+
+# Movement digits used everywhere in the autoplayer -> (dx, dy)
+DIRECTION_OFFSETS: Dict[str, Tuple[int, int]] = {
+    "1": (0, -1),
+    "2": (0, 1),
+    "3": (-1, 0),
+    "4": (1, 0),
+    "5": (-1, -1),
+    "6": (-1, 1),
+    "7": (1, -1),
+    "8": (1, 1),
+}
+
+# Words in a tile image name that tell what kind of zone transition it is
+TRANSITION_KINDS = ["cave", "stair", "portal", "door", "ladder"]
+
+Position = Tuple[str, int, int]
+
+
+class MapSnapshot:
+    # Any tag carrying a coords(...) call, e.g. <img src="//images.neopets.com/nq2/t/grass.gif" ... coords(12,34)>
+    TILE_TAG_PATTERN = re.compile(r"<[^<>]*\bcoords\(([^)]*)\)[^<>]*>")
+    TILE_IMAGE_PATTERN = re.compile(r"""src=["'][^"']*/([\w.-]+?)\.(?:gif|png|jpg)["']""")
+    ZONE_PATTERN = re.compile(r"You are (?:in|at|on|inside) (?:<[^>]*>)*([^<.]+)")
+    NPC_PATTERN = re.compile(r"""act=talk&(?:amp;)?targ=(\d+)[^>]*>\s*Talk to ([^<]+?)\s*<""")
+    MOVE_URL_PATTERN = re.compile(r"act=move&(?:amp;)?dir=([1-8])")
+
+    def __init__(
+            self,
+            map_key: str,
+            tiles: Dict[Tuple[int, int], str],
+            zone: str | None = None,
+            npcs: Dict[int, str] | None = None,
+    ) -> None:
+        """
+        :param map_key: which map the coordinates belong to
+        :param tiles: (x, y) -> tile image name for every visible tile
+        :param zone: location text of the tile the party stands on
+        :param npcs: NPC id -> name for everyone we can talk to from here
+        """
+        self.map_key = map_key
+        self.tiles = tiles
+        self.zone = zone
+        self.npcs = npcs or {}
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        """
+        The party always stands in the middle of the visible tiles.
+        """
+        xs = sorted({x for x, _ in self.tiles})
+        ys = sorted({y for _, y in self.tiles})
+        return xs[len(xs) // 2], ys[len(ys) // 2]
+
+    def get_fingerprint(self) -> str:
+        """
+        Hash of what the party sees: the tile images around it, the location text and the NPCs. Coordinates are left
+        out, so a location is recognised even if they change.
+        """
+        center_x, center_y = self.position
+        layout = sorted((x - center_x, y - center_y, image) for (x, y), image in self.tiles.items())
+        fingerprint = json.dumps([layout, self.zone, sorted(self.npcs.values())])
+        return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def from_html(page_html: str) -> MapSnapshot | None:
+        """
+        Read the visible tiles off an overworld page.
+        :param page_html: raw HTML of the overworld page
+        :return: the snapshot, or None if the page has no map on it
+        """
+        tiles: Dict[Tuple[int, int], str] = {}
+        map_key = "0"
+        for tag_match in MapSnapshot.TILE_TAG_PATTERN.finditer(page_html):
+            numbers = [int(number) for number in re.findall(r"-?\d+", tag_match.group(1))]
+            if len(numbers) < 2:
+                continue
+            if len(numbers) >= 3:
+                map_key = str(numbers[-3])
+            image_match = MapSnapshot.TILE_IMAGE_PATTERN.search(tag_match.group(0))
+            tiles[(numbers[-2], numbers[-1])] = image_match.group(1) if image_match else ""
+        if not tiles:
+            return None
+
+        zone_match = MapSnapshot.ZONE_PATTERN.search(page_html)
+        npcs = {
+            int(npc_id): name.strip() for npc_id, name in MapSnapshot.NPC_PATTERN.findall(page_html)
+        }
+        return MapSnapshot(map_key, tiles, zone_match.group(1).strip() if zone_match else None, npcs)
+
+
+class AtlasMap:
+    """
+    One map's tiles as flat arrays over its bounding box, grown as new tiles show up.
+    """
+
+    VISITED = 1
+    BLOCKED = 2
+    NPC = 4
+    TRANSITION = 8
+
+    # Per-tile arrays and their typecodes, in the order they are saved
+    GRIDS = [("images", "H"), ("zones", "H"), ("flags", "B"), ("steps", "H"), ("encounters", "H")]
+    MAX_COUNT = 65535
+
+    def __init__(self, map_key: str, min_x: int = 0, min_y: int = 0, width: int = 0, height: int = 0) -> None:
+        self.map_key = map_key
+        self.min_x = min_x
+        self.min_y = min_y
+        self.width = width
+        self.height = height
+        # Indexes into WorldAtlas.images and WorldAtlas.zones, 0 means unknown
+        self.images = array("H", bytes(2 * width * height))
+        self.zones = array("H", bytes(2 * width * height))
+        self.flags = array("B", bytes(width * height))
+        # Steps onto the tile in normal mode, and how many of them started a fight
+        self.steps = array("H", bytes(2 * width * height))
+        self.encounters = array("H", bytes(2 * width * height))
+
+    def get_grids(self) -> List[array]:
+        return [getattr(self, name) for name, _ in AtlasMap.GRIDS]
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.min_x <= x < self.min_x + self.width and self.min_y <= y < self.min_y + self.height
+
+    def get_index(self, x: int, y: int) -> int:
+        return (y - self.min_y) * self.width + (x - self.min_x)
+
+    def ensure(self, x: int, y: int) -> None:
+        """
+        Grow the bounding box to include a tile, copying the known tiles over.
+        """
+        if self.contains(x, y):
+            return
+        if self.width == 0:
+            min_x, min_y, max_x, max_y = x, y, x, y
+        else:
+            min_x = min(self.min_x, x)
+            min_y = min(self.min_y, y)
+            max_x = max(self.min_x + self.width - 1, x)
+            max_y = max(self.min_y + self.height - 1, y)
+        grown = AtlasMap(self.map_key, min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
+        for row in range(self.height):
+            old_start = row * self.width
+            new_start = grown.get_index(self.min_x, self.min_y + row)
+            for grown_grid, grid in zip(grown.get_grids(), self.get_grids()):
+                grown_grid[new_start:new_start + self.width] = grid[old_start:old_start + self.width]
+        self.min_x, self.min_y, self.width, self.height = grown.min_x, grown.min_y, grown.width, grown.height
+        for name, _ in AtlasMap.GRIDS:
+            setattr(self, name, getattr(grown, name))
+
+    def get_flags(self, x: int, y: int) -> int:
+        return self.flags[self.get_index(x, y)] if self.contains(x, y) else 0
+
+    def set_flag(self, x: int, y: int, flag: int) -> None:
+        self.ensure(x, y)
+        self.flags[self.get_index(x, y)] |= flag
+
+    def clear_flag(self, x: int, y: int, flag: int) -> None:
+        if self.contains(x, y):
+            self.flags[self.get_index(x, y)] &= ~flag
+
+    def count_step(self, x: int, y: int, encountered: bool) -> None:
+        self.ensure(x, y)
+        index = self.get_index(x, y)
+        if self.steps[index] == AtlasMap.MAX_COUNT:
+            # Keep the rate and make room by halving both counts
+            self.steps[index] //= 2
+            self.encounters[index] //= 2
+        self.steps[index] += 1
+        if encountered:
+            self.encounters[index] += 1
+
+
+class WorldAtlas:
+    MAGIC = b"NQ2ATLAS1\n"
+
+    def __init__(self) -> None:
+        self.images: List[str] = [""]
+        self.zones: List[str] = [""]
+        self.maps: Dict[str, AtlasMap] = {}
+        # NPC id -> name and where we can talk to them
+        self.npcs: Dict[int, Dict[str, object]] = {}
+        # Every move that did not land on the neighbouring tile
+        self.transitions: List[Dict[str, object]] = []
+        # How long fights from random encounters took, for routes that avoid them
+        self.battles = 0
+        self.battle_seconds = 0.0
+        # Location fingerprint -> where we saw it, None if it showed up in more than one place
+        self.locations: Dict[str, Position | None] = {}
+        # Section name -> where it started, and the tiles it walked in order
+        self.section_starts: Dict[str, Position] = {}
+        self.section_tiles: Dict[str, List[Position]] = {}
+        self._image_ids = {name: index for index, name in enumerate(self.images)}
+        self._zone_ids = {name: index for index, name in enumerate(self.zones)}
+
+    def get_map(self, map_key: str) -> AtlasMap:
+        if map_key not in self.maps:
+            self.maps[map_key] = AtlasMap(map_key)
+        return self.maps[map_key]
+
+    def get_image_id(self, image: str) -> int:
+        if image not in self._image_ids:
+            self._image_ids[image] = len(self.images)
+            self.images.append(image)
+        return self._image_ids[image]
+
+    def get_zone_id(self, zone: str) -> int:
+        if zone not in self._zone_ids:
+            self._zone_ids[zone] = len(self.zones)
+            self.zones.append(zone)
+        return self._zone_ids[zone]
+
+    def add_snapshot(self, snapshot: MapSnapshot) -> Position:
+        """
+        Merge the tiles of one overworld page. The tile we stand on is passable by definition.
+        :param snapshot: tiles read from the page
+        :return: where the party stands
+        """
+        atlas_map = self.get_map(snapshot.map_key)
+        for (x, y), image in snapshot.tiles.items():
+            atlas_map.ensure(x, y)
+            if image:
+                atlas_map.images[atlas_map.get_index(x, y)] = self.get_image_id(image)
+
+        x, y = snapshot.position
+        atlas_map.set_flag(x, y, AtlasMap.VISITED)
+        atlas_map.clear_flag(x, y, AtlasMap.BLOCKED)
+        if snapshot.zone:
+            atlas_map.zones[atlas_map.get_index(x, y)] = self.get_zone_id(snapshot.zone)
+        for npc_id, name in snapshot.npcs.items():
+            atlas_map.set_flag(x, y, AtlasMap.NPC)
+            self.npcs[npc_id] = {"name": name, "map": snapshot.map_key, "x": x, "y": y}
+
+        position = (snapshot.map_key, x, y)
+        fingerprint = snapshot.get_fingerprint()
+        if self.locations.get(fingerprint, position) != position:
+            self.locations[fingerprint] = None
+        elif fingerprint not in self.locations:
+            self.locations[fingerprint] = position
+        return position
+
+    def locate(self, snapshot: MapSnapshot) -> Position | None:
+        """
+        Where the party is: the fingerprint index first, then the page's coordinates if the atlas has stood there.
+        :param snapshot: the current overworld page
+        :return: the position, None if the atlas has never been there
+        """
+        position = self.locations.get(snapshot.get_fingerprint())
+        if position is not None:
+            return position
+        x, y = snapshot.position
+        atlas_map = self.maps.get(snapshot.map_key)
+        if atlas_map is not None and atlas_map.get_flags(x, y) & AtlasMap.VISITED:
+            return snapshot.map_key, x, y
+        return None
+
+    def record_section_start(self, section_name: str, snapshot: MapSnapshot) -> None:
+        """
+        Remember where a section starts. Its walked tiles are recorded again from scratch.
+        """
+        position = self.add_snapshot(snapshot)
+        self.section_starts[section_name] = position
+        self.section_tiles[section_name] = [position]
+
+    def record_section_tile(self, section_name: str, snapshot: MapSnapshot) -> None:
+        if section_name not in self.section_tiles:
+            return
+        position = (snapshot.map_key, *snapshot.position)
+        if self.section_tiles[section_name][-1] != position:
+            self.section_tiles[section_name].append(position)
+
+    def get_sections_at(self, position: Position) -> Tuple[List[str], Dict[str, float]]:
+        """
+        :param position: where the party is
+        :return: sections that start here, and section -> how far through it (0 to 1) this tile was walked
+        """
+        starting_here = [name for name, start in self.section_starts.items() if start == position]
+        in_progress = {}
+        for name, tiles in self.section_tiles.items():
+            if name not in starting_here and position in tiles:
+                in_progress[name] = tiles.index(position) / max(len(tiles) - 1, 1)
+        return starting_here, in_progress
+
+    def record_move(
+            self, before: MapSnapshot, direction: str, after: MapSnapshot, count_encounters: bool = False
+    ) -> None:
+        """
+        Merge a move between two overworld pages: a wall if we did not move, a transition if we did not land next
+        door, and otherwise just two more passable tiles.
+        :param before: page before the move
+        :param direction: movement digit that was sent
+        :param after: page after the move
+        :param count_encounters: count the step towards the tile's encounter rate, only for normal mode
+        """
+        from_map, from_x, from_y = self.add_snapshot(before)
+        to_map, to_x, to_y = self.add_snapshot(after)
+        dx, dy = DIRECTION_OFFSETS[direction]
+        target_x, target_y = from_x + dx, from_y + dy
+
+        if (to_map, to_x, to_y) == (from_map, from_x, from_y):
+            atlas_map = self.get_map(from_map)
+            if not atlas_map.get_flags(target_x, target_y) & AtlasMap.VISITED:
+                atlas_map.set_flag(target_x, target_y, AtlasMap.BLOCKED)
+            return
+        if count_encounters:
+            self.get_map(from_map).count_step(target_x, target_y, encountered=False)
+        if (to_map, to_x, to_y) != (from_map, target_x, target_y):
+            self.get_map(from_map).set_flag(target_x, target_y, AtlasMap.TRANSITION)
+            transition = {
+                "map": from_map,
+                "x": target_x,
+                "y": target_y,
+                "direction": direction,
+                "to_map": to_map,
+                "to_x": to_x,
+                "to_y": to_y,
+                "kind": self.get_transition_kind(from_map, target_x, target_y),
+            }
+            if transition not in self.transitions:
+                self.transitions.append(transition)
+
+    def record_encounter(self, before: MapSnapshot, direction: str) -> None:
+        """
+        A step in normal mode that started a fight instead of showing the map.
+        :param before: page before the move
+        :param direction: movement digit that was sent
+        """
+        map_key, x, y = self.add_snapshot(before)
+        dx, dy = DIRECTION_OFFSETS[direction]
+        self.get_map(map_key).count_step(x + dx, y + dy, encountered=True)
+
+    def record_battle(self, seconds: float) -> None:
+        self.battles += 1
+        self.battle_seconds += seconds
+
+    def get_mean_battle_seconds(self) -> float | None:
+        return self.battle_seconds / self.battles if self.battles else None
+
+    def get_encounter_rate(self, map_key: str, x: int, y: int, prior_rate: float, prior_steps: float = 10) -> float:
+        """
+        Chance that a step onto the tile in normal mode starts a fight. Tiles we rarely walked lean on the prior.
+        :param map_key: map of the tile
+        :param x: x of the tile
+        :param y: y of the tile
+        :param prior_rate: rate to assume without any steps, e.g. the map's or the cost model's
+        :param prior_steps: how many steps the prior is worth
+        """
+        atlas_map = self.maps.get(map_key)
+        if atlas_map is None or not atlas_map.contains(x, y):
+            return prior_rate
+        index = atlas_map.get_index(x, y)
+        return (atlas_map.encounters[index] + prior_rate * prior_steps) / (atlas_map.steps[index] + prior_steps)
+
+    def get_map_encounter_rate(self, map_key: str) -> Tuple[int, int]:
+        """
+        :return: (encounters, steps) counted over the whole map
+        """
+        atlas_map = self.maps.get(map_key)
+        if atlas_map is None:
+            return 0, 0
+        return sum(atlas_map.encounters), sum(atlas_map.steps)
+
+    def get_transition_kind(self, map_key: str, x: int, y: int) -> str:
+        image = self.get_tile_image(map_key, x, y) or ""
+        for kind in TRANSITION_KINDS:
+            if kind in image.lower():
+                return kind
+        return "transition"
+
+    def get_tile_image(self, map_key: str, x: int, y: int) -> str | None:
+        atlas_map = self.maps.get(map_key)
+        if atlas_map is None or not atlas_map.contains(x, y):
+            return None
+        return self.images[atlas_map.images[atlas_map.get_index(x, y)]] or None
+
+    def get_zone(self, map_key: str, x: int, y: int) -> str | None:
+        atlas_map = self.maps.get(map_key)
+        if atlas_map is None or not atlas_map.contains(x, y):
+            return None
+        return self.zones[atlas_map.zones[atlas_map.get_index(x, y)]] or None
+
+    def get_passable_images(self) -> Tuple[set, set]:
+        """
+        What we learned per tile image: images of tiles we stood on are walkable, images only ever seen on blocked
+        tiles are not.
+        :return: (passable image ids, blocked image ids)
+        """
+        passable = set()
+        blocked = set()
+        for atlas_map in self.maps.values():
+            for image_id, flags in zip(atlas_map.images, atlas_map.flags):
+                if flags & AtlasMap.VISITED:
+                    passable.add(image_id)
+                elif flags & AtlasMap.BLOCKED:
+                    blocked.add(image_id)
+        passable.discard(0)
+        return passable, blocked - passable - {0}
+
+    def is_passable(self, map_key: str, x: int, y: int) -> bool | None:
+        """
+        :return: True or False if we know, None if we have never learned anything about the tile or its image
+        """
+        atlas_map = self.maps.get(map_key)
+        if atlas_map is None or not atlas_map.contains(x, y):
+            return None
+        flags = atlas_map.get_flags(x, y)
+        if flags & AtlasMap.VISITED:
+            return True
+        if flags & AtlasMap.BLOCKED:
+            return False
+        passable_images, blocked_images = self.get_passable_images()
+        image_id = atlas_map.images[atlas_map.get_index(x, y)]
+        if image_id in passable_images:
+            return True
+        if image_id in blocked_images:
+            return False
+        return None
+
+    def replay_page_history(self, entries: List[Tuple[str, str, bytes | None]]) -> int:
+        """
+        Rebuild moves from recorded pages and actions, e.g. a page history bundle.
+        :param entries: (kind, url, page body) in the order they happened, kind being "page" or "action"
+        :return: number of moves merged
+        """
+        num_moves = 0
+        last_snapshot = None
+        pending_direction = None
+        for kind, url, body in entries:
+            if kind == "action":
+                move_match = MapSnapshot.MOVE_URL_PATTERN.search(url)
+                pending_direction = move_match.group(1) if move_match else None
+                continue
+            snapshot = MapSnapshot.from_html(body.decode("utf-8", errors="replace")) if body else None
+            if snapshot is None:
+                # A battle or some other page, whatever move led here did not land on the map
+                last_snapshot = None
+                pending_direction = None
+                continue
+            if last_snapshot is not None and pending_direction is not None:
+                self.record_move(last_snapshot, pending_direction, snapshot)
+                num_moves += 1
+            else:
+                self.add_snapshot(snapshot)
+            last_snapshot = snapshot
+            pending_direction = None
+        return num_moves
+
+    def get_fingerprint(self) -> str:
+        """
+        Hash of everything the atlas knows, so anything computed from it (e.g. cached routes) can tell it is stale.
+        """
+        digest = hashlib.sha1(json.dumps(self.get_header(), sort_keys=True).encode("utf-8"))
+        for atlas_map in self.maps.values():
+            for grid in atlas_map.get_grids():
+                digest.update(WorldAtlas.to_little_endian(grid).tobytes())
+        return digest.hexdigest()
+
+    def get_header(self) -> Dict[str, object]:
+        return {
+            "images": self.images,
+            "zones": self.zones,
+            "npcs": {str(npc_id): npc for npc_id, npc in self.npcs.items()},
+            "transitions": self.transitions,
+            "battles": self.battles,
+            "battle_seconds": self.battle_seconds,
+            "locations": self.locations,
+            "section_starts": self.section_starts,
+            "section_tiles": self.section_tiles,
+            "grids": [name for name, _ in AtlasMap.GRIDS],
+            "maps": [
+                {
+                    "key": atlas_map.map_key,
+                    "min_x": atlas_map.min_x,
+                    "min_y": atlas_map.min_y,
+                    "width": atlas_map.width,
+                    "height": atlas_map.height,
+                }
+                for atlas_map in self.maps.values()
+            ],
+        }
+
+    def save(self, path: str = DEFAULT_ATLAS_PATH) -> None:
+        header_bytes = json.dumps(self.get_header()).encode("utf-8")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(WorldAtlas.MAGIC)
+            f.write(struct.pack("<I", len(header_bytes)))
+            f.write(header_bytes)
+            for atlas_map in self.maps.values():
+                for grid in atlas_map.get_grids():
+                    f.write(WorldAtlas.to_little_endian(grid).tobytes())
+
+    @staticmethod
+    def load(path: str = DEFAULT_ATLAS_PATH) -> WorldAtlas:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(WorldAtlas.MAGIC):
+            raise ValueError(f"{path} is not a world atlas file")
+        offset = len(WorldAtlas.MAGIC)
+        (header_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + header_length])
+        offset += header_length
+
+        atlas = WorldAtlas()
+        atlas.images = header["images"]
+        atlas.zones = header["zones"]
+        atlas.npcs = {int(npc_id): npc for npc_id, npc in header["npcs"].items()}
+        atlas.transitions = header["transitions"]
+        atlas.battles = header.get("battles", 0)
+        atlas.battle_seconds = header.get("battle_seconds", 0.0)
+        atlas.locations = {
+            fingerprint: tuple(position) if position else None
+            for fingerprint, position in header.get("locations", {}).items()
+        }
+        atlas.section_starts = {name: tuple(start) for name, start in header.get("section_starts", {}).items()}
+        atlas.section_tiles = {
+            name: [tuple(tile) for tile in tiles] for name, tiles in header.get("section_tiles", {}).items()
+        }
+        # Atlases saved before the encounter counts only have the first three grids, the rest stay zeroed
+        grid_names = header.get("grids", ["images", "zones", "flags"])
+        typecodes = dict(AtlasMap.GRIDS)
+        atlas._image_ids = {name: index for index, name in enumerate(atlas.images)}
+        atlas._zone_ids = {name: index for index, name in enumerate(atlas.zones)}
+        for map_header in header["maps"]:
+            atlas_map = AtlasMap(
+                map_header["key"], map_header["min_x"], map_header["min_y"], map_header["width"], map_header["height"]
+            )
+            num_tiles = atlas_map.width * atlas_map.height
+            for name in grid_names:
+                grid = array(typecodes[name])
+                grid.frombytes(data[offset:offset + num_tiles * grid.itemsize])
+                offset += num_tiles * grid.itemsize
+                setattr(atlas_map, name, WorldAtlas.to_little_endian(grid))
+            atlas.maps[atlas_map.map_key] = atlas_map
+        return atlas
+
+    @staticmethod
+    def load_or_create(path: str = DEFAULT_ATLAS_PATH) -> WorldAtlas:
+        return WorldAtlas.load(path) if os.path.exists(path) else WorldAtlas()
+
+    @staticmethod
+    def to_little_endian(grid: array) -> array:
+        # Byte swapping is its own inverse, so this works for both saving and loading
+        if sys.byteorder == "big" and grid.itemsize > 1:
+            grid = array(grid.typecode, grid)
+            grid.byteswap()
+        return grid
+
+
+def read_page_history_bundle(bundle_path: str) -> List[Tuple[str, str, bytes | None]]:
+    """
+    Read a page history bundle back into (kind, url, page body) entries.
+    :param bundle_path: zip written by PageHistory.dump
+    """
+    with zipfile.ZipFile(bundle_path) as bundle:
+        manifest = json.loads(bundle.read("manifest.json"))
+        return [
+            (entry["kind"], entry["url"], bundle.read(entry["file"]) if "file" in entry else None)
+            for entry in manifest["entries"]
+        ]
+
+
+@click.command()
+@click.argument("bundle_paths", nargs=-1, type=click.Path(exists=True, dir_okay=False))
+@click.option("--atlas", "atlas_path", default=DEFAULT_ATLAS_PATH, type=click.Path(dir_okay=False),
+              help="Atlas file to add to, created if it does not exist")
+def main(bundle_paths: Tuple[str, ...], atlas_path: str) -> None:
+    """
+    Add the moves recorded in page history bundles to the world atlas.
+    """
+    atlas = WorldAtlas.load_or_create(atlas_path)
+    for bundle_path in bundle_paths:
+        num_moves = atlas.replay_page_history(read_page_history_bundle(bundle_path))
+        click.echo(f"{bundle_path}: {num_moves} moves")
+    atlas.save(atlas_path)
+    num_tiles = sum(atlas_map.width * atlas_map.height for atlas_map in atlas.maps.values())
+    click.echo(f"Atlas has {len(atlas.maps)} maps, {num_tiles} tiles, {len(atlas.transitions)} transitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from src.Constants.url_navigation_constants import NEOQUEST_BATTLE_FINISH_URL
+from src.Pages.neopets_page import NeopetsPage
+from src.battle_handler import BattleHandler
+from src.battle_state import BattleState
+from tests.test_game_actions import FLED_RESULT_HTML
+from tests.test_neopets_page import FakePage
+from tests.test_page_parser import OVERWORLD_HTML, SPECIAL_END_HTML
+
+
+def battle_state(nxactor, messages):
+    return BattleState(nxactor, "PLAYER", {"Rohane": [100, 100]}, [[30, 30]], {}, messages)
+
+
+class FakeBattlePage:
+    def __init__(self, state):
+        self.state = state
+        self.state_after_action = None
+        self.state_after_game_page = None
+        self.sent_urls = []
+        self.dump_reasons = []
+
+    def get_battle_state(self):
+        return self.state
+
+    def go_to_game_page(self, timeout_ms=30000):
+        if self.state_after_game_page:
+            self.state = self.state_after_game_page
+
+    def dump_page_history(self, reason):
+        self.dump_reasons.append(reason)
+
+    def go_to_url_and_wait_navigation(self, url, is_already_done=None, retry_policy=None):
+        self.sent_urls.append(url)
+        if self.state_after_action:
+            self.state = self.state_after_action
+
+
+def make_battle_handler(state):
+    battle_handler = BattleHandler(None, in_battle=False)
+    battle_handler.battle_page = FakeBattlePage(state)
+    return battle_handler
+
+
+def test_turn_identity_follows_actor_and_log():
+    first = battle_state(1, ["The fight begins!"])
+    assert first.get_turn() == battle_state(1, ["The fight begins!"]).get_turn()
+    assert first.get_turn() != battle_state(5, ["The fight begins!"]).get_turn()
+    assert first.get_turn() != battle_state(1, ["The fight begins!", "Rohane attacks!"]).get_turn()
+
+
+def test_action_is_sent_once_per_turn():
+    battle_handler = make_battle_handler(battle_state(1, ["The fight begins!"]))
+    battle_page = battle_handler.battle_page
+    assert battle_handler.submit_turn("attack", 1)
+
+    # Something made us try again on the same turn, but the game has already moved on
+    battle_page.state_after_game_page = battle_state(5, ["The fight begins!", "Rohane attacks!"])
+    assert not battle_handler.submit_turn("attack", 1)
+    assert battle_page.sent_urls == ["attack"]
+    assert battle_page.dump_reasons == ["battle turn desync"]
+
+
+def test_action_is_resent_if_the_turn_did_not_advance():
+    battle_handler = make_battle_handler(battle_state(1, ["The fight begins!"]))
+    assert battle_handler.submit_turn("attack", 1)
+    assert battle_handler.submit_turn("attack", 1)
+    assert battle_handler.battle_page.sent_urls == ["attack", "attack"]
+
+
+def test_action_for_another_actor_is_refused():
+    battle_handler = make_battle_handler(battle_state(5, ["The fight begins!"]))
+    assert not battle_handler.submit_turn("attack", 1)
+    assert battle_handler.battle_page.sent_urls == []
+    assert battle_handler.battle_page.dump_reasons == ["battle actor desync"]
+
+
+def test_failed_visit_checks_turn_before_resending():
+    battle_handler = make_battle_handler(battle_state(1, ["The fight begins!"]))
+    turn = battle_handler.battle_page.get_battle_state().get_turn()
+    assert not battle_handler.has_turn_advanced(turn)
+    battle_handler.battle_page.state = battle_state(2, ["The fight begins!", "Rohane attacks!"])
+    assert battle_handler.has_turn_advanced(turn)
+
+
+class FinishingFakePage(FakePage):
+    """Serves the given pages in order, one per visit to the battle finish URL."""
+
+    def __init__(self, html, finish_pages):
+        super().__init__(html)
+        self.finish_pages = list(finish_pages)
+
+    def goto(self, url, timeout=None):
+        if url == NEOQUEST_BATTLE_FINISH_URL:
+            self.pages_by_url[url] = self.finish_pages.pop(0)
+        super().goto(url, timeout)
+
+    def locator(self, selector):
+        return selector
+
+
+def test_boss_flee_ends_through_a_result_page_that_still_shows_the_flee_text():
+    fake_page = FinishingFakePage(SPECIAL_END_HTML, [FLED_RESULT_HTML, OVERWORLD_HTML])
+    battle_handler = BattleHandler(None, in_battle=False)
+    battle_handler.battle_page = NeopetsPage(fake_page)
+    battle_handler.end_battle()
+    assert battle_handler.total_experience_gained == 25
+    assert fake_page.finish_pages == []
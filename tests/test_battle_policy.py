@@ -0,0 +1,135 @@
+from src.battle_handler import BattleHandler
+from src.battle_policy import (
+    BattleAction,
+    DefaultBattlePolicy,
+    KillSpeedBattlePolicy,
+)
+from src.battle_state import BattleState
+from src.skillpoint_handler import SkillpointHandler
+
+HASTE = SkillpointHandler.MipsySkill.GROUP_HASTE.value
+DIRECT_DAMAGE = SkillpointHandler.MipsySkill.DIRECT_DAMAGE.value
+SHIELD = SkillpointHandler.VelmSkill.GROUP_SHIELD.value
+HEAL = SkillpointHandler.VelmSkill.HEAL.value
+
+
+def battle_state(allies=None, enemies=None, potions=None, skills=None, buffs=None):
+    return BattleState(
+        nxactor=1,
+        turn_type="PLAYER",
+        allies=allies or {"Rohane": [100, 100], "Mipsy": [60, 60], "Talinia": [80, 80], "Velm": [90, 90]},
+        enemies=[[50, 50]] if enemies is None else enemies,
+        potions={} if potions is None else potions,
+        messages=[],
+        skills=skills,
+        buffs=buffs,
+    )
+
+
+def take_turn(policy, ally_name, state):
+    action = policy.choose_action(ally_name, state)
+    policy.record_action(ally_name, action)
+    return action
+
+
+def test_default_policy_drinks_potion_when_low():
+    state = battle_state(allies={"Rohane": [40, 100]}, potions={30013: 2})
+    assert DefaultBattlePolicy().choose_action("Rohane", state) == BattleAction.potion(30013)
+
+
+def test_default_policy_attacks_without_potions():
+    state = battle_state(allies={"Rohane": [40, 100]})
+    assert DefaultBattlePolicy().choose_action("Rohane", state) == BattleAction.attack(5)
+
+
+def test_default_policy_recasts_haste_every_four_turns():
+    policy = DefaultBattlePolicy()
+    state = battle_state()
+    cast_skills = [take_turn(policy, "Mipsy", state).skill_id for _ in range(6)]
+    assert cast_skills == [HASTE, DIRECT_DAMAGE, DIRECT_DAMAGE, DIRECT_DAMAGE, DIRECT_DAMAGE, HASTE]
+
+    policy.reset()
+    assert policy.choose_action("Mipsy", state).skill_id == HASTE
+
+
+def test_default_policy_velm_heals_lowest_ratio_ally():
+    policy = DefaultBattlePolicy()
+    state = battle_state(
+        allies={"Rohane": [90, 100], "Mipsy": [40, 60], "Talinia": [60, 80], "Velm": [90, 90]}
+    )
+    assert take_turn(policy, "Velm", state).skill_id == SHIELD
+    assert policy.choose_action("Velm", state) == BattleAction.skill(HEAL, target=2)
+
+
+def test_haste_is_only_refreshed_when_about_to_expire():
+    policy = DefaultBattlePolicy()
+    party = ["Rohane", "Mipsy", "Talinia", "Velm"]
+    take_turn(policy, "Mipsy", battle_state())
+    # Way past the old 4 turn counter, but the page says haste still has plenty of rounds left
+    for _ in range(6):
+        state = battle_state(buffs={name: {"Haste": 3} for name in party})
+        assert take_turn(policy, "Mipsy", state).skill_id == DIRECT_DAMAGE
+
+    expiring = battle_state(buffs={name: {"Haste": 3 if name != "Talinia" else 1} for name in party})
+    assert policy.choose_action("Mipsy", expiring).skill_id == HASTE
+    worn_off = battle_state(buffs={"Velm": {"Shield": 3}})
+    assert policy.choose_action("Mipsy", worn_off).skill_id == HASTE
+
+
+def test_missing_buff_falls_back_and_is_recorded():
+    policy = DefaultBattlePolicy()
+    assert policy.choose_action("Mipsy", battle_state(skills=[DIRECT_DAMAGE])) == (
+        BattleAction.skill(DIRECT_DAMAGE, target=5)
+    )
+    assert policy.pop_avoided_casts() == [("Mipsy", HASTE)]
+    assert policy.pop_avoided_casts() == []
+
+
+def test_known_skills_are_kept_for_the_battle():
+    policy = DefaultBattlePolicy()
+    policy.choose_action("Velm", battle_state(skills=[HEAL]))
+    # Later pages of the same battle may not show the menu, the skills seen earlier still apply
+    assert policy.choose_action("Velm", battle_state()).skill_id == HEAL
+
+    policy.reset()
+    assert policy.choose_action("Velm", battle_state()).skill_id == SHIELD
+
+
+def test_ally_without_any_skills_attacks():
+    policy = DefaultBattlePolicy()
+    assert policy.choose_action("Velm", battle_state(skills=[9999])) == BattleAction.attack(5)
+    assert policy.pop_avoided_casts() == [("Velm", SHIELD), ("Velm", HEAL)]
+
+
+def test_invalid_target_moves_to_next_enemy():
+    policy = DefaultBattlePolicy()
+    assert policy.on_invalid_target(BattleAction.attack(5)) == 6
+    assert policy.choose_action("Talinia", battle_state()) == BattleAction.attack(6)
+
+
+def test_kill_speed_policy_focuses_weakest_enemy():
+    state = battle_state(enemies=[[0, 50], [40, 50], [10, 50]])
+    assert KillSpeedBattlePolicy().choose_action("Rohane", state) == BattleAction.attack(7)
+
+
+def test_kill_speed_policy_skips_buffs_in_short_fights():
+    policy = KillSpeedBattlePolicy()
+    assert policy.choose_action("Mipsy", battle_state(enemies=[[30, 50]])).skill_id == DIRECT_DAMAGE
+    assert policy.choose_action("Mipsy", battle_state(enemies=[[300, 300]])).skill_id == HASTE
+
+
+def test_kill_speed_policy_velm_attacks_when_nobody_is_hurt():
+    state = battle_state(enemies=[[30, 50]])
+    assert KillSpeedBattlePolicy().choose_action("Velm", state) == BattleAction.attack(5)
+
+
+def test_action_urls():
+    assert BattleHandler.get_action_url(2, BattleAction.skill(HASTE)) == (
+        BattleHandler.PLAYER_UNTARGETED_SPELLCAST_URL_TEMPLATE.format(HASTE, 2)
+    )
+    assert BattleHandler.get_action_url(4, BattleAction.skill(HEAL, target=1)) == (
+        BattleHandler.PLAYER_TARGETED_SPELLCAST_URL_TEMPLATE.format(1, HEAL, 4)
+    )
+    assert BattleHandler.get_action_url(1, BattleAction.potion(30011)) == (
+        BattleHandler.PLAYER_HEAL_URL_TEMPLATE.format(30011, 1)
+    )
@@ -0,0 +1,65 @@
+import os
+
+from src.Pages.battle_page import BattlePage
+from src.battle_state import BattleState
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_battle_state(fixture_name: str) -> BattleState:
+    with open(os.path.join(FIXTURES_DIR, fixture_name), "r") as f:
+        return BattleState.from_html(f.read(), BattlePage.POTION_NAMES)
+
+
+def test_player_turn_fixture():
+    battle_state = load_battle_state("battle_page_player_turn.html")
+    assert battle_state.nxactor == 1
+    assert battle_state.turn_type == "PLAYER"
+    assert battle_state.get_character_hp_vals() == {
+        "Rohane": {"current_hp": 48, "max_hp": 100},
+        "Mipsy": {"current_hp": 58, "max_hp": 58},
+    }
+    assert battle_state.enemies == [[20, 40], [35, 35]]
+    # The Healing Potion was just used, so it is left out even though its name is on the page
+    assert battle_state.potions == {30011: 3, 30012: 1}
+    assert battle_state.skills == [9104]
+    assert battle_state.buffs == {"Mipsy": {"Haste": 2}}
+
+
+def test_enemy_turn_fixture():
+    battle_state = load_battle_state("battle_page_enemy_turn.html")
+    assert battle_state.nxactor == 5
+    assert battle_state.turn_type == "ENEMY"
+    assert list(battle_state.allies) == ["Rohane", "Mipsy"]
+    assert battle_state.has_text(BattlePage.ALREADY_DEFEATED_TARGET_TEXT)
+    assert battle_state.potions == {}
+    assert battle_state.skills == []
+
+
+def test_from_json_matches_extractor_output_shape():
+    battle_state = BattleState.from_json(
+        {
+            "nxactor": 2,
+            "turn_type": "PLAYER",
+            "allies": {"Mipsy": [10, 58]},
+            "enemies": [[5, 40]],
+            "potions": {"30013": 2},
+            "messages": ["Mipsy casts   a spell!"],
+        }
+    )
+    assert battle_state.potions == {30013: 2}
+    assert battle_state.get_character_hp_vals()["Mipsy"] == {"current_hp": 10, "max_hp": 58}
+    assert battle_state.has_text("casts a spell")
+
+
+def test_battle_log_lines_split_like_inner_text():
+    html = (
+        '<div class="contentModule phpGamesNonPortalView"><div><b>Plains Lupe</b>\n<b>Beetle</b></div>'
+        "<div>Rohane attacks the Lupe for <b>12</b> damage!<br>The Lupe bites\nRohane for 3 damage!<br></div></div>"
+    )
+    # What the extractor gets from innerText.split("\n") after trimming and dropping empty lines
+    assert BattleState.from_html(html, {}).messages == [
+        "Plains Lupe Beetle",
+        "Rohane attacks the Lupe for 12 damage!",
+        "The Lupe bites Rohane for 3 damage!",
+    ]
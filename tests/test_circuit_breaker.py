@@ -0,0 +1,52 @@
+from src.circuit_breaker import LatencyCircuitBreaker
+from tests.test_request_pacer import FakeClock
+
+
+def make_breaker(clock):
+    return LatencyCircuitBreaker(
+        window_size=10, min_samples=5, p95_threshold_ms=5000, error_rate_threshold=0.3,
+        recovery_latency_ms=2000, recovery_probes=2, probe_interval_seconds=60, clock=clock, sleep=clock.sleep,
+    )
+
+
+def test_breaker_opens_on_slow_loads_or_errors():
+    breaker = make_breaker(FakeClock())
+    for _ in range(4):
+        breaker.record_success(20000)
+    # Not enough samples to judge yet
+    assert not breaker.is_open()
+    for _ in range(6):
+        breaker.record_success(800)
+    assert breaker.get_percentile_ms(0.5) == 800
+    assert breaker.is_open()
+
+    breaker = make_breaker(FakeClock())
+    for _ in range(6):
+        breaker.record_success(800)
+    assert not breaker.is_open()
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.get_error_rate() == 0.4
+    assert breaker.is_open()
+    breaker.enabled = False
+    assert not breaker.is_open()
+
+
+def test_paused_until_probes_recover():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    assert breaker.wait_if_open(lambda: 100) == 0.0
+
+    for _ in range(10):
+        breaker.record_failure()
+    probe_results = iter([None, 9000, 1500, 8000, 1200, 900])
+    assert breaker.wait_if_open(lambda: next(probe_results)) == 6 * 60
+    assert list(probe_results) == []
+    assert not breaker.is_open()
+    assert breaker.times_opened == 1
+
+    # Maintenance does not wait for the window to fill up
+    breaker.trip("maintenance page")
+    assert breaker.is_open()
+    assert breaker.wait_if_open(lambda: 500) == 2 * 60
+    assert not breaker.is_open()
@@ -0,0 +1,84 @@
+import random
+
+from src.battle_policy import BattleAction, DefaultBattlePolicy
+from src.combat_simulator import CombatModel, run_simulation, simulate_battle, simulate_battles
+from src.skillpoint_handler import SkillpointHandler
+from tests.test_battle_state import load_battle_state
+
+
+def recorded_battle_states():
+    fresh_fight = {
+        "nxactor": 1,
+        "turn_type": "PLAYER",
+        "allies": {"Rohane": [100, 100], "Mipsy": [58, 58]},
+        "enemies": [[40, 40], [35, 35]],
+        "potions": {30011: 3},
+        "messages": ["Mipsy casts Fireball at the Plains Lupe for 20 damage!"],
+    }
+    return [fresh_fight, load_battle_state("battle_page_player_turn.html").to_json()]
+
+
+def easy_model():
+    return CombatModel(
+        ally_max_hp={"Rohane": 100, "Mipsy": 60},
+        ally_damage={"Rohane": (20.0, 2.0), "Mipsy": (15.0, 2.0)},
+        enemy_groups=[[30, 30]],
+        enemy_damage=(3.0, 1.0),
+        heal_amount=30.0,
+        potions={30011: 5},
+    )
+
+
+def test_fit_from_recorded_states():
+    model = CombatModel.fit(recorded_battle_states())
+    assert model.ally_max_hp == {"Rohane": 100, "Mipsy": 58}
+    assert model.ally_damage["Mipsy"] == (20.0, 0.0)
+    assert model.enemy_groups == [[40, 35]]
+    assert model.enemy_damage == (12.0, 0.0)
+    assert model.potions == {30011: 3, 30012: 1}
+
+
+def test_simulated_battle_ends_in_a_win():
+    report = simulate_battle(easy_model(), DefaultBattlePolicy(), random.Random(1))
+    assert report.num_battles == 1
+    assert report.num_turns > 0
+    assert report.num_deaths == 0
+
+
+def test_batches_are_repeatable():
+    first = simulate_battles(easy_model(), "kill_speed", 50, seed=3)
+    second = simulate_battles(easy_model(), "kill_speed", 50, seed=3)
+    assert vars(first) == vars(second)
+
+
+def test_run_simulation_over_process_pool():
+    report = run_simulation(easy_model(), "default", 30, num_workers=2, batch_size=10)
+    assert report.num_battles == 30
+    assert report.death_rate == 0.0
+
+
+class AlwaysHealRohanePolicy(DefaultBattlePolicy):
+    def __init__(self) -> None:
+        super().__init__()
+        self.rohane_hp_seen = []
+
+    def choose_action(self, ally_name, battle_state):
+        if ally_name == "Velm":
+            self.rohane_hp_seen.append(battle_state.allies["Rohane"][0])
+            return BattleAction.skill(SkillpointHandler.VelmSkill.HEAL.value, target=1)
+        return super().choose_action(ally_name, battle_state)
+
+
+def test_heals_do_not_revive_defeated_allies():
+    model = CombatModel(
+        ally_max_hp={"Rohane": 10, "Velm": 1000},
+        ally_damage={"Rohane": (1.0, 0.0), "Velm": (1.0, 0.0)},
+        enemy_groups=[[10000]],
+        enemy_damage=(20.0, 0.0),
+        heal_amount=30.0,
+        potions={},
+    )
+    policy = AlwaysHealRohanePolicy()
+    simulate_battle(model, policy, random.Random(1))
+    first_defeat = policy.rohane_hp_seen.index(0)
+    assert all(hp == 0 for hp in policy.rohane_hp_seen[first_defeat:])
@@ -0,0 +1,62 @@
+import pytest
+
+from src.Constants.url_navigation_constants import NEOQUEST_BATTLE_FINISH_URL, NEOQUEST_BATTLE_START_URL
+from src.Pages.neopets_page import NeopetsPage
+from src.game_actions import (
+    EndBattle,
+    GameActionError,
+    LeaveSpecialBattleEnd,
+    ReturnToMap,
+    StartBattle,
+    SwitchMovementMode,
+    perform,
+)
+from src.page_types import PageType
+from tests.test_neopets_page import FakePage
+from tests.test_page_parser import (
+    BATTLE_HTML,
+    BATTLE_RESULT_HTML,
+    BATTLE_START_HTML,
+    OVERWORLD_HTML,
+    SPECIAL_END_HTML,
+)
+
+# The real result page after a boss flees can still show the flee text
+FLED_RESULT_HTML = SPECIAL_END_HTML + "<p>You gain <b>25</b> experience points</p>"
+
+
+def test_actions_are_prebuilt_urls():
+    assert StartBattle().get_url() == NEOQUEST_BATTLE_START_URL
+    assert EndBattle(5).get_url().endswith("fact=2&parm=&use_id=-1&nxactor=5")
+    assert SwitchMovementMode(2).get_url().endswith("act=travel&mode=2")
+    assert PageType.GAME_NPC_TALK in ReturnToMap.LANDS_ON
+    for page_type in [PageType.GAME_BATTLE_RESULT, PageType.ERROR, PageType.UNRECOGNIZED, PageType.RATE_LIMITED,
+                      PageType.TRADITIONAL_LOGIN]:
+        assert page_type not in ReturnToMap.LANDS_ON
+
+
+def test_perform_checks_where_the_action_landed():
+    fake_page = FakePage(BATTLE_START_HTML)
+    page = NeopetsPage(fake_page)
+    fake_page.pages_by_url[NEOQUEST_BATTLE_START_URL] = BATTLE_HTML
+    fake_page.pages_by_url[NEOQUEST_BATTLE_FINISH_URL] = BATTLE_RESULT_HTML
+
+    assert perform(page, StartBattle()) == PageType.GAME_BATTLE
+    assert fake_page.url == NEOQUEST_BATTLE_START_URL
+
+    with pytest.raises(GameActionError, match="GAME_BATTLE_RESULT"):
+        perform(page, ReturnToMap())
+    fake_page.pages_by_url[NEOQUEST_BATTLE_FINISH_URL] = OVERWORLD_HTML
+    assert perform(page, ReturnToMap()) == PageType.GAME_OVERWORLD
+
+
+def test_leaving_a_special_end_accepts_a_result_page_still_showing_the_flee_text():
+    fake_page = FakePage(SPECIAL_END_HTML)
+    page = NeopetsPage(fake_page)
+    fake_page.pages_by_url[NEOQUEST_BATTLE_FINISH_URL] = FLED_RESULT_HTML
+    assert perform(page, LeaveSpecialBattleEnd()) == PageType.GAME_BATTLE_SPECIAL_END
+
+    fake_page.navigate(SPECIAL_END_HTML)
+    fake_page.pages_by_url[NEOQUEST_BATTLE_FINISH_URL] = OVERWORLD_HTML
+    with pytest.raises(GameActionError, match="GAME_OVERWORLD"):
+        perform(page, LeaveSpecialBattleEnd())
@@ -0,0 +1,48 @@
+import pytest
+
+from src.grind_goal import GrindGoal
+
+
+def progress(**overrides):
+    values = {
+        "party_level": 5,
+        "experience_gained": 0,
+        "potion_count": 10,
+        "elapsed_seconds": 0.0,
+        "num_steps": 2,
+    }
+    values.update(overrides)
+    return values
+
+
+def test_needs_a_stop_condition():
+    with pytest.raises(ValueError):
+        GrindGoal()
+
+
+def test_odd_step_count_rejected():
+    with pytest.raises(ValueError):
+        GrindGoal(max_steps=101)
+
+
+def test_target_level():
+    grind_goal = GrindGoal(target_level=11)
+    assert grind_goal.get_stop_reason(**progress(party_level=10)) is None
+    assert grind_goal.get_stop_reason(**progress(party_level=11)) is not None
+
+
+def test_unknown_values_never_stop_the_session():
+    grind_goal = GrindGoal(target_level=11, potion_floor=5)
+    assert grind_goal.get_stop_reason(**progress(party_level=None, potion_count=None)) is None
+
+
+def test_potion_floor_and_time_budget():
+    assert GrindGoal(potion_floor=5).get_stop_reason(**progress(potion_count=4)) is not None
+    assert GrindGoal(potion_floor=5).get_stop_reason(**progress(potion_count=5)) is None
+    assert GrindGoal(time_budget_seconds=60).get_stop_reason(**progress(elapsed_seconds=61)) is not None
+
+
+def test_step_count_is_the_old_behaviour():
+    grind_goal = GrindGoal(max_steps=4)
+    assert grind_goal.get_stop_reason(**progress(num_steps=2)) is None
+    assert grind_goal.get_stop_reason(**progress(num_steps=4)) is not None
@@ -0,0 +1,58 @@
+import json
+import logging
+
+from src.logging_config import (
+    JsonLinesFormatter,
+    LogContext,
+    LogContextFilter,
+    configure_logging,
+    load_logging_config,
+    stop_logging,
+)
+
+
+def test_json_lines_carry_context_ids():
+    LogContext.start_section("complete_act1_zombom")
+    LogContext.start_battle()
+    LogContext.next_turn()
+    try:
+        record = logging.LogRecord("src.battle_handler", logging.INFO, __file__, 1, "Ally %s attacks", (1,), None)
+        LogContextFilter().filter(record)
+        entry = json.loads(JsonLinesFormatter().format(record))
+    finally:
+        LogContext.end_battle()
+        LogContext.start_section(None)
+
+    assert entry["message"] == "Ally 1 attacks"
+    assert entry["section"] == "complete_act1_zombom"
+    assert entry["turn"] == 1
+    assert entry["battle_id"] == LogContext.battle_id
+    assert entry["run_id"] == LogContext.run_id
+
+
+def test_config_file_overrides_levels(tmp_path):
+    config_path = tmp_path / "logging.json"
+    config_path.write_text(json.dumps({"levels": {"src.battle_handler": "DEBUG"}, "console_level": "WARNING"}))
+    config = load_logging_config(str(config_path))
+    assert config["levels"]["src.battle_handler"] == "DEBUG"
+    assert config["levels"]["playwright"] == "WARNING"
+    assert config["console_level"] == "WARNING"
+    assert config["file"] == load_logging_config()["file"]
+
+
+def test_file_handler_writes_json_lines_from_listener(tmp_path):
+    config = load_logging_config()
+    config["file"]["path"] = str(tmp_path / "autoplayer.jsonl")
+    config["levels"]["src.test_logging"] = "DEBUG"
+    configure_logging(config)
+    try:
+        logging.getLogger("src.test_logging").debug("Submitting %s", "attack")
+        logging.getLogger("src.test_logging.quiet").debug("filtered %s", "out")
+        logging.getLogger("playwright").info("Not shown")
+    finally:
+        stop_logging()
+        logging.getLogger().handlers.clear()
+
+    lines = [json.loads(line) for line in (tmp_path / "autoplayer.jsonl").read_text().splitlines()]
+    assert [line["message"] for line in lines] == ["Submitting attack", "filtered out"]
+    assert lines[0]["logger"] == "src.test_logging"
@@ -0,0 +1,194 @@
+import pytest
+
+from src.Pages.neopets_page import NeopetsPage, SiteTroubleError
+from src.circuit_breaker import CIRCUIT_BREAKER
+from src.page_parser import PageParser
+from src.page_types import PageType
+from src.retry_policy import RetryPolicy
+from tests.test_page_parser import BATTLE_START_HTML, OVERWORLD_HTML, TRADITIONAL_LOGIN_HTML
+
+GAME_URL = "https://www.neopets.com/games/nq2/nq2.phtml"
+
+
+class FakeFrame:
+    def __init__(self, parent_frame=None, url: str = GAME_URL):
+        self.parent_frame = parent_frame
+        self.url = url
+
+
+class FakeRequest:
+    def __init__(self, frame: FakeFrame):
+        self.frame = frame
+        self.resource_type = "document"
+
+    def is_navigation_request(self):
+        return True
+
+
+class FakeResponse:
+    def __init__(self, url: str, body: bytes, frame: FakeFrame):
+        self.url = url
+        self.request = FakeRequest(frame)
+        self.raw_body = body
+        self.body_calls = 0
+
+    def body(self):
+        self.body_calls += 1
+        return self.raw_body
+
+
+class FakePage:
+    """Just enough of a Playwright page to exercise the navigation cache."""
+
+    def __init__(self, html: str, url: str = GAME_URL):
+        self.html = html
+        self.url = url
+        self.content_calls = 0
+        self.handlers = {}
+        self.pages_by_url = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, arg):
+        for handler in self.handlers.get(event, []):
+            handler(arg)
+
+    def content(self):
+        self.content_calls += 1
+        return self.html
+
+    def goto(self, url, timeout=None):
+        self.url = url
+        self.navigate(self.pages_by_url.get(url, OVERWORLD_HTML))
+
+    def wait_for_load_state(self, state=None, timeout=None):
+        pass
+
+    def set_default_timeout(self, timeout):
+        self.default_timeout = timeout
+
+    def navigate(self, html: str, frame: FakeFrame = None, response_body: bytes = None):
+        frame = frame or FakeFrame(url=self.url)
+        if response_body is not None:
+            self.emit("response", FakeResponse(frame.url, response_body, frame))
+        self.html = html
+        self.emit("framenavigated", frame)
+
+
+def test_page_type_is_cached_across_page_objects():
+    fake_page = FakePage(OVERWORLD_HTML)
+    first = NeopetsPage(fake_page)
+    second = NeopetsPage(fake_page)
+
+    assert first.get_page_type() == PageType.GAME_OVERWORLD
+    assert second.get_page_type() == PageType.GAME_OVERWORLD
+    assert fake_page.content_calls == 1
+
+
+def test_page_type_cache_resets_on_main_frame_navigation():
+    fake_page = FakePage(OVERWORLD_HTML)
+    neopets_page = NeopetsPage(fake_page)
+    neopets_page.get_page_type()
+
+    # Subframe navigations must not invalidate the cache
+    fake_page.navigate(BATTLE_START_HTML, FakeFrame(parent_frame=FakeFrame()))
+    assert neopets_page.get_page_type() == PageType.GAME_OVERWORLD
+
+    fake_page.navigate(BATTLE_START_HTML)
+    assert neopets_page.get_page_type() == PageType.GAME_BATTLE_START
+    assert fake_page.content_calls == 2
+
+
+def test_captured_response_body_replaces_page_content():
+    fake_page = FakePage(OVERWORLD_HTML)
+    neopets_page = NeopetsPage(fake_page)
+
+    fake_page.navigate(BATTLE_START_HTML, response_body=BATTLE_START_HTML.encode())
+    assert neopets_page.get_page_content() == BATTLE_START_HTML
+    assert neopets_page.get_page_type() == PageType.GAME_BATTLE_START
+    assert neopets_page.get_document_body() == BATTLE_START_HTML.encode()
+    assert fake_page.content_calls == 0
+
+
+def test_response_for_a_different_document_is_not_used():
+    fake_page = FakePage(OVERWORLD_HTML)
+    neopets_page = NeopetsPage(fake_page)
+
+    fake_page.emit("response", FakeResponse(GAME_URL + "?act=move&dir=1", b"stale", FakeFrame()))
+    fake_page.navigate(OVERWORLD_HTML)
+    assert neopets_page.get_document_body() is None
+    assert neopets_page.get_page_content() == OVERWORLD_HTML
+
+
+def test_navigation_logs_back_in_and_retries_after_logout():
+    fake_page = FakePage(OVERWORLD_HTML)
+    neopets_page = NeopetsPage(fake_page)
+    move_url = GAME_URL + "?act=move&dir=3"
+    fake_page.pages_by_url[move_url] = TRADITIONAL_LOGIN_HTML
+    logins = []
+
+    def reauthenticate(page):
+        logins.append(page)
+        fake_page.pages_by_url.pop(move_url)
+        page.go_to_game_page()
+
+    NeopetsPage.reauthenticate = reauthenticate
+    try:
+        neopets_page.go_to_url_and_wait_navigation(move_url, retry_policy=RetryPolicy(sleep=lambda delay: None))
+    finally:
+        NeopetsPage.reauthenticate = None
+
+    assert logins == [neopets_page]
+    assert fake_page.url == move_url
+    assert neopets_page.get_page_type() == PageType.GAME_OVERWORLD
+
+
+def test_rate_limit_page_fails_the_attempt_without_waiting_for_a_locator():
+    fake_page = FakePage(OVERWORLD_HTML)
+    neopets_page = NeopetsPage(fake_page)
+    move_url = GAME_URL + "?act=move&dir=3"
+    fake_page.pages_by_url[move_url] = "<html><body><h1>429 Too Many Requests</h1></body></html>"
+    backoffs = []
+
+    def sleep(delay):
+        backoffs.append(delay)
+        fake_page.pages_by_url.pop(move_url)
+
+    try:
+        neopets_page.go_to_url_and_wait_navigation(move_url, retry_policy=RetryPolicy(sleep=sleep))
+    finally:
+        CIRCUIT_BREAKER.samples.clear()
+
+    assert len(backoffs) == 1
+    assert neopets_page.get_page_type() == PageType.GAME_OVERWORLD
+
+
+def test_site_trouble_error_says_what_the_site_served():
+    fake_page = FakePage("<html><body><p>Error code: 1015 You are being rate limited</p></body></html>")
+    try:
+        with pytest.raises(SiteTroubleError) as error_info:
+            NeopetsPage(fake_page).raise_if_site_trouble()
+    finally:
+        CIRCUIT_BREAKER.samples.clear()
+    assert error_info.value.page_type == PageType.RATE_LIMITED
+
+
+def test_fast_path_markers_are_checked_once_per_navigation(monkeypatch):
+    fake_page = FakePage(OVERWORLD_HTML)
+    neopets_page = NeopetsPage(fake_page)
+    calls = []
+    get_fast_path_matches = PageParser.get_fast_path_matches
+
+    def counting_get_fast_path_matches(page_html):
+        calls.append(page_html)
+        return get_fast_path_matches(page_html)
+
+    monkeypatch.setattr(PageParser, "get_fast_path_matches", counting_get_fast_path_matches)
+
+    neopets_page.raise_if_site_trouble()
+    assert neopets_page.get_page_type() == PageType.GAME_OVERWORLD
+    assert len(calls) == 1
+    fake_page.navigate(BATTLE_START_HTML)
+    assert neopets_page.get_page_type() == PageType.GAME_BATTLE_START
+    assert len(calls) == 2
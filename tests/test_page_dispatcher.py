@@ -0,0 +1,49 @@
+import pytest
+
+from src.Pages.neopets_page import NeopetsPage
+from src.page_dispatcher import OverworldNotReachedError, PageDispatcher
+from src.page_history import PAGE_HISTORY
+from src.page_types import PageType
+from tests.test_neopets_page import FakePage
+from tests.test_page_parser import BATTLE_RESULT_HTML, OVERWORLD_HTML
+
+
+class FakeNavigatingPage(FakePage):
+    def goto(self, url, **kwargs):
+        self.url = url
+        self.navigate(OVERWORLD_HTML)
+
+    def wait_for_load_state(self, *args, **kwargs):
+        pass
+
+    def locator(self, selector):
+        # OverworldPage builds its locators eagerly, but these tests never use them
+        return selector
+
+
+def test_unrouted_page_returns_to_main_game_page():
+    fake_page = FakeNavigatingPage("<p>Something new</p>", url="https://www.neopets.com/games/nq2/nq2.phtml?act=opt")
+    page = NeopetsPage(fake_page)
+    overworld = PageDispatcher({}).settle_on_overworld(page)
+    assert overworld.page_instance is fake_page
+    assert fake_page.url == NeopetsPage.MAIN_GAME_URL
+
+
+def test_routes_are_called_with_the_page():
+    fake_page = FakeNavigatingPage(BATTLE_RESULT_HTML)
+    handled = []
+
+    def handle_result(page):
+        handled.append(page.get_page_type())
+        fake_page.navigate(OVERWORLD_HTML)
+
+    PageDispatcher({PageType.GAME_BATTLE_RESULT: handle_result}).settle_on_overworld(NeopetsPage(fake_page))
+    assert handled == [PageType.GAME_BATTLE_RESULT]
+
+
+def test_gives_up_instead_of_looping_forever(tmp_path, monkeypatch):
+    monkeypatch.setattr(PAGE_HISTORY, "directory", str(tmp_path))
+    fake_page = FakeNavigatingPage(BATTLE_RESULT_HTML)
+    with pytest.raises(OverworldNotReachedError):
+        PageDispatcher({PageType.GAME_BATTLE_RESULT: lambda page: None}).settle_on_overworld(NeopetsPage(fake_page))
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,39 @@
+import json
+import zipfile
+
+from src.page_history import PageHistory
+
+
+def test_buffer_is_bounded_by_entries_and_size():
+    page_history = PageHistory(max_entries=3)
+    for i in range(5):
+        page_history.record_action(f"action {i}")
+    assert [entry.url for entry in page_history.entries] == ["action 2", "action 3", "action 4"]
+
+    page_history = PageHistory(max_compressed_bytes=200)
+    for i in range(20):
+        page_history.record_page(f"page {i}", bytes(range(256)) * (i + 1))
+    assert page_history.compressed_bytes <= 200 or len(page_history.entries) == 1
+    assert page_history.entries[-1].url == "page 19"
+
+
+def test_dump_writes_pages_and_actions_once(tmp_path):
+    page_history = PageHistory()
+    page_history.record_action("https://www.neopets.com/games/nq2/nq2.phtml?act=move&dir=3")
+    page_history.record_page("https://www.neopets.com/games/nq2/nq2.phtml", b"<html>Mysterious page</html>")
+
+    try:
+        raise Exception("The program ran into an unexpected page during battle")
+    except Exception:
+        bundle_path = page_history.dump("unexpected page during battle", str(tmp_path))
+
+    with zipfile.ZipFile(bundle_path) as bundle:
+        manifest = json.loads(bundle.read("manifest.json"))
+        assert manifest["reason"] == "unexpected page during battle"
+        assert "unexpected page during battle" in manifest["exception"]
+        assert [entry["kind"] for entry in manifest["entries"]] == ["action", "page"]
+        assert bundle.read(manifest["entries"][1]["file"]) == b"<html>Mysterious page</html>"
+
+    # The section wrapper reporting the same failure does not write a second copy
+    assert page_history.dump("complete_act1_zombom failed", str(tmp_path)) == bundle_path
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,107 @@
+from src.page_parser import PageParser
+from src.page_types import PageType
+
+OVERWORLD_HTML = (
+    '<div class="contentModule phpGamesNonPortalView">'
+    '<img src="//images.neopets.com/nq2/x/nav.gif" usemap="#navmap">'
+    '<map name="navmap"><area alt="North"></map></div>'
+)
+BATTLE_START_HTML = (
+    "<div>You are attacked by a Plains Lupe!"
+    '<img src="//images.neopets.com/nq2/x/com_begin.gif" alt="Begin the Fight!"></div>'
+)
+NEOPASS_LOGIN_HTML = '<label for="email">Email</label><input type="email" name="email">'
+TRADITIONAL_LOGIN_HTML = '<form class="login-form" method="post"></form>'
+
+
+def test_overworld_fast_path():
+    assert PageParser.get_fast_path_matches(OVERWORLD_HTML) == [PageType.GAME_OVERWORLD]
+    assert PageParser.get_page_type(OVERWORLD_HTML) == PageType.GAME_OVERWORLD
+
+
+def test_battle_start_fast_path():
+    assert PageParser.get_page_type(BATTLE_START_HTML) == PageType.GAME_BATTLE_START
+
+
+def test_login_pages():
+    assert PageParser.get_page_type(NEOPASS_LOGIN_HTML) == PageType.NEOPASS_LOGIN
+    assert PageParser.get_page_type(TRADITIONAL_LOGIN_HTML) == PageType.TRADITIONAL_LOGIN
+
+
+def test_single_quoted_attributes():
+    html = "<map name='navmap'></map>"
+    assert PageParser.get_page_type(html) == PageType.GAME_OVERWORLD
+
+
+def test_ambiguous_page_falls_back_to_soup_priority():
+    # Both markers match, so the soup path decides using the same priority as before
+    html = TRADITIONAL_LOGIN_HTML + OVERWORLD_HTML
+    assert len(PageParser.get_fast_path_matches(html)) == 2
+    assert PageParser.get_page_type(html) == PageType.TRADITIONAL_LOGIN
+
+
+def test_unknown_page():
+    assert PageParser.get_page_type("<html><body>Hello</body></html>") == PageType.UNRECOGNIZED
+
+
+BATTLE_HTML = '<form><input type="hidden" name="nxactor" value="1"></form>'
+BATTLE_RESULT_HTML = '<a href="nq2.phtml?finish=1">Click here to return to the map</a>'
+SPECIAL_END_HTML = "<div>Ramtor grunts as he is struck and flees!</div>" + BATTLE_RESULT_HTML
+
+
+def test_battle_pages():
+    assert PageParser.get_page_type(BATTLE_HTML) == PageType.GAME_BATTLE
+    assert PageParser.get_page_type(BATTLE_RESULT_HTML) == PageType.GAME_BATTLE_RESULT
+
+
+def test_special_boss_end_is_told_apart_from_normal_result():
+    assert PageParser.get_page_type(SPECIAL_END_HTML) == PageType.GAME_BATTLE_SPECIAL_END
+
+
+def test_url_fallback_only_when_content_is_unknown():
+    talk_url = "https://www.neopets.com/games/nq2/nq2.phtml?act=talk&targ=10201&say=rest"
+    assert PageParser.get_page_type("<p>Welcome, traveller</p>", talk_url) == PageType.GAME_NPC_TALK
+    # An NPC out of range leaves us on the overworld even though the URL says otherwise
+    assert PageParser.get_page_type(OVERWORLD_HTML, talk_url) == PageType.GAME_OVERWORLD
+
+
+def test_url_identifiers():
+    assert PageParser.get_page_type_from_url(
+        "https://www.neopets.com/games/nq2/nq2.phtml?act=inv&iact=equip"
+    ) == PageType.GAME_INVENTORY
+    assert PageParser.get_page_type_from_url(
+        "https://www.neopets.com/games/nq2/index.phtml"
+    ) == PageType.GAME_INDEX
+    assert PageParser.get_page_type_from_url(
+        "https://account.neopets.com/classic/login"
+    ) == PageType.NEOPASS_ACCOUNT_SELECTION
+
+
+def test_logged_out_check():
+    assert PageParser.is_logged_out("", "https://www.neopets.com/login/?return=%2Fgames%2Fnq2%2Fnq2.phtml")
+    assert PageParser.is_logged_out("", "https://account.neopets.com/classic/login")
+    assert PageParser.is_logged_out(NEOPASS_LOGIN_HTML, "https://www.neopets.com/games/nq2/nq2.phtml")
+    assert not PageParser.is_logged_out(OVERWORLD_HTML, "https://www.neopets.com/games/nq2/nq2.phtml")
+
+
+def test_site_trouble_pages():
+    maintenance_html = "<html><body><p>Neopets is currently undergoing scheduled maintenance.</p></body></html>"
+    assert PageParser.get_site_trouble(maintenance_html) == PageType.SITE_MAINTENANCE
+    assert PageParser.get_page_type(maintenance_html) == PageType.SITE_MAINTENANCE
+    assert PageParser.get_site_trouble("<p>error code: 1015 You are being rate limited</p>") == PageType.RATE_LIMITED
+    assert PageParser.get_site_trouble("<title>502 Bad Gateway</title><h1>Bad Gateway</h1>") == PageType.SERVER_ERROR
+    assert PageParser.get_site_trouble("<html><head><title>NQ2</title></head><body> \n</body></html>") == PageType.BLANK
+    assert PageParser.get_site_trouble("<p>Slow down!</p>", status=429) == PageType.RATE_LIMITED
+
+    # Game pages are never site trouble, whatever the NPCs say or the status claims
+    assert PageParser.get_site_trouble(OVERWORLD_HTML + "<p>Too many requests</p>", status=503) is None
+    assert PageParser.get_site_trouble("<p>Welcome, traveller</p>", status=200) is None
+
+
+def test_battle_end_pages_resolve_on_the_fast_path():
+    # End pages keep the nxactor input of the battle page, which must not send them to the soup path
+    assert PageParser.get_fast_path_matches(BATTLE_HTML + BATTLE_RESULT_HTML) == [PageType.GAME_BATTLE_RESULT]
+    assert PageParser.get_fast_path_matches(BATTLE_HTML + SPECIAL_END_HTML) == [PageType.GAME_BATTLE_SPECIAL_END]
+    # Flee text alone is not a special end
+    flee_html = BATTLE_HTML + "<div>Ramtor grunts as he is struck</div>"
+    assert PageParser.get_fast_path_matches(flee_html) == [PageType.GAME_BATTLE]
@@ -0,0 +1,52 @@
+import pytest
+
+from src.request_pacer import RequestPacer, TokenBucket
+
+GAME_URL = "https://www.neopets.com/games/nq2/nq2.phtml"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_bucket_allows_a_burst_then_settles_at_the_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate_per_second=2.0, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Callers queue up behind each other
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 10
+    assert bucket.reserve() == 0.0
+    assert bucket.tokens == pytest.approx(2)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate_per_second=0, burst=3)
+
+
+def test_accounts_share_the_host_bucket():
+    clock = FakeClock()
+    pacer = RequestPacer(
+        account_rate_per_second=1.0, account_burst=2, host_rate_per_second=1.0, host_burst=3,
+        clock=clock, sleep=clock.sleep,
+    )
+    assert pacer.acquire(GAME_URL, "alice") == 0.0
+    assert pacer.acquire(GAME_URL, "alice") == 0.0
+    # Alice is out of tokens, Bob still has his own but the host only has one left
+    assert pacer.acquire(GAME_URL, "alice") == pytest.approx(1.0)
+    assert clock.now == pytest.approx(1.0)
+    assert pacer.acquire(GAME_URL, "bob") == pytest.approx(0.0)
+    assert pacer.acquire(GAME_URL, "bob") == pytest.approx(1.0)
+    # Other hosts have buckets of their own
+    assert pacer.acquire("https://images.neopets.com/nq2/t/grass.gif", "carol") == 0.0
+
+    assert pacer.get_summary().startswith("2 of the last 6 requests waited")
+    assert RequestPacer().get_summary() == "no requests paced yet"
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from src.retry_policy import RetryExhaustedError, RetryPolicy
+
+
+def make_policy(max_attempts=4):
+    delays = []
+    retry_policy = RetryPolicy(
+        max_attempts=max_attempts,
+        timeout_ms=1234,
+        base_delay_seconds=1.0,
+        max_delay_seconds=3.0,
+        rng=random.Random(0),
+        sleep=delays.append,
+    )
+    return retry_policy, delays
+
+
+def failing_until(num_failures, result="done"):
+    calls = []
+
+    def action(timeout_ms):
+        calls.append(timeout_ms)
+        if len(calls) <= num_failures:
+            raise TimeoutError("too slow")
+        return result
+
+    return action, calls
+
+
+def test_jittered_exponential_delays_are_capped():
+    retry_policy, delays = make_policy()
+    for attempt in range(6):
+        ceiling = min(3.0, 2 ** attempt)
+        assert 0 <= retry_policy.get_delay(attempt) <= ceiling
+
+
+def test_retries_with_timeout_until_success():
+    retry_policy, delays = make_policy()
+    action, calls = failing_until(2)
+    assert retry_policy.run(action, "do something") == "done"
+    assert calls == [1234, 1234, 1234]
+    assert len(delays) == 2
+
+
+def test_does_not_resubmit_when_action_went_through():
+    retry_policy, delays = make_policy()
+    action, calls = failing_until(1)
+    recovered = []
+    result = retry_policy.run(
+        action, "submit an action", is_already_done=lambda: True, recover=recovered.append
+    )
+    assert result is None
+    assert calls == [1234]
+    assert recovered == [1234]
+
+
+def test_gives_up_after_max_attempts():
+    retry_policy, delays = make_policy(max_attempts=3)
+    action, calls = failing_until(10)
+    with pytest.raises(RetryExhaustedError, match="Max retries exceeded") as exc_info:
+        retry_policy.run(action, "do something", is_already_done=lambda: False)
+    assert len(calls) == 3
+    assert isinstance(exc_info.value.__cause__, TimeoutError)
+
+
+def test_timeouts_follow_observed_latency_within_bounds():
+    observed = {"latency_ms": None}
+    retry_policy = RetryPolicy(
+        timeout_ms=30000,
+        min_timeout_ms=5000,
+        max_timeout_ms=60000,
+        observed_latency_ms=lambda percentile: observed["latency_ms"],
+    )
+    # Nothing timed yet
+    assert retry_policy.get_timeout_ms() == 30000
+
+    observed["latency_ms"] = 400
+    assert retry_policy.get_timeout_ms() == 5000
+    observed["latency_ms"] = 4000
+    assert retry_policy.get_timeout_ms() == 12000
+    assert retry_policy.get_timeout_ms(attempt=1) == 24000
+    assert retry_policy.with_max_attempts(2).get_timeout_ms(attempt=3) == 60000
+    observed["latency_ms"] = 90000
+    assert retry_policy.get_timeout_ms() == 60000
+
+    assert make_policy()[0].get_timeout_ms(attempt=3) == 1234
@@ -0,0 +1,135 @@
+import pytest
+from click.testing import CliRunner
+
+from src.route_planner import RoutePlanner, RouteTable, UnknownWaypointError, load_waypoints, main
+from src.section_script import SectionCostModel
+from src.world_atlas import AtlasMap, WorldAtlas
+
+# . walkable, # wall, each row is one y
+VILLAGE = [
+    ".....",
+    ".###.",
+    ".#...",
+    ".....",
+]
+
+
+def make_atlas(rows=VILLAGE, map_key="0"):
+    atlas = WorldAtlas()
+    atlas_map = atlas.get_map(map_key)
+    for y, row in enumerate(rows):
+        for x, tile in enumerate(row):
+            atlas_map.set_flag(x, y, AtlasMap.VISITED if tile == "." else AtlasMap.BLOCKED)
+    return atlas
+
+
+def test_shortest_path_goes_around_walls_and_uses_diagonals():
+    route_planner = RoutePlanner(make_atlas())
+    # Straight through the wall would be 3 steps east, around it is 4
+    assert route_planner.find_path(("0", 0, 1), ("0", 4, 1)) == "7448"
+    assert route_planner.find_path(("0", 2, 2), ("0", 0, 3)) == "63"
+    assert route_planner.find_path(("0", 0, 0), ("0", 0, 0)) == ""
+    assert route_planner.find_path(("0", 0, 0), ("0", 2, 1)) is None
+
+
+def test_route_is_split_after_a_transition():
+    atlas = make_atlas()
+    cave = atlas.get_map("7")
+    for x in range(3):
+        cave.set_flag(x, 0, AtlasMap.VISITED)
+    atlas.get_map("0").set_flag(4, 4, AtlasMap.TRANSITION)
+    atlas.transitions.append(
+        {"map": "0", "x": 4, "y": 4, "direction": "2", "to_map": "7", "to_x": 0, "to_y": 0, "kind": "cave"}
+    )
+    route_planner = RoutePlanner(atlas)
+
+    assert route_planner.find_path(("0", 4, 2), ("7", 2, 0)) == "2244"
+    assert route_planner.get_next_leg(("0", 4, 2), ("7", 2, 0)) == "22"
+
+
+def test_waypoint_routes_are_cached_until_the_atlas_changes(tmp_path):
+    atlas = make_atlas()
+    atlas.npcs[1] = {"name": "Mother", "map": "0", "x": 4, "y": 3}
+    waypoints_path = tmp_path / "waypoints.json"
+    waypoints_path.write_text('{"home": {"map": "0", "x": 0, "y": 0}}')
+    waypoints = load_waypoints(atlas, str(waypoints_path))
+    assert waypoints == {"home": ("0", 0, 0), "npc:Mother": ("0", 4, 3)}
+
+    route_table_path = str(tmp_path / "route_table.json")
+    route_table = RouteTable(RoutePlanner(atlas, waypoints), route_table_path)
+    assert route_table.precompute() == 2
+    assert len(route_table.routes["home->npc:Mother"]) == 6
+    assert RouteTable(RoutePlanner(atlas, waypoints), route_table_path).routes == route_table.routes
+
+    atlas.get_map("0").set_flag(9, 9, AtlasMap.VISITED)
+    assert RouteTable(RoutePlanner(atlas, waypoints), route_table_path).routes == {}
+
+
+def test_unknown_waypoint_is_a_clean_cli_error(tmp_path):
+    atlas_path = str(tmp_path / "atlas.json")
+    make_atlas().save(atlas_path)
+    with pytest.raises(UnknownWaypointError, match="nowhere"):
+        RoutePlanner.from_files(atlas_path, str(tmp_path / "waypoints.json")).get_waypoint("nowhere")
+
+    result = CliRunner().invoke(
+        main,
+        [
+            "nowhere", "home",
+            "--atlas", atlas_path,
+            "--waypoints", str(tmp_path / "waypoints.json"),
+            "--route-table", str(tmp_path / "route_table.json"),
+            "--fewest-steps",
+        ],
+    )
+    assert result.exit_code == 2
+    assert "Unknown waypoint nowhere" in result.output
+    assert "Traceback" not in result.output
+
+
+def test_encounter_weighted_route_takes_the_quieter_corridor():
+    atlas = make_atlas([".....", ".###.", "....."])
+    for x in range(1, 4):
+        for _ in range(20):
+            atlas.get_map("0").count_step(x, 0, encountered=True)
+            atlas.get_map("0").count_step(x, 2, encountered=False)
+    atlas.record_battle(30.0)
+    cost_model = SectionCostModel(seconds_per_request=1.0)
+
+    # Both corridors are 4 steps, the top one starts a fight every other step
+    assert len(RoutePlanner(atlas).find_path(("0", 0, 1), ("0", 4, 1))) == 4
+    route_planner = RoutePlanner(atlas, cost_model=cost_model)
+    assert route_planner.find_path(("0", 0, 1), ("0", 4, 1)) == "8447"
+    assert route_planner.get_step_cost(("0", 0, 1), "7", ("0", 1, 0)) > route_planner.get_step_cost(
+        ("0", 0, 1), "8", ("0", 1, 2)
+    )
+
+
+def test_nearest_of_several_goals():
+    atlas = make_atlas()
+    atlas.section_starts = {"complete_act1_zombom": ("0", 4, 3), "complete_act1_ramtor1": ("0", 0, 3)}
+    route_planner = RoutePlanner(atlas, load_waypoints(atlas, "missing.json"))
+    assert route_planner.waypoints["section:complete_act1_ramtor1"] == ("0", 0, 3)
+
+    section_name, route = route_planner.find_nearest(("0", 0, 0), atlas.section_starts)
+    assert section_name == "complete_act1_ramtor1"
+    assert "".join(direction for direction, _ in route) == "222"
+    assert route_planner.find_nearest(("0", 0, 0), {"walled in": ("0", 2, 1)}) is None
+
+
+def test_stairs_on_the_same_map_can_be_the_shortcut():
+    # Stairs under (1, 0) lead to (19, 2), right below the far end of a long corridor
+    rows = [
+        "." * 21,
+        "#" * 20 + ".",
+        "#" * 19 + "..",
+    ]
+    atlas = make_atlas(rows)
+    atlas.get_map("0").set_flag(1, 1, AtlasMap.TRANSITION)
+    atlas.transitions.append(
+        {"map": "0", "x": 1, "y": 1, "direction": "2", "to_map": "0", "to_x": 19, "to_y": 2, "kind": "stairs"}
+    )
+    route_planner = RoutePlanner(atlas)
+
+    assert route_planner.find_path(("0", 1, 0), ("0", 19, 0)) == "275"
+    assert route_planner.find_path(("0", 3, 0), ("0", 19, 0)) == "33275"
+    assert route_planner.estimate_cost(("0", 3, 0), ("0", 19, 0)) == 5
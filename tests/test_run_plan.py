@@ -0,0 +1,110 @@
+import json
+
+import pytest
+
+from src.grind_goal import GrindGoal
+from src.run_plan import (
+    EXIT_FAILURES_SKIPPED,
+    EXIT_STOPPED_ON_FAILURE,
+    EXIT_SUCCESS,
+    BatchRunner,
+    RunPlan,
+    RunSection,
+    WalkTo,
+    parse_command_line_entry,
+)
+from src.section_script import FollowPath, Grind
+
+
+class FakePage:
+    def __init__(self):
+        self.dump_reasons = []
+
+    def dump_page_history(self, reason):
+        self.dump_reasons.append(reason)
+
+
+class FakeOverworldHandler:
+    overworld_page = "overworld"
+
+
+class FakePageDispatcher:
+    def __init__(self):
+        self.settled = 0
+
+    def settle_on_overworld(self, page):
+        self.settled += 1
+        return page
+
+
+class FakeAutoplayer:
+    """Records what the batch runner asked for, and fails Zombom."""
+
+    def __init__(self):
+        self.played = []
+        self.current_page = FakePage()
+        self.overworld_handler = FakeOverworldHandler()
+        self.page_dispatcher = FakePageDispatcher()
+
+    def complete_act1_zombom(self):
+        raise Exception("Zombom desynced")
+
+    def complete_act1_sand_grundo(self):
+        self.played.append("complete_act1_sand_grundo")
+
+    def follow_path(self, path):
+        self.played.append(path)
+
+    def grind_until(self, goal, initial_path):
+        self.played.append(f"grind {goal.max_steps}")
+
+    def walk_to(self, waypoint_name):
+        self.played.append(waypoint_name)
+
+
+def test_plan_file_and_command_line_entries(tmp_path):
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(json.dumps({
+        "on_failure": "continue",
+        "entries": [
+            {"section": "complete_act1_zombom"},
+            {"grind": {"max_steps": 2000, "potion_floor": 3}, "initial_path": "3333"},
+            {"walk_to": "npc:Mother"},
+        ],
+    }))
+    run_plan = RunPlan.from_file(str(plan_path))
+    assert run_plan.on_failure == "continue"
+    assert run_plan.entries[0] == RunSection("complete_act1_zombom")
+    assert run_plan.entries[1].goal.max_steps == 2000 and run_plan.entries[1].initial_path == "3333"
+    assert RunPlan.from_file(str(plan_path), on_failure="stop").on_failure == "stop"
+
+    # No 1000 step limit like the menu has
+    assert parse_command_line_entry("grind:5000").goal.max_steps == 5000
+    assert parse_command_line_entry("path:33335") == FollowPath("33335")
+    assert parse_command_line_entry("walk:section:complete_act1_zombom") == WalkTo("section:complete_act1_zombom")
+    for bad_entry in ["complete_act9_nothing", "path:339", "grind:lots", "grind:999"]:
+        with pytest.raises(ValueError):
+            parse_command_line_entry(bad_entry)
+
+
+def test_failure_policy_decides_whether_the_run_goes_on():
+    entries = [
+        FollowPath("33"),
+        RunSection("complete_act1_zombom"),
+        Grind(GrindGoal(max_steps=20)),
+        RunSection("complete_act1_sand_grundo"),
+        WalkTo("npc:Mother"),
+    ]
+
+    autoplayer = FakeAutoplayer()
+    assert BatchRunner(autoplayer).run(RunPlan(entries, "stop")) == EXIT_STOPPED_ON_FAILURE
+    assert autoplayer.played == ["33"]
+    assert autoplayer.current_page.dump_reasons == ["run plan entry 2 failed"]
+
+    autoplayer = FakeAutoplayer()
+    assert BatchRunner(autoplayer).run(RunPlan(entries, "continue")) == EXIT_FAILURES_SKIPPED
+    assert autoplayer.played == ["33", "grind 20", "complete_act1_sand_grundo", "npc:Mother"]
+    assert autoplayer.page_dispatcher.settled == 1
+
+    autoplayer = FakeAutoplayer()
+    assert BatchRunner(autoplayer).run(RunPlan([FollowPath("44")])) == EXIT_SUCCESS
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from src.autoplayer import Autoplayer
+from src.grind_goal import GrindGoal
+from src.npc_handler import NpcHandler
+from src.overworld_handler import OverworldHandler
+from src.section_script import (
+    FollowPath,
+    Grind,
+    Repeat,
+    SectionCostEstimator,
+    SectionCostModel,
+    SectionRunner,
+    SetMovementMode,
+    SpendSkillpoints,
+    SectionStep,
+    TalkTo,
+    UnknownSectionStepError,
+)
+from src.sections import ACT1_INITIAL_TRAINING, SECTIONS
+from src.skillpoint_handler import SkillpointHandler
+
+STUN = SkillpointHandler.RohaneSkill.STUN.value
+
+
+class RecordingHandler:
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    def __getattr__(self, method_name):
+        return lambda *args: self.calls.append((f"{self.name}.{method_name}", *args))
+
+
+class FakeAutoplayer:
+    def __init__(self):
+        self.calls = []
+        self.npc_handler = RecordingHandler("npc_handler", self.calls)
+        self.skillpoint_handler = RecordingHandler("skillpoint_handler", self.calls)
+        self.overworld_handler = RecordingHandler("overworld_handler", self.calls)
+
+    def follow_path(self, path):
+        self.calls.append(("follow_path", path))
+
+    def grind_until(self, goal, initial_path=None):
+        self.calls.append(("grind_until", goal.max_steps, initial_path))
+
+
+def test_runner_plays_steps_in_order():
+    autoplayer = FakeAutoplayer()
+    SectionRunner(autoplayer).run(
+        [
+            FollowPath("33"),
+            Repeat(2, [TalkTo(NpcHandler.MOTHER_INTERACTION_LINKS)]),
+            Grind(GrindGoal(max_steps=10), "7"),
+            SpendSkillpoints(SkillpointHandler.AllyType.ROHANE, STUN, 2),
+        ]
+    )
+    assert autoplayer.calls == [
+        ("follow_path", "33"),
+        ("npc_handler.talk_with_npc", NpcHandler.MOTHER_INTERACTION_LINKS),
+        ("npc_handler.talk_with_npc", NpcHandler.MOTHER_INTERACTION_LINKS),
+        ("grind_until", 10, "7"),
+        ("skillpoint_handler.try_spend_multiple_skillpoints", SkillpointHandler.AllyType.ROHANE, STUN, 2),
+    ]
+
+
+def test_estimator_counts_normal_mode_encounters_only_outside_hunting():
+    cost_model = SectionCostModel(normal_mode_encounter_rate=0.1, hunting_mode_encounter_rate=0.5,
+                                  requests_per_battle=10)
+    estimate = SectionCostEstimator(cost_model).estimate(
+        [
+            FollowPath("3333333333"),
+            SetMovementMode(OverworldHandler.MovementMode.HUNTING),
+            FollowPath("34"),
+            SetMovementMode(OverworldHandler.MovementMode.NORMAL),
+            Grind(GrindGoal(max_steps=20), "77"),
+        ]
+    )
+    assert estimate.steps_walked == 10 + 2 + 20 + 4
+    assert estimate.worst_case_normal_mode_encounters == 10 + 4
+    assert estimate.expected_encounters == pytest.approx(1 + 1 + 10 + 0.4)
+    # Moves, mode switches and fights
+    assert estimate.requests == pytest.approx(36 + 4 + 12.4 * 10)
+
+
+def test_unknown_steps_are_rejected():
+    step = SectionStep()
+    with pytest.raises(UnknownSectionStepError, match="run section step"):
+        SectionRunner(FakeAutoplayer()).run([step])
+    with pytest.raises(UnknownSectionStepError, match="estimate section step") as exc_info:
+        SectionCostEstimator(SectionCostModel()).estimate([Repeat(1, [step])])
+    assert exc_info.value.step is step
+
+
+def test_cost_model_reads_latency_from_log(tmp_path):
+    log_path = tmp_path / "autoplayer.jsonl"
+    log_path.write_text(
+        "\n".join(json.dumps(entry) for entry in [{"message": "hi"}, {"latency_ms": 400}, {"latency_ms": 800}])
+    )
+    assert SectionCostModel.from_log(str(log_path)).seconds_per_request == 0.6
+    assert SectionCostModel.from_log(str(tmp_path / "missing.jsonl")).seconds_per_request == 1.0
+
+
+def test_every_section_has_an_autoplayer_method():
+    assert len({section.name for section in SECTIONS}) == len(SECTIONS)
+    for section in SECTIONS:
+        assert hasattr(Autoplayer, section.name)
+
+
+def test_initial_training_matches_the_old_script():
+    autoplayer = FakeAutoplayer()
+    SectionRunner(autoplayer).run(ACT1_INITIAL_TRAINING.steps)
+    walked = "".join(call[1] for call in autoplayer.calls if call[0] == "follow_path")
+    spends = [call for call in autoplayer.calls if call[0] == "skillpoint_handler.try_spend_multiple_skillpoints"]
+    assert walked == "3333" + "726662228663333333" * 30 + "12" * 75
+    assert len(spends) == 7
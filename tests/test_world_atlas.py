@@ -0,0 +1,139 @@
+from src.page_history import PageHistory
+from src.world_atlas import AtlasMap, MapSnapshot, WorldAtlas, read_page_history_bundle
+
+MOVE_URL = "https://www.neopets.com/games/nq2/nq2.phtml?act=move&dir={0}"
+
+
+def make_overworld_html(center_x, center_y, map_number=None, images=None, zone="the village of Trestin", npc=None):
+    """Overworld page with the 7x7 tiles around the party, like the real map table."""
+    cells = []
+    for y in range(center_y - 3, center_y + 4):
+        for x in range(center_x - 3, center_x + 4):
+            image = (images or {}).get((x, y), "grass")
+            coords = f"{x},{y}" if map_number is None else f"{map_number},{x},{y}"
+            cells.append(
+                f'<td><img src="//images.neopets.com/nq2/t/{image}.gif" onmouseover="coords({coords})"></td>'
+            )
+    talk = f'<a href="nq2.phtml?act=talk&targ={npc[0]}">Talk to {npc[1]}</a>' if npc else ""
+    return (
+        f'<div class="phpGamesNonPortalView"><table><tr>{"".join(cells)}</tr></table>'
+        f"You are in {zone}.<br>{talk}"
+        f'<map name="navmap"><area alt="North" coords="0,0,20,20"></map></div>'
+    )
+
+
+def test_snapshot_reads_tiles_position_zone_and_npcs():
+    snapshot = MapSnapshot.from_html(
+        make_overworld_html(10, 20, images={(11, 20): "tree"}, npc=(1, "Mother"))
+    )
+    assert len(snapshot.tiles) == 49
+    assert snapshot.position == (10, 20)
+    assert snapshot.tiles[(11, 20)] == "tree"
+    assert snapshot.map_key == "0"
+    assert snapshot.zone == "the village of Trestin"
+    assert snapshot.npcs == {1: "Mother"}
+
+    assert MapSnapshot.from_html(make_overworld_html(5, 5, map_number=3)).map_key == "3"
+    assert MapSnapshot.from_html("<html>Battle!</html>") is None
+
+
+def test_moves_record_passability_walls_and_transitions():
+    atlas = WorldAtlas()
+    start = MapSnapshot.from_html(make_overworld_html(10, 20, images={(11, 20): "tree", (10, 19): "cave"}))
+
+    atlas.record_move(start, "4", start)
+    assert atlas.is_passable("0", 11, 20) is False
+    # We stood on grass, so every grass tile is walkable
+    assert atlas.is_passable("0", 9, 20) is True
+    assert atlas.is_passable("0", 100, 100) is None
+
+    west = MapSnapshot.from_html(make_overworld_html(9, 20))
+    atlas.record_move(start, "3", west)
+    assert atlas.maps["0"].get_flags(9, 20) & AtlasMap.VISITED
+    assert atlas.get_zone("0", 9, 20) == "the village of Trestin"
+
+    cave = MapSnapshot.from_html(make_overworld_html(3, 4, map_number=7, zone="the Underground Caves"))
+    atlas.record_move(start, "1", cave)
+    assert atlas.transitions == [
+        {"map": "0", "x": 10, "y": 19, "direction": "1", "to_map": "7", "to_x": 3, "to_y": 4, "kind": "cave"}
+    ]
+    assert atlas.maps["0"].get_flags(10, 19) & AtlasMap.TRANSITION
+
+
+def test_atlas_round_trips_through_its_file(tmp_path):
+    atlas = WorldAtlas()
+    atlas.add_snapshot(MapSnapshot.from_html(make_overworld_html(10, 20, npc=(1, "Mother"))))
+    # Far enough away that the grid has to grow in both directions
+    atlas.add_snapshot(MapSnapshot.from_html(make_overworld_html(-5, 40, images={(-6, 40): "water"})))
+    atlas_path = str(tmp_path / "atlas.bin")
+    atlas.save(atlas_path)
+
+    loaded = WorldAtlas.load(atlas_path)
+    assert loaded.images == atlas.images
+    assert loaded.npcs == {1: {"name": "Mother", "map": "0", "x": 10, "y": 20}}
+    assert loaded.maps["0"].flags == atlas.maps["0"].flags
+    assert loaded.maps["0"].images == atlas.maps["0"].images
+    assert loaded.get_tile_image("0", -6, 40) == "water"
+    assert loaded.is_passable("0", 10, 20) is True
+    assert loaded.maps["0"].get_flags(10, 20) & AtlasMap.NPC
+
+
+def test_atlas_is_rebuilt_from_page_history_bundles(tmp_path):
+    page_history = PageHistory()
+    page_history.record_page("start", make_overworld_html(10, 20).encode())
+    page_history.record_action(MOVE_URL.format("2"))
+    page_history.record_page("moved", make_overworld_html(10, 21).encode())
+    page_history.record_action(MOVE_URL.format("2"))
+    page_history.record_page("battle", b"<html>A monster appears!</html>")
+    page_history.record_action(MOVE_URL.format("4"))
+    page_history.record_page("after battle", make_overworld_html(10, 22).encode())
+    bundle_path = page_history.dump("replay", str(tmp_path))
+
+    atlas = WorldAtlas()
+    assert atlas.replay_page_history(read_page_history_bundle(bundle_path)) == 1
+    assert atlas.is_passable("0", 10, 21) is True
+    assert atlas.maps["0"].get_flags(10, 22) & AtlasMap.VISITED
+
+
+def test_encounters_are_counted_per_tile_and_saved(tmp_path):
+    atlas = WorldAtlas()
+    start = MapSnapshot.from_html(make_overworld_html(10, 20))
+    east = MapSnapshot.from_html(make_overworld_html(11, 20))
+    atlas.record_move(start, "4", east, count_encounters=True)
+    atlas.record_encounter(start, "4")
+    # Hunting mode steps do not count
+    atlas.record_move(start, "4", east)
+    atlas.record_battle(20.0)
+
+    assert atlas.get_encounter_rate("0", 11, 20, prior_rate=0.1, prior_steps=0) == 0.5
+    assert atlas.get_encounter_rate("0", 12, 20, prior_rate=0.1) == 0.1
+
+    atlas_path = str(tmp_path / "atlas.bin")
+    atlas.save(atlas_path)
+    loaded = WorldAtlas.load(atlas_path)
+    assert loaded.get_map_encounter_rate("0") == (1, 2)
+    assert loaded.get_mean_battle_seconds() == 20.0
+
+
+def test_location_fingerprints_and_section_progress(tmp_path):
+    atlas = WorldAtlas()
+    start = MapSnapshot.from_html(make_overworld_html(10, 20, images={(11, 20): "tree"}))
+    atlas.record_section_start("complete_act1_zombom", start)
+    for x in range(11, 14):
+        snapshot = MapSnapshot.from_html(make_overworld_html(x, 20))
+        atlas.add_snapshot(snapshot)
+        atlas.record_section_tile("complete_act1_zombom", snapshot)
+    atlas_path = str(tmp_path / "atlas.bin")
+    atlas.save(atlas_path)
+    atlas = WorldAtlas.load(atlas_path)
+
+    # Same tiles, different coordinates: recognised by the fingerprint alone
+    moved = MapSnapshot.from_html(make_overworld_html(110, 120, images={(111, 120): "tree"}))
+    assert moved.get_fingerprint() == start.get_fingerprint()
+    assert atlas.locate(moved) == ("0", 10, 20)
+    assert atlas.get_sections_at(("0", 10, 20)) == (["complete_act1_zombom"], {})
+    # Plain grass looks the same everywhere, so only the coordinates can tell
+    assert atlas.locations[MapSnapshot.from_html(make_overworld_html(12, 20)).get_fingerprint()] is None
+    assert atlas.locate(MapSnapshot.from_html(make_overworld_html(12, 20))) == ("0", 12, 20)
+    assert atlas.get_sections_at(("0", 12, 20)) == ([], {"complete_act1_zombom": 2 / 3})
+    assert atlas.locate(MapSnapshot.from_html(make_overworld_html(50, 50, images={(50, 50): "sand"}))) is None